@@ -1405,6 +1405,8 @@ class CBindingsPacket(c_common.CPacket):
         return return_list, needs_i
 
 class CBindingsGenerator(c_common.CGeneratorTrait, common.BindingsGenerator):
+    parallel_device_attributes = ['released_files']
+
     def get_device_class(self):
         return CBindingsDevice
 
@@ -1417,14 +1419,15 @@ class CBindingsGenerator(c_common.CGeneratorTrait, common.BindingsGenerator):
     def generate(self, device):
         filename = '{0}_{1}'.format(device.get_category().under, device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename + '.c'), 'w') as f:
-            f.write(device.get_c_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename + '.c')) as f:
+                f.write(device.get_c_source())
 
-        with open(os.path.join(self.get_bindings_dir(), filename + '.h'), 'w') as f:
-            f.write(device.get_c_header())
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename + '.h')) as f:
+                f.write(device.get_c_header())
 
-        with open(os.path.join(self.get_bindings_dir(), filename + '.symbols'), 'w') as f:
-            f.write(device.get_c_symbols())
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename + '.symbols')) as f:
+                f.write(device.get_c_symbols())
 
         if device.is_released():
             self.released_files.append(filename + '.c')
@@ -107,7 +107,7 @@ class CZipGenerator(c_common.CGeneratorTrait, common.ZipGenerator):
             else:
                 shutil.copy(path, self.tmp_source_dir)
 
-        with open(os.path.join(self.tmp_source_dir, self.get_config_name().under + '.def'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_source_dir, self.get_config_name().under + '.def')) as f:
             f.write(symbols)
 
         if self.get_config_name().space == 'Tinkerforge':
@@ -155,6 +155,6 @@ def test(root_dir):
     return CExamplesTester(root_dir, 'scan-build clang', extra_paths).run()
 
 if __name__ == '__main__':
-    common.dockerize('c', __file__)
+    common.dockerize('c', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
@@ -32,12 +32,25 @@ import subprocess
 import sys
 import copy
 import math
+import multiprocessing
 import multiprocessing.dummy
+import concurrent.futures
+import io
+import locale
+import time
+import atexit
+import contextlib
 import functools
 from collections import namedtuple
 import importlib
 import argparse
 import shlex
+import hashlib
+import difflib
+import zipfile
+import stat
+import pickle
+import json
 
 from generators.configs import device_commonconfig
 
@@ -158,6 +171,111 @@ def print_verbose(*args, **kwargs):
     if enable_verbose:
         print(*args, **kwargs)
 
+# profiling of generators, enabled by --profile. the wall and CPU time of
+# nested named sections is recorded per stack of section names. the CPU time
+# includes the CPU time of finished child processes, e.g. zip or javac started
+# by execute. sections recorded in worker processes are merged into the stack
+# of the parent process that started the workers
+profile_enabled = False
+profile_stack = [] # [(name, wall start time, CPU start time)]
+profile_records = {} # tuple of section names -> [count, wall time, CPU time]
+
+def get_profile_cpu_time():
+    times = os.times()
+
+    return times.user + times.system + times.children_user + times.children_system
+
+@contextlib.contextmanager
+def profile_section(name):
+    if not profile_enabled:
+        yield
+        return
+
+    profile_stack.append((name, time.perf_counter(), get_profile_cpu_time()))
+
+    try:
+        yield
+    finally:
+        stack = tuple([item[0] for item in profile_stack])
+        _, wall_start, cpu_start = profile_stack.pop()
+        record = profile_records.setdefault(stack, [0, 0.0, 0.0])
+
+        record[0] += 1
+        record[1] += time.perf_counter() - wall_start
+        record[2] += get_profile_cpu_time() - cpu_start
+
+# prepares a worker process to record its sections independent of the stack
+# it might have inherited from its parent process
+def reset_profile(enabled):
+    global profile_enabled
+    profile_enabled = enabled
+
+    del profile_stack[:]
+    profile_records.clear()
+
+def merge_profile_records(records):
+    prefix = tuple([item[0] for item in profile_stack])
+
+    for stack, (count, wall_time, cpu_time) in records.items():
+        record = profile_records.setdefault(prefix + stack, [0, 0.0, 0.0])
+
+        record[0] += count
+        record[1] += wall_time
+        record[2] += cpu_time
+
+# writes the records as JSON and as collapsed stacks with the self wall time
+# in microseconds that can be fed into flamegraph.pl or speedscope. for work
+# done in parallel the time of the subsections can exceed the wall time of
+# their section, the self time is then clamped to zero
+def write_profile_report(path):
+    children_times = {}
+
+    for stack, (_, wall_time, cpu_time) in profile_records.items():
+        if len(stack) > 1:
+            children_time = children_times.setdefault(stack[:-1], [0.0, 0.0])
+            children_time[0] += wall_time
+            children_time[1] += cpu_time
+
+    sections = []
+
+    for stack, (count, wall_time, cpu_time) in profile_records.items():
+        children_wall_time, children_cpu_time = children_times.get(stack, [0.0, 0.0])
+
+        sections.append({'stack': list(stack),
+                         'count': count,
+                         'wall_time': wall_time,
+                         'cpu_time': cpu_time,
+                         'self_wall_time': max(wall_time - children_wall_time, 0.0),
+                         'self_cpu_time': max(cpu_time - children_cpu_time, 0.0)})
+
+    sections.sort(key=lambda section: section['stack'])
+
+    with open(path, 'w') as f:
+        json.dump({'sections': sections}, f, indent=1)
+
+    folded_path = os.path.splitext(path)[0] + '.folded'
+
+    with open(folded_path, 'w') as f:
+        for section in sections:
+            self_wall_time = int(section['self_wall_time'] * 1000000)
+
+            if self_wall_time > 0:
+                f.write('{0} {1}\n'.format(';'.join(section['stack']), self_wall_time))
+
+    print('profile written to {0} and {1}'.format(path, folded_path))
+
+def start_profile(name, path):
+    reset_profile(True)
+
+    section = profile_section(name)
+    section.__enter__()
+
+    def finish():
+        section.__exit__(None, None, None)
+        write_profile_report(path)
+
+    atexit.register(finish)
+
 def html_escape(text):
     return text.replace("&", "&amp;").replace('"', "&quot;").replace("'", "&apos;").replace(">", "&gt;").replace("<", "&lt;")
 
@@ -1100,7 +1218,7 @@ def copy_examples(copy_files, path):
     for copy_file in copy_files:
         doc_dest = os.path.join(doc_path, copy_file[1])
         doc_src = copy_file[0]
-        shutil.copy(doc_src, doc_dest)
+        copy_output_file(doc_src, doc_dest)
         print_verbose('      - {0}'.format(copy_file[1]))
 
     if len(copy_files) == 0:
@@ -1453,6 +1571,130 @@ def recreate_dir(path):
 
     os.makedirs(path)
 
+# generators write their output files using write_output_file, open_output_file
+# or copy_output_file. an output file is only written if its new content
+# differs from its existing content in more than the date in the header
+# comment. otherwise it is left untouched and keeps its mtime. output
+# directories are recreated using recreate_output_dir that moves the old
+# directory aside instead of removing it. write_output_file moves unchanged
+# files back from there and remove_previous_output_dirs removes the remaining
+# stale files at the end of the run
+output_file_date_pattern = re.compile(b'automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}')
+output_file_counts = {'written': 0, 'skipped': 0}
+output_file_paths = [] # absolute paths of all files passed to write_output_file, see generate_device
+previous_output_dirs = {} # absolute output dir -> absolute dir with its previous content
+
+def recreate_output_dir(path):
+    path = os.path.abspath(path)
+    previous_path = os.path.join(os.path.dirname(path), '.{0}.previous'.format(os.path.basename(path)))
+
+    if os.path.exists(previous_path):
+        shutil.rmtree(previous_path)
+
+    if os.path.exists(path):
+        os.rename(path, previous_path)
+        previous_output_dirs[path] = previous_path
+
+    os.makedirs(path)
+
+def remove_previous_output_dirs():
+    for previous_path in previous_output_dirs.values():
+        if os.path.exists(previous_path):
+            shutil.rmtree(previous_path)
+
+    previous_output_dirs.clear()
+
+def get_previous_output_file_path(path):
+    for output_dir, previous_path in previous_output_dirs.items():
+        if path.startswith(output_dir + os.sep):
+            return os.path.join(previous_path, os.path.relpath(path, output_dir))
+
+    return None
+
+def is_same_output_file_content(path, data):
+    try:
+        with open(path, 'rb') as f:
+            existing_data = f.read()
+    except OSError:
+        return False
+
+    if existing_data == data:
+        return True
+
+    return output_file_date_pattern.sub(b'', existing_data) == output_file_date_pattern.sub(b'', data)
+
+def write_output_file(path, content, encoding=None, newline=None):
+    path = os.path.abspath(path)
+
+    if isinstance(content, str):
+        # same newline translation and encoding as open(path, 'w')
+        if newline == None:
+            content = content.replace('\n', os.linesep)
+        elif newline not in ['', '\n']:
+            content = content.replace('\n', newline)
+
+        data = content.encode(encoding if encoding != None else locale.getpreferredencoding(False))
+    else:
+        data = content
+
+    output_file_paths.append(path)
+
+    with profile_section('write'):
+        if is_same_output_file_content(path, data):
+            output_file_counts['skipped'] += 1
+            return
+
+        if not os.path.exists(path):
+            previous_path = get_previous_output_file_path(path)
+
+            if previous_path != None and is_same_output_file_content(previous_path, data):
+                os.replace(previous_path, path)
+                output_file_counts['skipped'] += 1
+                return
+
+        # write to a temporary file first and replace the output file with it,
+        # generate_all.py can run generators in parallel that write the same
+        # file (e.g. device_infos.py), readers must never see a partial file
+        tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+
+        os.replace(tmp_path, path)
+
+        output_file_counts['written'] += 1
+
+def copy_output_file(source_path, destination_path):
+    if os.path.isdir(destination_path):
+        destination_path = os.path.join(destination_path, os.path.basename(source_path))
+
+    with open(source_path, 'rb') as f:
+        write_output_file(destination_path, f.read())
+
+# buffers everything written to it and passes it to write_output_file on close,
+# can be used as a replacement for open(path, 'w')
+class OutputFile(io.StringIO):
+    def __init__(self, path, encoding=None, newline=None):
+        io.StringIO.__init__(self)
+
+        self.path = path
+        self.output_encoding = encoding
+        self.output_newline = newline
+
+    def close(self):
+        if not self.closed:
+            write_output_file(self.path, self.getvalue(), encoding=self.output_encoding, newline=self.output_newline)
+
+        io.StringIO.close(self)
+
+def open_output_file(path, encoding=None, newline=None):
+    return OutputFile(path, encoding=encoding, newline=newline)
+
 def specialize_template(template_filename, destination_filename, replacements, check_completeness=True, remove_template=False):
     lines = []
     replaced = set()
@@ -1472,7 +1714,7 @@ def specialize_template(template_filename, destination_filename, replacements, c
     if check_completeness and replaced != set(replacements.keys()):
         raise GeneratorError('Not all replacements for {0} have been applied'.format(template_filename))
 
-    with open(destination_filename, 'w') as f:
+    with open_output_file(destination_filename) as f:
         f.writelines(lines)
 
     if remove_template:
@@ -1504,43 +1746,666 @@ def wrap_non_empty(prefix, middle, suffix):
 
 def execute(args, **kwargs):
     error = 'command failed: {0}'.format(' '.join(args) if isinstance(args, list) else args)
+    tool = os.path.basename(args[0] if isinstance(args, list) else args.split(' ')[0])
 
     try:
-        if subprocess.call(args, **kwargs) != 0:
-            sys.exit(1)
+        with profile_section('execute:' + tool):
+            if subprocess.call(args, **kwargs) != 0:
+                sys.exit(1)
     except Exception as e:
         print(error + '\n' + str(e))
         sys.exit(1)
 
+# creates a zip file from the content of a directory. the entries are sorted and
+# get a fixed timestamp, so the zip file only changes if the content changes. a
+# manifest with the size and SHA-256 of every file is written next to the zip
+# file. comparing the manifests of two zip files shows which files changed
+# without unpacking them
+zip_file_date_time = (1980, 1, 1, 0, 0, 0)
+
+def create_deterministic_zip_file(source_path, zip_path):
+    entries = []
+
+    for root, dirnames, filenames in os.walk(source_path, followlinks=True):
+        dirnames.sort()
+
+        for name in dirnames + filenames:
+            path = os.path.join(root, name)
+
+            if os.path.abspath(path) != os.path.abspath(zip_path):
+                entries.append((os.path.relpath(path, source_path).replace(os.sep, '/'), path))
+
+    entries.sort()
+    manifest = []
+    tmp_zip_path = '{0}.{1}.tmp'.format(zip_path, os.getpid())
+
+    with profile_section('zip'):
+        with zipfile.ZipFile(tmp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name, path in entries:
+                mode = os.stat(path).st_mode
+
+                if stat.S_ISDIR(mode):
+                    info = zipfile.ZipInfo(name + '/', date_time=zip_file_date_time)
+                    info.external_attr = ((mode & 0xFFFF) << 16) | 0x10 # MS-DOS directory flag
+                    info.create_system = 3 # unix, to make the permissions effective
+                    zf.writestr(info, b'', compress_type=zipfile.ZIP_STORED)
+                else:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+
+                    info = zipfile.ZipInfo(name, date_time=zip_file_date_time)
+                    info.external_attr = (mode & 0xFFFF) << 16
+                    info.create_system = 3
+                    zf.writestr(info, data, compress_type=zipfile.ZIP_DEFLATED)
+
+                    manifest.append('{0} {1} {2}\n'.format(hashlib.sha256(data).hexdigest(), len(data), name))
+
+        os.replace(tmp_zip_path, zip_path)
+
+    with open(os.path.splitext(zip_path)[0] + '.manifest', 'w') as f:
+        f.writelines(manifest)
+
+# compares two directory trees like "diff -r -U <context>" does and returns the
+# output as a list of lines. generated date and bindings version lines are
+# normalized before comparison: hunks that only change them are reduced to their
+# @@ line marked with "// dropped header hunk" and files that only differ in
+# them are reduced to their diff line marked with "// dropped header diff".
+# identical files are skipped by comparing their SHA-256 hashes, the remaining
+# files are diffed in parallel
+diff_normalize_patterns = [(re.compile(r'(automatically generated on )[0-9]{4}-[0-9]{2}-[0-9]{2}\.'), r'\1YYYY-MM-DD.'),
+                           (re.compile(r'(Bindings Version )[0-9]+\.[0-9]+\.[0-9]+ *'), r'\1X.Y.Z ')]
+
+def get_file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def normalize_diff_line(line):
+    for pattern, replacement in diff_normalize_patterns:
+        line = pattern.sub(replacement, line)
+
+    return line
+
+def get_diff_file_label(label, path):
+    timestamp = os.stat(path).st_mtime
+    fraction = int(round((timestamp - int(timestamp)) * 1000000000)) % 1000000000
+
+    return '{0}\t{1}.{2:09} {3}'.format(label, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp)),
+                                         fraction, time.strftime('%z', time.localtime(timestamp)))
+
+def get_diff_hunk_range(start, end):
+    if end - start == 1:
+        return str(start + 1)
+
+    if end == start:
+        return '{0},0'.format(start)
+
+    return '{0},{1}'.format(start + 1, end - start)
+
+def get_diff_hunk_lines(lines, start, end, prefix):
+    result = []
+
+    for line in lines[start:end]:
+        if line.endswith('\n'):
+            result.append(prefix + line)
+        else:
+            result += [prefix + line + '\n', '\\ No newline at end of file\n']
+
+    return result
+
+def diff_files(old_path, new_path, old_label, new_label, context):
+    with open(old_path, 'rb') as f:
+        old_data = f.read()
+
+    with open(new_path, 'rb') as f:
+        new_data = f.read()
+
+    header = 'diff -ru{0} {1} {2}\n'.format(context, old_label, new_label)
+
+    if b'\0' in old_data[:8192] or b'\0' in new_data[:8192]:
+        return [header, 'Binary files {0} and {1} differ\n'.format(old_label, new_label)]
+
+    old_lines = old_data.decode('utf-8', errors='replace').splitlines(True)
+    new_lines = new_data.decode('utf-8', errors='replace').splitlines(True)
+    old_normalized = [normalize_diff_line(line) for line in old_lines]
+    new_normalized = [normalize_diff_line(line) for line in new_lines]
+
+    if old_normalized == new_normalized:
+        return [header.rstrip() + ' // dropped header diff\n']
+
+    lines = [header,
+             '--- {0}\n'.format(get_diff_file_label(old_label, old_path)),
+             '+++ {0}\n'.format(get_diff_file_label(new_label, new_path))]
+
+    for group in difflib.SequenceMatcher(None, old_lines, new_lines).get_grouped_opcodes(context):
+        hunk = ['@@ -{0} +{1} @@\n'.format(get_diff_hunk_range(group[0][1], group[-1][2]), get_diff_hunk_range(group[0][3], group[-1][4]))]
+        header_only = True
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                hunk += get_diff_hunk_lines(old_lines, i1, i2, ' ')
+                continue
+
+            if old_normalized[i1:i2] != new_normalized[j1:j2]:
+                header_only = False
+
+            hunk += get_diff_hunk_lines(old_lines, i1, i2, '-')
+            hunk += get_diff_hunk_lines(new_lines, j1, j2, '+')
+
+        if header_only:
+            lines.append(hunk[0].rstrip() + ' // dropped header hunk\n')
+        else:
+            lines += hunk
+
+    return lines
+
+def diff_files_in_worker(args):
+    return diff_files(*args)
+
+def diff_directories(old_path, new_path, old_label, new_label, context, jobs=None, compare_modes=False):
+    items = [] # list of output lines or of argument tuples for diff_files
+
+    def compare(old_dir, new_dir, old_dir_label, new_dir_label):
+        old_names = set(os.listdir(old_dir))
+        new_names = set(os.listdir(new_dir))
+
+        for name in sorted(old_names | new_names):
+            old_item = os.path.join(old_dir, name)
+            new_item = os.path.join(new_dir, name)
+            old_item_label = old_dir_label + '/' + name
+            new_item_label = new_dir_label + '/' + name
+
+            if name not in new_names:
+                items.append('Only in {0}: {1}\n'.format(old_dir_label, name))
+            elif name not in old_names:
+                items.append('Only in {0}: {1}\n'.format(new_dir_label, name))
+            elif os.path.isdir(old_item) != os.path.isdir(new_item):
+                items.append('File {0} is a {1} while file {2} is a {3}\n'.format(old_item_label, 'directory' if os.path.isdir(old_item) else 'regular file',
+                                                                                   new_item_label, 'directory' if os.path.isdir(new_item) else 'regular file'))
+            else:
+                if compare_modes:
+                    old_mode = stat.S_IMODE(os.stat(old_item).st_mode)
+                    new_mode = stat.S_IMODE(os.stat(new_item).st_mode)
+
+                    if old_mode != new_mode:
+                        items.append('File {0} has mode {1:04o} while file {2} has mode {3:04o}\n'.format(old_item_label, old_mode, new_item_label, new_mode))
+
+                if os.path.isdir(old_item):
+                    compare(old_item, new_item, old_item_label, new_item_label)
+                elif os.path.getsize(old_item) != os.path.getsize(new_item) or get_file_hash(old_item) != get_file_hash(new_item):
+                    items.append((old_item, new_item, old_item_label, new_item_label, context))
+
+    compare(old_path, new_path, old_label, new_label)
+
+    pending = [item for item in items if isinstance(item, tuple)]
+
+    if jobs == None:
+        jobs = multiprocessing.cpu_count()
+
+    if jobs > 1 and len(pending) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('fork')) as executor:
+            results = list(executor.map(diff_files_in_worker, pending, chunksize=max(1, len(pending) // (jobs * 4))))
+    else:
+        results = [diff_files(*args) for args in pending]
+
+    results.reverse()
+    lines = []
+
+    for item in items:
+        if isinstance(item, tuple):
+            lines += results.pop()
+        else:
+            lines.append(item)
+
+    return lines
+
 def generate(root_dir, language, internal, generator_class):
     print('=== language: {0}'.format(language))
 
-    # default config
-    subgenerate(root_dir, language, internal, generator_class, 'tinkerforge')
+    with profile_section('language:' + language):
+        # default config
+        with profile_section('config:tinkerforge'):
+            subgenerate(root_dir, language, internal, generator_class, 'tinkerforge')
 
-    # custom configs
-    config_base_path = os.path.join(root_dir, '..', 'configs')
+        # custom configs
+        config_base_path = os.path.join(root_dir, '..', 'configs')
 
-    for config_name in os.listdir(config_base_path):
-        if config_name == '__pycache__':
-            continue
+        for config_name in os.listdir(config_base_path):
+            if config_name == '__pycache__':
+                continue
+
+            config_path = os.path.join(config_base_path, config_name)
+
+            if not os.path.isdir(config_path):
+                continue
+
+            if re.match('^[a-z0-9_]+$', config_name) == None:
+                raise GeneratorError('Invalid config name: {0}'.format(config_name))
+
+            with profile_section('config:' + config_name):
+                subgenerate(root_dir, language, internal, generator_class, config_name)
 
-        config_path = os.path.join(config_base_path, config_name)
+# the device model of a config set is the list of (config filename, com) tuples
+# of all its *_config.py files, with the common constant groups and packets
+# already included in each com. building it requires importing all configs and
+# deep-copying the common parts per device. therefore, the model is pickled and
+# cached on disk and in memory, keyed by a hash of all config files and of this
+# file. each call of load_device_model returns a fresh copy of the model that
+# the caller is allowed to modify
+device_model_cache_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '.device_model_cache')
+device_model_cache = {} # config_name -> (hash, pickled model)
 
-        if not os.path.isdir(config_path):
+def prepare_common_constant_groups(com, common_constant_groups):
+    features = com['features']
+
+    for common_constant_group in common_constant_groups:
+        if common_constant_group['feature'] not in features:
+            common_constant_group['to_be_removed'] = True
+
+    return filter(lambda x: 'to_be_removed' not in x, common_constant_groups)
+
+def prepare_common_packets(com, common_packets):
+    features = com['features']
+
+    for common_packet in common_packets:
+        if not common_packet.get('is_virtual', False):
+            if com['name'] in common_packet['since_firmware']:
+                common_packet['since_firmware'] = common_packet['since_firmware'][com['name']]
+            else:
+                common_packet['since_firmware'] = common_packet['since_firmware']['*']
+
+            if common_packet['since_firmware'] == None:
+                common_packet['to_be_removed'] = True
+
+        if common_packet['feature'] not in features:
+            common_packet['to_be_removed'] = True
+
+    return filter(lambda x: 'to_be_removed' not in x, common_packets)
+
+def get_device_model_hash(config_path):
+    config_base_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'configs')
+    paths = [os.path.realpath(__file__)]
+
+    for path in sorted(set([config_base_path, config_path])):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.py'):
+                paths.append(os.path.join(path, name))
+
+    h = hashlib.sha256()
+    h.update(sys.version.encode('utf-8'))
+
+    for path in paths:
+        h.update(os.path.basename(path).encode('utf-8'))
+
+        with open(path, 'rb') as f:
+            h.update(f.read())
+
+    return h.hexdigest()
+
+def build_device_model(config_path, config_subdir):
+    model = []
+
+    for config in sorted(os.listdir(config_path)):
+        if not config.endswith('_config.py'):
             continue
 
-        if re.match('^[a-z0-9_]+$', config_name) == None:
-            raise GeneratorError('Invalid config name: {0}'.format(config_name))
+        com = copy.deepcopy(importlib.import_module('generators.configs{0}.{1}'.format(config_subdir, config[:-3])).com)
+
+        if 'common_included' not in com:
+            com['constant_groups'].extend(prepare_common_constant_groups(com, copy.deepcopy(device_commonconfig.common_constant_groups)))
+            com['packets'].extend(prepare_common_packets(com, copy.deepcopy(device_commonconfig.common_packets)))
+            com['common_included'] = True
+
+        model.append((config, com))
+
+    return model
+
+def load_device_model(config_name, config_path, config_subdir):
+    model_hash = get_device_model_hash(config_path)
+    cached = device_model_cache.get(config_name)
+
+    if cached != None and cached[0] == model_hash:
+        return pickle.loads(cached[1])
 
-        subgenerate(root_dir, language, internal, generator_class, config_name)
+    cache_path = os.path.join(device_model_cache_dir, '{0}_{1}.pickle'.format(config_name, model_hash))
+
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+
+        model = pickle.loads(data)
+    except Exception:
+        model = None
+
+    if model == None:
+        with profile_section('config_import'):
+            model = build_device_model(config_path, config_subdir)
+        data = pickle.dumps(model, pickle.HIGHEST_PROTOCOL)
+
+        try:
+            os.makedirs(device_model_cache_dir, exist_ok=True)
+
+            for name in os.listdir(device_model_cache_dir):
+                if re.match('^{0}_[0-9a-f]+\\.pickle$'.format(config_name), name) != None:
+                    os.remove(os.path.join(device_model_cache_dir, name))
+
+            # write to a temporary file first, another generator process
+            # might be reading or writing the same cache file concurrently
+            tmp_path = '{0}.{1}.tmp'.format(cache_path, os.getpid())
+
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print_verbose('could not write device model cache {0}: {1}'.format(cache_path, e))
+
+    device_model_cache[config_name] = (model_hash, data)
+
+    return model
+
+# a generator with incremental set to True can skip writing the files of
+# devices whose inputs did not change since its last run. the inputs of a
+# device are its config file, all other .py files in the configs directory
+# (e.g. device_commonconfig.py), this file, all top-level files of the
+# bindings directory (generators, <language>_common.py, templates, changelog,
+# etc.) and the modules the generator classes are defined in. all bindings
+# generators run incrementally, see BindingsGenerator. the manifest records the input hash and the output files of every
+# device, see subgenerate and BindingsGenerator.is_unchanged_device
+generation_manifest_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '.generation_manifests')
+
+class GenerationManifest(object):
+    def __init__(self, generator, config_path, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(generation_manifest_dir, '{0}_{1}_{2}_{3}.json'.format(generator.get_bindings_name(),
+                                                                                         generator.__class__.__name__,
+                                                                                         generator.get_config_name().under,
+                                                                                         generator.get_language()))
+        self.devices = {} # config filename -> {'hash': input hash, 'files': [output paths relative to output dir]}
+        self.config_path = config_path
+
+        h = hashlib.sha256()
+        h.update(repr((generator.get_language(), generator.internal, generator.get_config_name().under)).encode('utf-8'))
+
+        paths = [os.path.realpath(__file__)]
+        root_dir = generator.get_root_dir()
+
+        for name in sorted(os.listdir(root_dir)):
+            path = os.path.join(root_dir, name)
+
+            if os.path.isfile(path) and not name.endswith('.zip') and not name.endswith('.manifest'):
+                paths.append(path)
+
+        # generators can inherit from the generator of other bindings (e.g.
+        # LabVIEW from C#), include the modules of all their classes
+        for base_class in [generator.__class__, generator.get_device_class(), generator.get_packet_class(), generator.get_element_class()]:
+            for cls in base_class.__mro__:
+                path = getattr(sys.modules.get(cls.__module__), '__file__', None)
+
+                if path != None and path.endswith('.py') and os.path.realpath(path) not in paths:
+                    paths.append(os.path.realpath(path))
+
+        config_base_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'configs')
+
+        for path in [config_base_path, config_path]:
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.py') and not name.endswith('_config.py'):
+                    paths.append(os.path.join(path, name))
+
+        for path in paths:
+            h.update(os.path.basename(path).encode('utf-8'))
+
+            with open(path, 'rb') as f:
+                h.update(f.read())
+
+        self.global_hash = h.hexdigest()
+
+        try:
+            with open(self.path, 'r') as f:
+                self.old = json.load(f)
+        except (OSError, ValueError):
+            self.old = {}
+
+        if self.old.get('global_hash') != self.global_hash or not os.path.isdir(output_dir):
+            self.old = {}
+
+    def get_device_hash(self, config):
+        h = hashlib.sha256()
+        h.update(self.global_hash.encode('utf-8'))
+
+        with open(os.path.join(self.config_path, config), 'rb') as f:
+            h.update(f.read())
+
+        return h.hexdigest()
+
+    # an incremental run only rewrites the files of changed devices. this
+    # requires a manifest for the same global inputs and the same devices
+    def can_run_incrementally(self, configs):
+        return set(self.old.get('devices', {}).keys()) == set(configs)
+
+    def is_unchanged_device(self, config, device_hash):
+        old_device = self.old.get('devices', {}).get(config)
+
+        if old_device == None or old_device['hash'] != device_hash:
+            return False
+
+        for name in old_device['files']:
+            if not os.path.exists(os.path.join(self.output_dir, name)):
+                return False
+
+        return True
+
+    def get_relative_paths(self, paths):
+        output_dir = os.path.abspath(self.output_dir)
+
+        return sorted(set([os.path.relpath(path, output_dir) for path in paths if path.startswith(output_dir + os.sep)]))
+
+    def add_device(self, config, device_hash, files):
+        self.devices[config] = {'hash': device_hash, 'files': sorted(files)}
+
+    # removes files of regenerated devices that they didn't write again, e.g.
+    # after a device was renamed
+    def remove_stale_files(self):
+        current = set()
+
+        for device in self.devices.values():
+            current |= set(device['files'])
+
+        for config, old_device in self.old.get('devices', {}).items():
+            for name in old_device['files']:
+                if name not in current:
+                    path = os.path.join(self.output_dir, name)
+
+                    if os.path.exists(path):
+                        print_verbose('  - removing stale file {0}'.format(name))
+                        os.remove(path)
+
+    def save(self):
+        os.makedirs(generation_manifest_dir, exist_ok=True)
+
+        tmp_path = '{0}.{1}.tmp'.format(self.path, os.getpid())
+
+        with open(tmp_path, 'w') as f:
+            json.dump({'global_hash': self.global_hash, 'devices': self.devices}, f, indent=1, sort_keys=True)
+
+        os.replace(tmp_path, self.path)
+
+# a generator with parallel_device_attributes set to a list of attribute
+# names can generate its devices in device_jobs processes. generate(device)
+# is then called in a forked worker process and is only allowed to modify the
+# generator by appending to the listed attributes, which are collected per
+# device and merged back into the generator of the parent process before
+# finish() is called. the generator has to support this explicitly, because
+# all other modifications of the generator by generate(device) are lost
+device_jobs = 1 # set by dockerize
+device_worker_state = None # (generator, manifest) inherited by the forked worker processes
+
+def get_device_info(device):
+    if device.is_brick():
+        ref_name = device.get_name().under + '_brick'
+        hardware_doc_name = device.get_short_display_name().replace(' ', '_').replace('/', '_').replace('-', '').replace('2.0', 'V2').replace('3.0', 'V3') + '_Brick'
+        software_doc_prefix = device.get_name().camel + '_Brick'
+
+        if device.get_device_identifier() != 17:
+            firmware_url_part = device.get_name().under
+        else:
+            firmware_url_part = None
+
+        device_info = (device.get_device_identifier(),
+                       'Brick',
+                       device.get_long_display_name(),
+                       device.get_short_display_name(),
+                       ref_name,
+                       hardware_doc_name,
+                       software_doc_prefix,
+                       device.get_git_name(),
+                       firmware_url_part,
+                       device.has_comcu(),
+                       device.is_released(),
+                       device.is_documented(),
+                       device.is_discontinued(),
+                       True,
+                       device.get_description())
+
+        return 'brick', device_info
+    elif device.is_bricklet():
+        ref_name = device.get_name().under + '_bricklet'
+        hardware_doc_name = device.get_short_display_name().replace(' ', '_').replace('/', '_').replace('-', '').replace('2.0', 'V2').replace('3.0', 'V3')
+        software_doc_prefix = device.get_name().camel + '_Bricklet'
+        firmware_url_part = device.get_name().under
+
+        device_info = (device.get_device_identifier(),
+                       'Bricklet',
+                       device.get_long_display_name(),
+                       device.get_short_display_name(),
+                       ref_name,
+                       hardware_doc_name,
+                       software_doc_prefix,
+                       device.get_git_name(),
+                       firmware_url_part,
+                       device.has_comcu(),
+                       device.is_released(),
+                       device.is_documented(),
+                       device.is_discontinued(),
+                       True,
+                       device.get_description())
+
+        return 'bricklet', device_info
+    elif device.is_tng():
+        ref_name = 'tng_' + device.get_name().under
+        hardware_doc_name = device.get_short_display_name().replace(' ', '_').replace('/', '_').replace('-', '').replace('2.0', 'V2').replace('3.0', 'V3')
+        software_doc_prefix = 'TNG_' + device.get_name().camel
+        firmware_url_part = device.get_name().under
+
+        device_info = (device.get_device_identifier(),
+                       'TNG',
+                       device.get_long_display_name(),
+                       device.get_short_display_name(),
+                       ref_name,
+                       hardware_doc_name,
+                       software_doc_prefix,
+                       device.get_git_name(),
+                       firmware_url_part,
+                       False,
+                       device.is_released(),
+                       device.is_documented(),
+                       device.is_discontinued(),
+                       True,
+                       device.get_description())
+
+        return 'tng', device_info
+    else:
+        assert False
+
+def generate_device(generator, manifest, config, com):
+    if com['documented'] and not com['released']:
+        raise GeneratorError('{0} is marked as documented, but as not released'.format(config[:-10]))
+
+    if generator.is_openhab_doc_generator:
+        com['packets'] = [x for x in com['packets'] if 'openhab_doc' not in x or x['openhab_doc']]
+    else:
+        com['packets'] = [x for x in com['packets'] if 'openhab_doc' not in x or not x['openhab_doc']]
+
+    with profile_section('model'):
+        device = generator.get_device_class()(com, generator)
+
+    device_identifier = device.get_device_identifier()
+    unchanged = False
+    manifest_device = None
+
+    with profile_section('generate'):
+        if manifest != None:
+            device_hash = manifest.get_device_hash(config)
+
+            if generator.incremental_run and manifest.is_unchanged_device(config, device_hash):
+                unchanged = True
+                generator.unchanged_device_identifiers.add(device_identifier)
+                generator.generate(device)
+                manifest_device = (device_hash, manifest.old['devices'][config]['files'])
+            else:
+                start = len(output_file_paths)
+                generator.generate(device)
+                manifest_device = (device_hash, manifest.get_relative_paths(output_file_paths[start:]))
+        else:
+            generator.generate(device)
+
+    return device_identifier, unchanged, manifest_device, get_device_info(device)
+
+def generate_device_in_worker(config_and_com):
+    generator, manifest = device_worker_state
+
+    for name in generator.parallel_device_attributes:
+        setattr(generator, name, [])
+
+    output_file_counts['written'] = 0
+    output_file_counts['skipped'] = 0
+
+    reset_profile(profile_enabled)
+
+    with profile_section('device:' + config_and_com[0][:-10]):
+        result = generate_device(generator, manifest, *config_and_com)
+
+    collected = {name: getattr(generator, name) for name in generator.parallel_device_attributes}
+
+    return result, collected, dict(output_file_counts), dict(profile_records)
+
+def merge_device_result(generator, manifest, config, com, result, device_identifiers, device_infos):
+    device_identifier, unchanged, manifest_device, (category, device_info) = result
+
+    if not com['released'] and not com['documented']:
+        print_verbose('  * {0} \033[01;36m(not released, not documented)\033[0m'.format(config[:-10]))
+    elif not com['released']:
+        print_verbose('  * {0} \033[01;36m(not released)\033[0m'.format(config[:-10]))
+    elif not com['documented']:
+        print_verbose('  * {0} \033[01;36m(not documented)\033[0m'.format(config[:-10]))
+    else:
+        print_verbose('  * {0}'.format(config[:-10]))
+
+    if device_identifier in device_identifiers:
+        raise GeneratorError('Device identifier {0} is not unique'.format(device_identifier))
+
+    device_identifiers.add(device_identifier)
+
+    if unchanged:
+        generator.unchanged_device_identifiers.add(device_identifier)
+
+    if manifest_device != None:
+        manifest.add_device(config, *manifest_device)
+
+    # only collect device_infos for default config
+    if generator.get_config_name().under == 'tinkerforge':
+        device_infos[category].append(device_info)
 
 def subgenerate(root_dir, language, internal, generator_class, config_name):
     global lang
+    global device_worker_state
     lang = language
 
     print('--> {0}'.format(config_name))
 
+    output_file_counts['written'] = 0
+    output_file_counts['skipped'] = 0
+    del output_file_paths[:]
+
     config_path_parts = [root_dir, '..', 'configs']
 
     if config_name != 'tinkerforge':
@@ -1551,163 +2416,63 @@ def subgenerate(root_dir, language, internal, generator_class, config_name):
 
     config_path = os.path.join(*config_path_parts)
 
-    common_constant_groups = copy.deepcopy(device_commonconfig.common_constant_groups)
-    common_packets = copy.deepcopy(device_commonconfig.common_packets)
-
     brick_infos = []
     bricklet_infos = []
     tng_infos = []
+    device_infos = {'brick': brick_infos, 'bricklet': bricklet_infos, 'tng': tng_infos}
     device_identifiers = set()
 
     generator = generator_class(root_dir, language, internal, config_name)
-    generator.prepare()
 
-    def prepare_common_constant_groups(com, common_constant_groups):
-        features = com['features']
+    with profile_section('load_device_model'):
+        device_model = load_device_model(config_name, config_path, config_subdir)
+    manifest = None
 
-        for common_constant_group in common_constant_groups:
-            if common_constant_group['feature'] not in features:
-                common_constant_group['to_be_removed'] = True
+    if generator.incremental:
+        manifest = GenerationManifest(generator, config_path, generator.get_bindings_dir())
+        generator.incremental_run = manifest.can_run_incrementally([config for config, _ in device_model])
 
-        return filter(lambda x: 'to_be_removed' not in x, common_constant_groups)
+        if generator.incremental_run:
+            print_verbose('  incremental run')
 
-    def prepare_common_packets(com, common_packets):
-        features = com['features']
+    with profile_section('prepare'):
+        generator.prepare()
 
-        for common_packet in common_packets:
-            if not common_packet.get('is_virtual', False):
-                if com['name'] in common_packet['since_firmware']:
-                    common_packet['since_firmware'] = common_packet['since_firmware'][com['name']]
-                else:
-                    common_packet['since_firmware'] = common_packet['since_firmware']['*']
-
-                if common_packet['since_firmware'] == None:
-                    common_packet['to_be_removed'] = True
-
-            if common_packet['feature'] not in features:
-                common_packet['to_be_removed'] = True
+    if device_jobs > 1 and generator.parallel_device_attributes != None and 'fork' in multiprocessing.get_all_start_methods():
+        device_worker_state = (generator, manifest)
 
-        return filter(lambda x: 'to_be_removed' not in x, common_packets)
-
-    for config in sorted(os.listdir(config_path)):
-        if not config.endswith('_config.py'):
-            continue
-
-        com = copy.deepcopy(importlib.import_module('generators.configs{0}.{1}'.format(config_subdir, config[:-3])).com)
-
-        if com['documented'] and not com['released']:
-            raise GeneratorError('{0} is marked as documented, but as not released'.format(config[:-10]))
-
-        if not com['released'] and not com['documented']:
-            print_verbose('  * {0} \033[01;36m(not released, not documented)\033[0m'.format(config[:-10]))
-        elif not com['released']:
-            print_verbose('  * {0} \033[01;36m(not released)\033[0m'.format(config[:-10]))
-        elif not com['documented']:
-            print_verbose('  * {0} \033[01;36m(not documented)\033[0m'.format(config[:-10]))
-        else:
-            print_verbose('  * {0}'.format(config[:-10]))
-
-        if 'common_included' not in com:
-            com['constant_groups'].extend(prepare_common_constant_groups(com, copy.deepcopy(common_constant_groups)))
-            com['packets'].extend(prepare_common_packets(com, copy.deepcopy(common_packets)))
-            com['common_included'] = True
-
-        if generator.is_openhab_doc_generator:
-            com['packets'] = [x for x in com['packets'] if 'openhab_doc' not in x or x['openhab_doc']]
-        else:
-            com['packets'] = [x for x in com['packets'] if 'openhab_doc' not in x or not x['openhab_doc']]
-
-        device = generator.get_device_class()(com, generator)
-        device_identifier = device.get_device_identifier()
+        # the forked worker processes inherit the prepared generator. the
+        # results are merged in config order to keep the output deterministic
+        with concurrent.futures.ProcessPoolExecutor(max_workers=device_jobs, mp_context=multiprocessing.get_context('fork')) as executor:
+            results = executor.map(generate_device_in_worker, device_model, chunksize=4)
 
-        if device_identifier in device_identifiers:
-            raise GeneratorError('Device identifier {0} is not unique'.format(device_identifier))
+            for (config, com), (result, collected, counts, records) in zip(device_model, results):
+                for name, values in collected.items():
+                    getattr(generator, name).extend(values)
 
-        device_identifiers.add(device_identifier)
+                for key, count in counts.items():
+                    output_file_counts[key] += count
 
-        generator.generate(device)
+                merge_profile_records(records)
 
-        # only collect device_infos for default config
-        if config_name != 'tinkerforge':
-            continue
+                merge_device_result(generator, manifest, config, com, result, device_identifiers, device_infos)
 
-        if device.is_brick():
-            ref_name = device.get_name().under + '_brick'
-            hardware_doc_name = device.get_short_display_name().replace(' ', '_').replace('/', '_').replace('-', '').replace('2.0', 'V2').replace('3.0', 'V3') + '_Brick'
-            software_doc_prefix = device.get_name().camel + '_Brick'
+        device_worker_state = None
+    else:
+        for config, com in device_model:
+            with profile_section('device:' + config[:-10]):
+                result = generate_device(generator, manifest, config, com)
 
-            if device.get_device_identifier() != 17:
-                firmware_url_part = device.get_name().under
-            else:
-                firmware_url_part = None
-
-            device_info = (device.get_device_identifier(),
-                           'Brick',
-                           device.get_long_display_name(),
-                           device.get_short_display_name(),
-                           ref_name,
-                           hardware_doc_name,
-                           software_doc_prefix,
-                           device.get_git_name(),
-                           firmware_url_part,
-                           device.has_comcu(),
-                           device.is_released(),
-                           device.is_documented(),
-                           device.is_discontinued(),
-                           True,
-                           device.get_description())
-
-            brick_infos.append(device_info)
-        elif device.is_bricklet():
-            ref_name = device.get_name().under + '_bricklet'
-            hardware_doc_name = device.get_short_display_name().replace(' ', '_').replace('/', '_').replace('-', '').replace('2.0', 'V2').replace('3.0', 'V3')
-            software_doc_prefix = device.get_name().camel + '_Bricklet'
-            firmware_url_part = device.get_name().under
+            merge_device_result(generator, manifest, config, com, result, device_identifiers, device_infos)
 
-            device_info = (device.get_device_identifier(),
-                           'Bricklet',
-                           device.get_long_display_name(),
-                           device.get_short_display_name(),
-                           ref_name,
-                           hardware_doc_name,
-                           software_doc_prefix,
-                           device.get_git_name(),
-                           firmware_url_part,
-                           device.has_comcu(),
-                           device.is_released(),
-                           device.is_documented(),
-                           device.is_discontinued(),
-                           True,
-                           device.get_description())
-
-            bricklet_infos.append(device_info)
-        elif device.is_tng():
-            ref_name = 'tng_' + device.get_name().under
-            hardware_doc_name = device.get_short_display_name().replace(' ', '_').replace('/', '_').replace('-', '').replace('2.0', 'V2').replace('3.0', 'V3')
-            software_doc_prefix = 'TNG_' + device.get_name().camel
-            firmware_url_part = device.get_name().under
+    with profile_section('finish'):
+        generator.finish()
 
-            device_info = (device.get_device_identifier(),
-                           'TNG',
-                           device.get_long_display_name(),
-                           device.get_short_display_name(),
-                           ref_name,
-                           hardware_doc_name,
-                           software_doc_prefix,
-                           device.get_git_name(),
-                           firmware_url_part,
-                           False,
-                           device.is_released(),
-                           device.is_documented(),
-                           device.is_discontinued(),
-                           True,
-                           device.get_description())
-
-            tng_infos.append(device_info)
-        else:
-            assert False
+    if manifest != None:
+        if generator.incremental_run:
+            manifest.remove_stale_files()
 
-    generator.finish()
+        manifest.save()
 
     # only update device_infos.py for default config
     if config_name == 'tinkerforge':
@@ -1719,7 +2484,7 @@ def subgenerate(root_dir, language, internal, generator_class, config_name):
                                {'en': 'Makes all Bricklet signals available',
                                 'de': 'Macht alle Bricklet Signale zugänglich'}))
 
-        with open(os.path.join(root_dir, '..', 'device_infos.py'), 'w') as f:
+        with open_output_file(os.path.join(root_dir, '..', 'device_infos.py')) as f:
             f.write('# -*- coding: utf-8 -*-\n')
             f.write('from collections import namedtuple\n')
             f.write('\n')
@@ -1741,13 +2506,24 @@ def subgenerate(root_dir, language, internal, generator_class, config_name):
 
             f.write(']\n')
 
+    remove_previous_output_dirs()
+
+    print('    {0} files written, {1} files unchanged'.format(output_file_counts['written'], output_file_counts['skipped']))
+
 check_name_valid_word_head = re.compile('^[A-Z]+[A-Z0-9]*[a-z0-9]*$')
 check_name_valid_word_tail = re.compile('^[A-Z0-9]+[a-z0-9]*$')
 check_name_valid_word_constant = re.compile('^[A-Z0-9]+[a-z0-9]*$') # constants are allowed to start with numbers
 check_name_exceptions_whole_name = ['Industrial Dual 0 20mA', 'Industrial Dual 0 20mA V2']
 check_name_exceptions_word_in_constant = ['20mA', '24mA', 'EtOH']
 
+checked_names = set() # (name, display_name, is_constant) of names that passed check_name
+
 def check_name(name, display_name=None, is_constant=False):
+    key = (name, display_name, is_constant)
+
+    if key in checked_names:
+        return
+
     if isinstance(name, tuple):
         raise GeneratorError('Name {0} uses old tuple format, update it to new split-camel-case format'.format(name))
 
@@ -1787,6 +2563,8 @@ def check_name(name, display_name=None, is_constant=False):
             raise GeneratorError("Name '{0}' and display name '{1}' ({2}) mismatch" \
                                  .format(name, display_name, display_name_to_check))
 
+    checked_names.add(key)
+
 def break_string(string, indent_marker, space=' ', continuation='', indent_head='',
                  indent_tail='', indent_suffix='', max_length=90, break_point='<BP>'):
     result = string.replace(break_point, space)
@@ -2409,6 +3187,70 @@ class ConstantGroup(object):
     def is_virtual(self):
         return self.raw_data.get('is_virtual', False)
 
+# resolving a unit name means trying all units with all allowed prefix and
+# inverse prefix combinations. the same few unit names are used by thousands of
+# elements, therefore the resolved combination is cached per unit name
+found_units = {} # unit name -> (unit, prefix, inverse prefix) or None
+
+def find_unit(unit_name):
+    if unit_name not in found_units:
+        unit = None
+
+        for candidate in units:
+            if unit_name == candidate.get_name():
+                unit = (candidate, None, None)
+                break
+
+            candidate_allowed_prefixes = candidate.get_allowed_prefixes()
+            candidate_allowed_inverse_prefixes = candidate.get_allowed_inverse_prefixes()
+
+            for unit_prefix in unit_prefixes:
+                if unit_prefix.symbol not in candidate_allowed_prefixes:
+                    continue
+
+                if unit_name == candidate.get_name(prefix=unit_prefix):
+                    unit = (candidate, unit_prefix, None)
+                    break
+
+                for unit_inverse_prefix in unit_prefixes:
+                    if unit_inverse_prefix.symbol not in candidate_allowed_inverse_prefixes:
+                        continue
+
+                    if unit_name == candidate.get_name(prefix=unit_prefix, inverse_prefix=unit_inverse_prefix):
+                        unit = (candidate, unit_prefix, unit_inverse_prefix)
+                        break
+
+                if unit != None:
+                    break
+
+            if unit != None:
+                break
+
+            for unit_inverse_prefix in unit_prefixes:
+                if unit_inverse_prefix.symbol not in candidate_allowed_inverse_prefixes:
+                    continue
+
+                if unit_name == candidate.get_name(inverse_prefix=unit_inverse_prefix):
+                    unit = (candidate, None, unit_inverse_prefix)
+                    break
+
+            if unit != None:
+                break
+
+        found_units[unit_name] = unit
+
+    found = found_units[unit_name]
+
+    if found == None:
+        return None
+
+    unit, unit_prefix, unit_inverse_prefix = found
+
+    if unit_prefix == None and unit_inverse_prefix == None:
+        return unit
+
+    return unit.clone(prefix=unit_prefix, inverse_prefix=unit_inverse_prefix)
+
 class Element(object):
     def __init__(self, raw_data, packet, level, role):
         self.raw_data = raw_data
@@ -2494,48 +3336,7 @@ class Element(object):
             else:
                 assert self.get_type() not in ['float', 'bool', 'char', 'string'], raw_data
 
-                unit = None
-
-                for candidate in units:
-                    if unit_name == candidate.get_name():
-                        unit = candidate
-                        break
-
-                    candidate_allowed_prefixes = candidate.get_allowed_prefixes()
-                    candidate_allowed_inverse_prefixes = candidate.get_allowed_inverse_prefixes()
-
-                    for unit_prefix in unit_prefixes:
-                        if unit_prefix.symbol not in candidate_allowed_prefixes:
-                            continue
-
-                        if unit_name == candidate.get_name(prefix=unit_prefix):
-                            unit = candidate.clone(prefix=unit_prefix)
-                            break
-
-                        for unit_inverse_prefix in unit_prefixes:
-                            if unit_inverse_prefix.symbol not in candidate_allowed_inverse_prefixes:
-                                continue
-
-                            if unit_name == candidate.get_name(prefix=unit_prefix, inverse_prefix=unit_inverse_prefix):
-                                unit = candidate.clone(prefix=unit_prefix, inverse_prefix=unit_inverse_prefix)
-                                break
-
-                        if unit != None:
-                            break
-
-                    if unit != None:
-                        break
-
-                    for unit_inverse_prefix in unit_prefixes:
-                        if unit_inverse_prefix.symbol not in candidate_allowed_inverse_prefixes:
-                            continue
-
-                        if unit_name == candidate.get_name(inverse_prefix=unit_inverse_prefix):
-                            unit = candidate.clone(inverse_prefix=unit_inverse_prefix)
-                            break
-
-                    if unit != None:
-                        break
+                unit = find_unit(unit_name)
 
                 assert unit != None, unit_name
 
@@ -4477,6 +5278,8 @@ class Generator:
     check_root_dir_name = True
     is_doc_generator = False
     is_openhab_doc_generator = False
+    incremental = False # see GenerationManifest
+    parallel_device_attributes = None # see device_jobs
 
     def __init__(self, root_dir, language, internal, config_name):
         self.root_dir = root_dir
@@ -4669,6 +5472,7 @@ class Generator:
 
 class DocGenerator(Generator):
     is_doc_generator = True
+    parallel_device_attributes = []
 
     def __init__(self, *args, **kwargs):
         Generator.__init__(self, *args, **kwargs)
@@ -4683,7 +5487,7 @@ class DocGenerator(Generator):
         raise GeneratorError("get_doc_example_regex() not implemented")
 
     def prepare(self):
-        recreate_dir(os.path.join(self.get_doc_dir(), self.get_language()))
+        recreate_output_dir(os.path.join(self.get_doc_dir(), self.get_language()))
 
     def finish(self):
         # Copy IPConnection examples
@@ -4703,18 +5507,27 @@ class DocGenerator(Generator):
 
 class BindingsGenerator(Generator):
     recreate_bindings_dir = True
+    incremental = True # generate() has to check is_unchanged_device
 
     def __init__(self, *args, **kwargs):
         Generator.__init__(self, *args, **kwargs)
 
         self.released_files = []
+        self.incremental_run = False # set by subgenerate
+        self.unchanged_device_identifiers = set() # filled by subgenerate
 
     def prepare(self):
-        if self.recreate_bindings_dir:
-            recreate_dir(self.get_bindings_dir())
+        if self.recreate_bindings_dir and not self.incremental_run:
+            recreate_output_dir(self.get_bindings_dir())
+
+    # returns True if the files of this device are still up-to-date and don't
+    # have to be written again. generate() still has to collect everything for
+    # the device that finish() needs, e.g. the released files
+    def is_unchanged_device(self, device):
+        return device.get_device_identifier() in self.unchanged_device_identifiers
 
     def finish(self):
-        with open(os.path.join(self.get_bindings_dir(), '__released_files__'), 'w') as f:
+        with open_output_file(os.path.join(self.get_bindings_dir(), '__released_files__')) as f:
             for released_file in self.released_files:
                 f.write(released_file + '\n')
 
@@ -4742,9 +5555,7 @@ class ZipGenerator(Generator):
 
         zipname = '{0}_{1}_bindings_{2}_{3}_{4}.zip'.format(self.get_config_name().under, self.get_bindings_name(), *version)
 
-        with ChangedDirectory(source_path):
-            execute(['zip', '-q', '-r', zipname, '.'])
-            os.replace(zipname, os.path.join(self.get_root_dir(), zipname))
+        create_deterministic_zip_file(source_path, os.path.join(self.get_root_dir(), zipname))
 
 class ExamplesGenerator(Generator):
     skip_existing_incomplete_example = True
@@ -4764,21 +5575,91 @@ class ExamplesGenerator(Generator):
         return os.path.join(git_dir, 'software', 'examples', self.get_bindings_name())
 
 def tester_worker(cookie, args, env, setup, teardown):
+    start = time.time()
+
     if setup != None:
         setup()
 
     try:
         exit_code, output = check_output_and_error(args, env=env)
     except Exception as e:
-        return cookie, None, 'Tester Exception: ' + str(e)
+        return cookie, None, 'Tester Exception: ' + str(e), time.time() - start
     finally:
         if teardown != None:
             teardown()
 
-    return cookie, exit_code, output
+    return cookie, exit_code, output, time.time() - start
+
+# successful test results are cached per tester name. the cache key of a test
+# is the hash of the tested file, of the bindings files relevant for it and of
+# the tester class and comment. for an example the relevant bindings files are
+# the files of its device and all files that don't belong to any device. for
+# other files all bindings files are relevant. the cache entry stores the tool
+# that ran the test and the fingerprint of its executable to notice toolchain
+# updates. --force ignores the cache
+tester_cache_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '.tester_cache')
+tester_force = False # set by dockerize
+
+# --shard i/n only runs the tests whose path hash modulo n is i - 1. all test
+# results are appended as JSON lines to the journal. --resume skips all tests
+# that already succeeded according to the journal. tester_results collects the
+# results of all Tester runs of this process for summaries
+tester_shard = None # (i - 1, n), set by dockerize
+tester_journal_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), '.tester_journal.jsonl')
+tester_resumed = set() # (tester name, tester class, comment, test id) of succeeded tests, set by dockerize
+tester_results = [] # [{'tester', 'class', 'comment', 'test', 'success', 'duration', 'source'}]
+
+def parse_tester_shard(shard):
+    m = re.match('^([0-9]+)/([0-9]+)$', shard)
+
+    if m == None or not 1 <= int(m.group(1)) <= int(m.group(2)):
+        raise argparse.ArgumentTypeError('invalid shard {0}, expected i/n with 1 <= i <= n'.format(shard))
+
+    return int(m.group(1)) - 1, int(m.group(2))
+
+def load_tester_journal():
+    tester_resumed.clear()
+
+    try:
+        with open(tester_journal_path, 'r') as f:
+            for line in f.readlines():
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue # the last line might be incomplete after a crash
+
+                key = (result['tester'], result['class'], result['comment'], result['test'])
+
+                if result['success']:
+                    tester_resumed.add(key)
+                else:
+                    tester_resumed.discard(key)
+    except FileNotFoundError:
+        pass
+
+def add_tester_result(result):
+    tester_results.append(result)
+
+    if result['source'] == 'run':
+        with open(tester_journal_path, 'a') as f:
+            f.write(json.dumps(result, sort_keys=True) + '\n')
+
+def get_tool_fingerprint(tool):
+    path = shutil.which(tool)
+
+    if path == None:
+        return tool
+
+    path = os.path.realpath(path)
+    st = os.stat(path)
+
+    return '{0}:{1}:{2}'.format(path, st.st_size, st.st_mtime_ns)
+
+def get_tester_device_key(name):
+    return re.sub('[^a-z0-9]', '', name.lower())
 
 class Tester(object):
-    PROCESSES = 8
+    PROCESSES = None # None means CPU count
 
     def __init__(self, name, extension, root_dir, subdirs=None, comment=None, extra_paths=None):
         version = get_changelog_version(root_dir)
@@ -4793,16 +5674,210 @@ class Tester(object):
         self.test_count = 0
         self.success_count = 0
         self.failure_count = 0
+        self.cached_count = 0
+        self.resumed_count = 0
         self.pool = multiprocessing.dummy.Pool(processes=self.PROCESSES)
+        self.cache_path = os.path.join(tester_cache_dir, name + '.json')
+        self.cache = {} # key -> {'tool': tool, 'fingerprint': fingerprint}
+        self.cache_keys = {} # path -> key
+        self.cache_tools = {} # path -> tool
+        self.test_ids = {} # path -> test id
+        self.durations = {} # path -> duration
+        self.common_files_hash = None # hash of all bindings files that don't belong to a device
+        self.all_files_hash = None # hash of all bindings files
+        self.source_hash = None # hash of the modules of this tester class, see get_source_hash
+        self.device_keys = set()
+        self.device_files = [] # [(device key, path relative to tmp dir, hash)]
 
     def execute(self, cookie, args, env=None, setup=None, teardown=None):
         def callback(result):
-            self.handle_result(*result)
+            self.durations[result[0][0]] = result[3]
+            self.handle_result(*result[:3])
+
+        path = cookie[0]
+        key = self.cache_keys.get(path)
+
+        # the command line is only known here, add it to the cache key
+        if key != None:
+            h = hashlib.sha256(key.encode('utf-8'))
+            h.update(repr((args, sorted(env.items()) if env != None else None)).encode('utf-8'))
+
+            key = h.hexdigest()
+            self.cache_keys[path] = key
+
+        if not tester_force and key != None and self.is_cached(key):
+            if teardown != None:
+                teardown()
 
+            self.cache_keys.pop(path, None)
+            self.cached_count += 1
+            self.success_count += 1
+            self.add_result(self.test_ids.pop(path, path), True, 0.0, 'cached')
+            print_verbose('>>> skipping {0}, cached result'.format(path))
+            return
+
+        self.cache_tools[path] = args[0] if isinstance(args, list) else args.split(' ')[0]
         self.pool.apply_async(tester_worker, args=(cookie, args, env, setup, teardown), callback=callback)
 
+    def prepare_cache(self, tmp_dir):
+        try:
+            with open(self.cache_path, 'r') as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+
+        for subdir in self.subdirs:
+            for root, _, _ in os.walk(os.path.join(tmp_dir, subdir)):
+                device_key = self.get_device_key(tmp_dir, root)
+
+                if device_key != None:
+                    self.device_keys.add(device_key)
+
+        common_files_hash = hashlib.sha256()
+        all_files_hash = hashlib.sha256()
+
+        for root, dirnames, files in os.walk(tmp_dir):
+            dirnames.sort()
+
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                relpath = os.path.relpath(path, tmp_dir)
+
+                if relpath == self.zipname:
+                    continue
+
+                with open(path, 'rb') as f:
+                    file_hash = hashlib.sha256(f.read()).hexdigest()
+
+                device_key = self.get_device_key(tmp_dir, root)
+
+                if device_key == None:
+                    device_key = self.get_device_key_of_file(path)
+
+                item = '{0} {1}\n'.format(relpath, file_hash).encode('utf-8')
+
+                all_files_hash.update(item)
+
+                if device_key != None:
+                    self.device_files.append((device_key, relpath, file_hash))
+                else:
+                    common_files_hash.update(item)
+
+        self.common_files_hash = common_files_hash.hexdigest()
+        self.all_files_hash = all_files_hash.hexdigest()
+
+    # returns the device key of examples/<category>/<device>
+    def get_device_key(self, tmp_dir, dirname):
+        for subdir in self.subdirs:
+            parts = os.path.relpath(dirname, os.path.join(tmp_dir, subdir)).split(os.sep)
+
+            if len(parts) == 2 and '..' not in parts:
+                return get_tester_device_key(''.join(parts))
+
+        return None
+
+    # returns the longest device key contained in the name of a bindings file
+    def get_device_key_of_file(self, path):
+        file_key = get_tester_device_key(os.path.basename(path))
+        matching_keys = [device_key for device_key in self.device_keys if device_key in file_key]
+
+        if len(matching_keys) == 0:
+            return None
+
+        return max(matching_keys, key=len)
+
+    def get_cache_key(self, tmp_dir, path):
+        h = hashlib.sha256()
+        h.update(repr((self.__class__.__name__, self.comment)).encode('utf-8'))
+        h.update(self.get_source_hash().encode('utf-8'))
+
+        try:
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        except OSError:
+            return None # let the test report the problem
+
+        device_key = self.get_device_key(tmp_dir, os.path.dirname(path))
+
+        if device_key == None and os.path.abspath(path).startswith(os.path.abspath(tmp_dir) + os.sep):
+            device_key = self.get_device_key_of_file(path)
+
+        if device_key == None:
+            h.update(self.all_files_hash.encode('utf-8'))
+        else:
+            h.update(self.common_files_hash.encode('utf-8'))
+
+            for file_device_key, relpath, file_hash in self.device_files:
+                if file_device_key == device_key:
+                    h.update('{0} {1}\n'.format(relpath, file_hash).encode('utf-8'))
+
+        return h.hexdigest()
+
+    # the concrete tester decides how a file is tested, changes to it have to
+    # invalidate the cache
+    def get_source_hash(self):
+        if self.source_hash == None:
+            h = hashlib.sha256()
+
+            for cls in self.__class__.__mro__:
+                if cls in Tester.__mro__:
+                    continue
+
+                path = getattr(sys.modules.get(cls.__module__), '__file__', None)
+
+                if path != None and path.endswith('.py'):
+                    with open(path, 'rb') as f:
+                        h.update(f.read())
+
+            self.source_hash = h.hexdigest()
+
+        return self.source_hash
+
+    def is_cached(self, key):
+        entry = self.cache.get(key)
+
+        return entry != None and entry['fingerprint'] == get_tool_fingerprint(entry['tool'])
+
+    # the test id is the path relative to the tmp dir, or the absolute path for
+    # extra paths outside of it
+    def get_test_id(self, tmp_dir, path):
+        path = os.path.abspath(path)
+        tmp_dir = os.path.abspath(tmp_dir)
+
+        if path.startswith(tmp_dir + os.sep):
+            return os.path.relpath(path, tmp_dir).replace(os.sep, '/')
+
+        return path
+
+    def add_result(self, test_id, success, duration, source):
+        add_tester_result({'tester': self.name,
+                           'class': self.__class__.__name__,
+                           'comment': self.comment,
+                           'test': test_id,
+                           'success': success,
+                           'duration': duration,
+                           'source': source})
+
     def handle_source(self, tmp_dir, path, extra):
+        test_id = self.get_test_id(tmp_dir, path)
+
+        if tester_shard != None:
+            index, count = tester_shard
+
+            if int(hashlib.sha256(test_id.encode('utf-8')).hexdigest(), 16) % count != index:
+                return
+
         self.test_count += 1
+
+        if (self.name, self.__class__.__name__, self.comment, test_id) in tester_resumed:
+            self.resumed_count += 1
+            self.success_count += 1
+            self.add_result(test_id, True, 0.0, 'resumed')
+            print_verbose('>>> skipping {0}, succeeded before'.format(path))
+            return
+
+        self.cache_keys[path] = self.get_cache_key(tmp_dir, path) # completed by execute
+        self.test_ids[path] = test_id
         self.test((path,), tmp_dir, path, extra)
 
     def handle_result(self, cookie, exit_code, output):
@@ -4814,6 +5889,16 @@ class Tester(object):
 
         path = cookie[0]
         success = self.check_success(exit_code, output)
+        key = self.cache_keys.pop(path, None)
+        tool = self.cache_tools.pop(path, None)
+
+        if key != None:
+            if success and tool != None:
+                self.cache[key] = {'tool': tool, 'fingerprint': get_tool_fingerprint(tool)}
+            else:
+                self.cache.pop(key, None)
+
+        self.add_result(self.test_ids.pop(path, path), success, self.durations.pop(path, 0.0), 'run')
 
         if self.comment != None:
             print('>>> [{0}] testing {1}'.format(self.comment, path))
@@ -4876,6 +5961,8 @@ class Tester(object):
 
             print('>>> unpacking {0} done\n'.format(self.zipname))
 
+            self.prepare_cache(tmp_dir)
+
             if not self.after_unzip(tmp_dir):
                 return False
 
@@ -4894,13 +5981,18 @@ class Tester(object):
             self.pool.close()
             self.pool.join()
 
+        os.makedirs(tester_cache_dir, exist_ok=True)
+
+        with open(self.cache_path, 'w') as f:
+            json.dump(self.cache, f, indent=1, sort_keys=True)
+
         # report
         if self.comment != None:
-            print('### [{0}] {1} file(s) tested, {2} test(s) succeeded, {3} failure(s) occurred'
-                  .format(self.comment, self.test_count, self.success_count, self.failure_count))
+            print('### [{0}] {1} file(s) tested, {2} test(s) succeeded ({3} cached, {4} resumed), {5} failure(s) occurred'
+                  .format(self.comment, self.test_count, self.success_count, self.cached_count, self.resumed_count, self.failure_count))
         else:
-            print('### {0} file(s) tested, {1} test(s) succeeded, {2} failure(s) occurred'
-                  .format(self.test_count, self.success_count, self.failure_count))
+            print('### {0} file(s) tested, {1} test(s) succeeded ({2} cached, {3} resumed), {4} failure(s) occurred'
+                  .format(self.test_count, self.success_count, self.cached_count, self.resumed_count, self.failure_count))
 
         return self.failure_count == 0
 
@@ -4917,7 +6009,7 @@ class ChangedDirectory(object):
     def __exit__(self, type_, value, traceback):
         os.chdir(self.previous_path)
 
-def dockerize(bindings_name, script_path, add_internal_argument=False, add_arguments=None, mount_m2_volume=False, mount_gnupg_volume=False):
+def dockerize(bindings_name, script_path, add_internal_argument=False, add_jobs_argument=True, add_tester_arguments=False, add_arguments=None, mount_m2_volume=False, mount_gnupg_volume=False):
     parser = argparse.ArgumentParser()
 
     parser.add_argument('-d', '--docker', action='store_true', help='run this script in docker container')
@@ -4929,6 +6021,16 @@ def dockerize(bindings_name, script_path, add_internal_argument=False, add_argum
         parser.add_argument('-i', '--internal', action='store_true', help='handle all devices as if they were released')
         parser.add_argument('-I', '--no-internal', action='store_false', help='handle all devices according to their released marker [default]', dest='internal')
 
+    if add_jobs_argument:
+        parser.add_argument('-j', '--jobs', type=int, default=1, help='number of processes to generate devices in, if supported by the generator [default: 1]')
+
+    if add_tester_arguments:
+        parser.add_argument('-f', '--force', action='store_true', help='run all tests, even if their result is cached')
+        parser.add_argument('--shard', type=parse_tester_shard, metavar='I/N', help='only run the I-th of N parts of the tests')
+        parser.add_argument('--resume', action='store_true', help='skip tests that succeeded according to the journal of the previous run')
+
+    parser.add_argument('--profile', nargs='?', const='profile.json', metavar='FILE', help='write a timing report as JSON to FILE and as collapsed stacks for flamegraphs next to it [default: profile.json]')
+
     if add_arguments != None:
         add_arguments(parser)
 
@@ -4937,6 +6039,22 @@ def dockerize(bindings_name, script_path, add_internal_argument=False, add_argum
     global enable_verbose
     enable_verbose = args.verbose
 
+    if add_jobs_argument:
+        global device_jobs
+        device_jobs = args.jobs
+
+    if add_tester_arguments:
+        global tester_force
+        tester_force = args.force
+
+        global tester_shard
+        tester_shard = args.shard
+
+        if args.resume:
+            load_tester_journal()
+        elif not args.docker and os.path.exists(tester_journal_path):
+            os.remove(tester_journal_path)
+
     if args.docker:
         if shutil.which('docker') == None:
             print('error: docker is not installed')
@@ -5000,4 +6118,7 @@ def dockerize(bindings_name, script_path, add_internal_argument=False, add_argum
 
         sys.exit(subprocess.call(command))
 
+    if args.profile != None:
+        start_profile(os.path.basename(script_path), os.path.abspath(args.profile))
+
     return args
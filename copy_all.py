@@ -90,7 +90,7 @@ def main():
         if not os.path.isdir(binding) or os.path.exists(os.path.join(generators_dir, binding, 'skip_copy_all')):
             continue
 
-        if binding not in ['.git', '.m2', '.vscode', '__pycache__', 'configs', 'docker']:
+        if not binding.startswith('.') and binding not in ['__pycache__', 'configs', 'docker']:
             bindings.append(binding)
 
     bindings = sorted(bindings)
@@ -1072,6 +1072,8 @@ class CSharpBindingsPacket(csharp_common.CSharpPacket):
         return '\n\t\t///  '.join(text.strip().split('\n'))
 
 class CSharpBindingsGenerator(csharp_common.CSharpGeneratorTrait, common.BindingsGenerator):
+    parallel_device_attributes = ['released_files']
+
     def get_device_class(self):
         return CSharpBindingsDevice
 
@@ -1084,8 +1086,9 @@ class CSharpBindingsGenerator(csharp_common.CSharpGeneratorTrait, common.Binding
     def generate(self, device):
         filename = '{0}.cs'.format(device.get_csharp_class_name())
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_csharp_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_csharp_source())
 
         if device.is_released():
             self.released_files.append(filename)
@@ -104,7 +104,7 @@ def generate(root_dir):
                         os.path.join(tmp_unzipped_net40_source_tinkerforge_dir, '*.cs')])
 
     # Make DLL for NET Core 2.0
-    with open(os.path.join(tmp_unzipped_netcoreapp20_source_tinkerforge_dir, 'Tinkerforge.csproj'), 'w') as f:
+    with common.open_output_file(os.path.join(tmp_unzipped_netcoreapp20_source_tinkerforge_dir, 'Tinkerforge.csproj')) as f:
         f.write(NETCORE_CSPROJ)
 
     with common.ChangedDirectory(tmp_unzipped_netcoreapp20_source_tinkerforge_dir):
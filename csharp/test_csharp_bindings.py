@@ -85,6 +85,6 @@ def test(root_dir):
     return CSharpExamplesTester(root_dir, extra_paths).run()
 
 if __name__ == '__main__':
-    common.dockerize('csharp', __file__)
+    common.dockerize('csharp', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
@@ -1597,8 +1597,9 @@ class DelphiBindingsGenerator(delphi_common.DelphiGeneratorTrait, common.Binding
     def generate(self, device):
         filename = '{0}{1}.pas'.format(device.get_category().camel, device.get_name().camel)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_delphi_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_delphi_source())
 
         if device.is_released():
             self.device_display_names.append((device.get_device_identifier(), device.get_long_display_name()))
@@ -1635,7 +1636,7 @@ end.
         for device_identifier, device_display_name in sorted(self.device_display_names):
             cases.append("  {0}: result := '{1}';".format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'DeviceDisplayNames.pas'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'DeviceDisplayNames.pas')) as f:
             f.write(template.format(header=self.get_header_comment('curly'),
                                     cases='\n'.join(cases)))
 
@@ -403,7 +403,7 @@ class DelphiDocGenerator(delphi_common.DelphiGeneratorTrait, common.DocGenerator
         return delphi_common.DelphiElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_delphi_doc())
 
 def generate(root_dir, language, internal):
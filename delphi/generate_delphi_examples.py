@@ -791,7 +791,7 @@ class DelphiExamplesGenerator(delphi_common.DelphiGeneratorTrait, common.Example
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_delphi_source())
 
 def generate(root_dir, language, internal):
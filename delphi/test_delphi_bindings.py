@@ -91,6 +91,6 @@ def test(root_dir):
     return DelphiExamplesTester(root_dir, extra_paths).run()
 
 if __name__ == '__main__':
-    common.dockerize('delphi', __file__)
+    common.dockerize('delphi', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
@@ -31,7 +31,6 @@ if sys.hexversion < 0x3040000:
     sys.exit(1)
 
 import os
-import re
 import tempfile
 import shutil
 import argparse
@@ -71,6 +70,7 @@ def main():
     parser.add_argument('-p', '--prepare', action='store_true', help='prepare current doc as old diff input')
     parser.add_argument('-d', '--diff-tool', default='./diff_view.py', help='program to open diff file with')
     parser.add_argument('-b', '--bindings', nargs=1, help='comma separated list of bindings, each prefixed by +/-/>=/>/<=/<')
+    parser.add_argument('-j', '--jobs', type=int, help='number of files to diff in parallel (default: number of CPUs)')
 
     args = parser.parse_args(argv)
 
@@ -80,7 +80,7 @@ def main():
         if not os.path.isdir(binding) or os.path.exists(os.path.join(generators_dir, binding, 'skip_doc_diff')):
             continue
 
-        if binding not in ['.git', '.m2', '.vscode', '__pycache__', 'configs', 'docker']:
+        if not binding.startswith('.') and binding not in ['__pycache__', 'configs', 'docker']:
             all_bindings.append(binding)
 
     all_bindings = sorted(all_bindings)
@@ -98,6 +98,8 @@ def main():
             if binding not in active_bindings:
                 continue
 
+            path = os.path.join(generators_dir, binding)
+
             if not os.path.isdir(path):
                 print('skipping {0}, no {0} directory'.format(binding))
                 continue
@@ -116,15 +118,6 @@ def main():
 
             shutil.copytree(doc_path, doc_old_path)
     else:
-        rst_header = re.compile(r"""^@@ -1,6 \+1,6 @@
-     \.\.
-      #############################################################
-    - # This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #
-    \+ # This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #
-      #                                                           #
-      # If you have a bugfix for this file and want to commit it, #
-      # please fix the bug in the generator\. You can find a link  #$""")
-
         tmp = tempfile.mkdtemp()
 
         print('using tmpdir ' + tmp)
@@ -149,49 +142,7 @@ def main():
 
             print('diffing ' + binding)
 
-            if os.system('bash -c "pushd {0} > /dev/null && diff -ru15 doc_old/ doc/ > {1}/diff_{2}.diff; popd > /dev/null"'.format(path, tmp, binding)) != 0:
-                print('error: diff old vs new failed')
-                return 1
-
-            with open(os.path.join(tmp, 'diff_{0}.diff'.format(binding)), 'r') as f:
-                diffs = [[[]]] # list of diffs as lists of lines
-
-                for line in f.readlines():
-                    if line.startswith('diff ') or line[0] not in ['@', '-', '+', ' ']:
-                        diffs.append([[]])
-
-                    if line.startswith('@@ '):
-                        diffs[-1].append([])
-
-                    diffs[-1][-1].append(line)
-
-            filtered = []
-
-            for diff in diffs:
-                filtered_lines = []
-
-                for lines in diff:
-                    if len(lines) == 0:
-                        continue
-
-                    hunk = ''.join(lines)
-
-                    if not rst_header.match(hunk):
-                        filtered_lines += lines
-                    else:
-                        filtered_lines += [lines[0].rstrip() + ' // dropped header hunk\n']
-
-                if len(filtered_lines) == 0:
-                    continue
-
-                if len(filtered_lines) == 4 and \
-                   filtered_lines[0].startswith('diff -U 15 -r ') and \
-                   filtered_lines[1].startswith('--- ') and \
-                   filtered_lines[2].startswith('+++ ') and \
-                   filtered_lines[3].endswith('// dropped header hunk\n'):
-                    filtered += [filtered_lines[0].rstrip() + ' // dropped header diff\n']
-                else:
-                    filtered += filtered_lines
+            filtered = common.diff_directories(os.path.join(path, 'doc_old'), os.path.join(path, 'doc'), 'doc_old', 'doc', 15, jobs=args.jobs)
 
             with open(os.path.join(tmp, 'diff.diff'), 'a') as f:
                 f.writelines(filtered)
@@ -10,8 +10,11 @@ if sys.hexversion < 0x3040000:
 import os
 import re
 import socket
+import tempfile
+import traceback
 import importlib.util
 import importlib.machinery
+import concurrent.futures
 
 generators_dir = os.path.dirname(os.path.realpath(__file__))
 
@@ -31,6 +34,138 @@ if 'generators' not in sys.modules:
 
 from generators import common
 
+# generators that have to be finished for a binding before the key generator
+# can run for the same binding
+generator_dependencies = {
+    'zip': ['bindings', 'examples'],
+    'doc': ['examples'],
+    'debian_package': ['zip']
+}
+
+# jobs of other bindings that use files the key job writes to as well. the tvpl
+# zip generator runs the javascript bindings and zip generators in the
+# javascript directory and the javascript debian package is created from the
+# javascript zip. the key job is only started after these jobs are done, but it
+# doesn't depend on them having succeeded
+binding_conflicts = {
+    ('tvpl', 'zip'): [('javascript', 'bindings'), ('javascript', 'zip'), ('javascript', 'debian_package')]
+}
+
+has_internal_argument = [
+    'bindings',
+    'examples',
+    'doc',
+    'zip'
+]
+
+def run_generator(binding, generator, language, internal):
+    module = importlib.import_module('generators.{0}.generate_{0}_{1}'.format(binding, generator))
+    root_dir = os.path.join(generators_dir, binding)
+
+    with common.profile_section('{0}/{1}/{2}'.format(binding, generator, language)):
+        if generator in has_internal_argument:
+            module.generate(root_dir, language, internal)
+        else:
+            module.generate(root_dir, language)
+
+# runs in a worker process. the output of the generator, including the output
+# of its subprocesses, is collected in a temporary file and returned as a whole
+# to allow the main process to print it without interleaving it with the output
+# of other jobs. the profile records of the job are returned as well
+def run_job(binding, generator, language, internal, verbose, profile):
+    common.enable_verbose = verbose
+    common.reset_profile(profile)
+    success = False
+
+    with tempfile.TemporaryFile() as f:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        stdout_fd = os.dup(1)
+        stderr_fd = os.dup(2)
+
+        os.dup2(f.fileno(), 1)
+        os.dup2(f.fileno(), 2)
+
+        try:
+            run_generator(binding, generator, language, internal)
+            success = True
+        except SystemExit as e:
+            print('\033[01;31m### generator exited with code {0}\033[0m'.format(e.code))
+        except:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+            os.dup2(stdout_fd, 1)
+            os.dup2(stderr_fd, 2)
+            os.close(stdout_fd)
+            os.close(stderr_fd)
+
+        f.seek(0)
+
+        output = f.read().decode('utf-8', errors='replace')
+
+    return success, output, dict(common.profile_records)
+
+def run_jobs(jobs, job_count, internal):
+    pending = list(jobs) # [(binding, generator, language)]
+    running = {} # future -> job
+    finished = set()
+    failed = set()
+
+    def get_dependencies(job):
+        binding, generator, _ = job
+
+        return [other for other in jobs if other[0] == binding and other[1] in generator_dependencies.get(generator, [])]
+
+    def get_conflicts(job):
+        binding, generator, _ = job
+
+        return [other for other in jobs if other[:2] in binding_conflicts.get((binding, generator), [])]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=job_count) as executor:
+        while len(pending) > 0 or len(running) > 0:
+            for job in list(pending):
+                dependencies = get_dependencies(job)
+                conflicts = get_conflicts(job)
+
+                if any([dependency in failed for dependency in dependencies]):
+                    print('\033[01;31m>>> skipping {1} generator for {0} bindings ({2}), a dependency failed\033[0m'.format(*job))
+                    pending.remove(job)
+                    failed.add(job)
+                elif all([dependency in finished for dependency in dependencies]) and \
+                     all([conflict in finished or conflict in failed for conflict in conflicts]):
+                    pending.remove(job)
+                    running[executor.submit(run_job, *(job + (internal, common.enable_verbose, common.profile_enabled)))] = job
+
+            if len(running) == 0:
+                continue
+
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                job = running.pop(future)
+
+                try:
+                    success, output, records = future.result()
+                except Exception as e:
+                    success, output, records = False, 'worker process failed: {0}\n'.format(e), {}
+
+                common.merge_profile_records(records)
+
+                print('\033[01;32m>>> ran {1} generator for {0} bindings ({2})\033[0m'.format(*job))
+                print(output, end='', flush=True)
+
+                if success:
+                    finished.add(job)
+                else:
+                    print('\033[01;31m### {1} generator for {0} bindings ({2}) failed\033[0m'.format(*job))
+                    failed.add(job)
+
+    return len(failed) == 0
+
 def main(args):
     all_generators = ['bindings', 'examples', 'doc', 'zip', 'debian_package']
 
@@ -52,7 +187,7 @@ def main(args):
         if not os.path.isdir(binding) or os.path.exists(os.path.join(generators_dir, binding, 'skip_generate_all')):
             continue
 
-        if binding not in ['.git', '.m2', '.vscode', '__pycache__', 'configs', 'docker']:
+        if not binding.startswith('.') and binding not in ['__pycache__', 'configs', 'docker']:
             all_bindings.append(binding)
 
     all_bindings = sorted(all_bindings)
@@ -73,12 +208,9 @@ def main(args):
         'debian_package': ['en']
     }
 
-    has_internal_argument = [
-        'bindings',
-        'examples',
-        'doc',
-        'zip'
-    ]
+    job_count = max(args.jobs, 1)
+
+    jobs = []
 
     for generator in all_generators:
         if generator not in active_generators:
@@ -88,20 +220,33 @@ def main(args):
             if binding not in active_bindings:
                 continue
 
-            print('\033[01;32m>>> running {0} generator for {1} bindings\033[0m'.format(generator, binding))
+            if job_count == 1:
+                print('\033[01;32m>>> running {0} generator for {1} bindings\033[0m'.format(generator, binding))
 
             try:
-                module = importlib.import_module('generators.{0}.generate_{0}_{1}'.format(binding, generator))
+                spec = importlib.util.find_spec('generators.{0}.generate_{0}_{1}'.format(binding, generator))
             except ImportError: # FIXME: Python 3.6 has ModuleNotFoundError, which would be better to use here, but Debian Stretch has only Python 3.5
+                spec = None
+
+            if spec == None:
+                if job_count > 1:
+                    print('\033[01;32m>>> skipping {0} generator for {1} bindings\033[0m'.format(generator, binding))
+
                 print('\033[01;36m### generator missing\033[0m')
-            else:
-                for language in languages[generator]:
-                    root_dir = os.path.join(generators_dir, binding)
+                continue
+
+            for language in languages[generator]:
+                if job_count == 1:
+                    run_generator(binding, generator, language, args.internal)
+                else:
+                    jobs.append((binding, generator, language))
 
-                    if generator in has_internal_argument:
-                        module.generate(root_dir, language, args.internal)
-                    else:
-                        module.generate(root_dir, language)
+    if job_count > 1:
+        print('\033[01;32m>>> running {0} jobs in {1} processes\033[0m'.format(len(jobs), job_count))
+
+        if not run_jobs(jobs, job_count, args.internal):
+            print('\033[01;31m>>> failed\033[0m')
+            return 1
 
     print('\033[01;35m>>> done\033[0m')
 
@@ -111,6 +256,7 @@ if __name__ == '__main__':
     def add_arguments(parser):
         parser.add_argument('-g', '--generators', nargs=1, help='comma separated list of generators, each prefixed by +/-/>=/>/<=/<')
         parser.add_argument('-b', '--bindings', nargs=1, help='comma separated list of bindings, each prefixed by +/-/>=/>/<=/<')
+        parser.add_argument('-j', '--jobs', type=int, default=1, help='number of generator jobs to run in parallel, 1 runs all generators in this process [default: 1]')
 
     # FIXME: set mount_m2_volume and mount_gnupg_volume based on -g/-b
-    sys.exit(main(common.dockerize('', __file__, add_internal_argument=True, add_arguments=add_arguments, mount_m2_volume=True, mount_gnupg_volume=True)))
+    sys.exit(main(common.dockerize('', __file__, add_internal_argument=True, add_jobs_argument=False, add_arguments=add_arguments, mount_m2_volume=True, mount_gnupg_volume=True)))
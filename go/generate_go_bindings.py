@@ -626,13 +626,14 @@ class GoBindingsGenerator(go_common.GoGeneratorTrait, common.BindingsGenerator):
         else:
             filename = '{0}_{1}'.format(device.get_name().under, device.get_category().under)
 
-        if sys.version_info.major >= 3:
-            content = device.get_go_source().replace("‍REPLACE_WITH_ZWJ", "\u200d")
-        else:
-            content = device.get_go_source().replace("‍REPLACE_WITH_ZWJ", (u"\u200d").encode('utf-8'))
+        if not self.is_unchanged_device(device):
+            if sys.version_info.major >= 3:
+                content = device.get_go_source().replace("‍REPLACE_WITH_ZWJ", "\u200d")
+            else:
+                content = device.get_go_source().replace("‍REPLACE_WITH_ZWJ", (u"\u200d").encode('utf-8'))
 
-        with open(os.path.join(self.get_bindings_dir(), filename + '.go'), 'w') as f:
-            f.write(content)
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename + '.go')) as f:
+                f.write(content)
 
         if device.is_released():
             self.released_files.append(filename + '.go')
@@ -663,7 +664,7 @@ func getDeviceDisplayName(deviceIdentifier uint16) string {{
         for device_identifier, device_display_name in sorted(self.device_display_names):
             entries.append('{0}: "{1}"'.format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'device_display_names.go'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'device_display_names.go')) as f:
             f.write(template.format(header=self.get_header_comment('asterisk'),
                                     entries=',\n    '.join(entries)))
 
@@ -687,7 +687,7 @@ class GoExamplesGenerator(go_common.GoGeneratorTrait, common.ExamplesGenerator):
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_go_source())
 
             p = subprocess.Popen(["go", "fmt", filename], cwd=examples_dir, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
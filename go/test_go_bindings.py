@@ -78,6 +78,6 @@ def test(root_dir):
     return GoExamplesTester(root_dir, None).run()
 
 if __name__ == '__main__':
-    common.dockerize('go', __file__)
+    common.dockerize('go', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
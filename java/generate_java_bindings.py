@@ -1543,6 +1543,8 @@ class JavaBindingsPacket(java_common.JavaPacket):
         return bbgets, bbret
 
 class JavaBindingsGenerator(java_common.JavaGeneratorTrait, common.BindingsGenerator):
+    parallel_device_attributes = ['released_files', 'device_classes']
+
     def get_device_class(self):
         return JavaBindingsDevice
 
@@ -1558,9 +1560,11 @@ class JavaBindingsGenerator(java_common.JavaGeneratorTrait, common.BindingsGener
         self.device_classes = []
 
         if self.is_matlab():
-            os.makedirs(os.path.join(self.get_bindings_dir(), 'matlab'))
+            if not os.path.isdir(os.path.join(self.get_bindings_dir(), 'matlab')):
+                os.makedirs(os.path.join(self.get_bindings_dir(), 'matlab'))
         elif self.is_octave():
-            os.makedirs(os.path.join(self.get_bindings_dir(), 'octave'))
+            if not os.path.isdir(os.path.join(self.get_bindings_dir(), 'octave')):
+                os.makedirs(os.path.join(self.get_bindings_dir(), 'octave'))
 
     def generate(self, device):
         class_name = device.get_java_class_name()
@@ -1572,11 +1576,12 @@ class JavaBindingsGenerator(java_common.JavaGeneratorTrait, common.BindingsGener
         else:
             flavor = ''
 
-        with open(os.path.join(self.get_bindings_dir(), flavor, class_name + '.java'), 'w') as f:
-            f.write(device.get_java_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), flavor, class_name + '.java')) as f:
+                f.write(device.get_java_source())
 
-        with open(os.path.join(self.get_bindings_dir(), flavor, class_name + 'Provider.java'), 'w') as f:
-            f.write(device.get_java_provider())
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), flavor, class_name + 'Provider.java')) as f:
+                f.write(device.get_java_provider())
 
         if device.is_released():
             self.device_classes.append(class_name)
@@ -1591,7 +1596,7 @@ class JavaBindingsGenerator(java_common.JavaGeneratorTrait, common.BindingsGener
         else:
             flavor = ''
 
-        with open(os.path.join(self.get_bindings_dir(), flavor, 'com.tinkerforge.DeviceProvider'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), flavor, 'com.tinkerforge.DeviceProvider')) as f:
             for name in sorted(self.device_classes):
                 f.write('com.tinkerforge.{0}Provider\n'.format(name))
 
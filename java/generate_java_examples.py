@@ -683,7 +683,7 @@ class JavaExamplesGenerator(java_common.JavaGeneratorTrait, common.ExamplesGener
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_java_source())
 
 def generate(root_dir, language, internal):
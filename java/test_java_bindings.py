@@ -62,12 +62,14 @@ class JavaExamplesTester(common.Tester):
     def test(self, cookie, tmp_dir, path, extra):
         # create unique copy of the Tinkerforge.jar to avoid Java from randomly
         # complaining about the JAR being missing if Java is started multiple
-        # times concurrently
+        # times concurrently. the name is seeded by the path to keep the
+        # command line stable for the result cache
         jar_path = os.path.join(tmp_dir, 'Tinkerforge.jar')
+        jar_random = random.Random(path)
         tries = 100
 
         while os.path.exists(jar_path) and tries > 0:
-            r = int(round(random.random() * 10000000000))
+            r = int(round(jar_random.random() * 10000000000))
             jar_path = os.path.join(tmp_dir, 'Tinkerforge_{:010X}.jar'.format(r))
             tries -= 1
 
@@ -138,6 +140,6 @@ def test(root_dir):
     return JavaDocTester(root_dir).run()
 
 if __name__ == '__main__':
-    common.dockerize('java', __file__)
+    common.dockerize('java', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
@@ -1199,9 +1199,9 @@ class JavaScriptBindingsGenerator(javascript_common.JavascriptGeneratorTrait, co
         npm_main_filename = os.path.join(self.get_bindings_dir(), 'TinkerforgeNPM.js')
         source_main_filename = os.path.join(self.get_bindings_dir(), 'TinkerforgeSource.js')
 
-        self.browser_api_file = open(browser_api_filename, 'w')
-        self.npm_main_file = open(npm_main_filename, 'w')
-        self.source_main_file = open(source_main_filename, 'w')
+        self.browser_api_file = common.open_output_file(browser_api_filename)
+        self.npm_main_file = common.open_output_file(npm_main_filename)
+        self.source_main_file = common.open_output_file(source_main_filename)
 
         self.released_files.append('BrowserAPI.js')
         self.released_files.append('TinkerforgeNPM.js')
@@ -1247,8 +1247,9 @@ class JavaScriptBindingsGenerator(javascript_common.JavascriptGeneratorTrait, co
 
         filename = '{0}{1}.js'.format(device.get_category().camel, device.get_name().camel)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_javascript_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_javascript_source())
 
         if device.is_released():
             self.released_files.append(filename)
@@ -519,7 +519,7 @@ class JavaScriptDocGenerator(javascript_common.JavascriptGeneratorTrait, common.
         return 0 if os.path.splitext(example[1])[1] == '.js' else 1, example[2], example[0] # extension, lines, filename
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_javascript_doc())
 
 def generate(root_dir, language, internal):
@@ -809,7 +809,7 @@ class JavaScriptExamplesGenerator(javascript_common.JavascriptGeneratorTrait, co
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_nodejs_source())
 
         # html
@@ -830,7 +830,7 @@ class JavaScriptExamplesGenerator(javascript_common.JavascriptGeneratorTrait, co
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_html_source())
 
 def generate(root_dir, language, internal):
@@ -140,7 +140,7 @@ class JavaScriptZipGenerator(javascript_common.JavascriptGeneratorTrait, common.
             if candidate_version != None:
                 target['dependencies'][package] = {'version': candidate_version}
 
-        with open(path, 'w') as f:
+        with common.open_output_file(path) as f:
             f.write(json.dumps(target, indent=2))
 
     def finish(self):
@@ -207,7 +207,7 @@ class JavaScriptZipGenerator(javascript_common.JavascriptGeneratorTrait, common.
 
             os.mkdir(browserify_dir)
 
-            with open(os.path.join(browserify_dir, 'package.json'), 'w') as f:
+            with common.open_output_file(os.path.join(browserify_dir, 'package.json')) as f:
                 f.write('{"dependencies": {"browserify": "13.1.1"}}\n')
 
             with common.ChangedDirectory(browserify_dir):
@@ -220,7 +220,7 @@ class JavaScriptZipGenerator(javascript_common.JavascriptGeneratorTrait, common.
             with common.ChangedDirectory(browserify_dir):
                 common.execute(['npm', 'install', '--no-save'])
 
-            with open(os.path.join(browserify_dir, 'version'), 'w') as f:
+            with common.open_output_file(os.path.join(browserify_dir, 'version')) as f:
                 f.write('1\n')
 
         # Make Tinkerforge.js for browser with browserify
@@ -204,6 +204,8 @@ class JSONGeneratorTrait:
         return True
 
 class JSONBindingsGenerator(JSONGeneratorTrait, common.BindingsGenerator):
+    parallel_device_attributes = ['released_files']
+
     def get_device_class(self):
         return JSONBindingsDevice
 
@@ -216,8 +218,9 @@ class JSONBindingsGenerator(JSONGeneratorTrait, common.BindingsGenerator):
     def generate(self, device):
         filename = '{0}_{1}.json'.format(device.get_category().under, device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_json_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_json_source())
 
         if device.is_released():
             self.released_files.append(filename)
@@ -811,8 +811,9 @@ class JuliaBindingsGenerator(julia_common.JuliaGeneratorTrait, common.BindingsGe
     def generate(self, device):
         filename = '{0}_{1}.jl'.format(device.get_category().under, device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_julia_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_julia_source())
 
         self.device_factory_all_classes.append((device.get_julia_import_name(), device.get_julia_struct_name(), device.get_device_identifier()))
 
@@ -849,7 +850,7 @@ end
                 imports.append(template_import.format(import_name, class_name))
                 classes.append('        {0} => "{1}",'.format(device_identifier, class_name))
 
-            with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
                 f.write(template.format(self.get_header_comment('hash'),
                                         '\n'.join(imports),
                                         '\n'.join(classes)))
@@ -878,7 +879,7 @@ end
         for device_identifier, device_display_name in sorted(self.device_display_names):
             entries.append('    {0} => "{1}"'.format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'device_display_names.jl'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'device_display_names.jl')) as f:
             f.write(template.format(header=self.get_header_comment('hash'),
                                     entries=',\n    '.join(entries)))
 
@@ -130,6 +130,6 @@ def test(root_dir):
     return PylintTester(root_dir, 'python3', 'pylint3', []).run()#extra_paths).run()
 
 if __name__ == '__main__':
-    common.dockerize('python', __file__)
+    common.dockerize('python', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
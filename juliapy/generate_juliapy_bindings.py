@@ -732,8 +732,9 @@ class JuliaPyBindingsGenerator(juliapy_common.JuliaPyGeneratorTrait, common.Bind
     def generate(self, device):
         filename = '{0}_{1}.jl'.format(device.get_category().under, device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_juliapy_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_juliapy_source())
 
         self.device_factory_all_classes.append((device.get_juliapy_import_name(), device.get_juliapy_struct_name(), device.get_device_identifier()))
 
@@ -770,7 +771,7 @@ end
                 imports.append(template_import.format(import_name, class_name))
                 classes.append('        {0} => "{1}",'.format(device_identifier, class_name))
 
-            with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
                 f.write(template.format(self.get_header_comment('hash'),
                                         '\n'.join(imports),
                                         '\n'.join(classes)))
@@ -799,7 +800,7 @@ end
         for device_identifier, device_display_name in sorted(self.device_display_names):
             entries.append('    {0} => "{1}"'.format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'device_display_names.jl'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'device_display_names.jl')) as f:
             f.write(template.format(header=self.get_header_comment('hash'),
                                     entries=',\n    '.join(entries)))
 
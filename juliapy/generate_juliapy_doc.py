@@ -451,7 +451,7 @@ class PythonDocGenerator(python_common.PythonGeneratorTrait, common.DocGenerator
         return python_common.PythonElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_python_doc())
 
 def generate(root_dir, language, internal):
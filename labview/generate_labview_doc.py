@@ -461,7 +461,7 @@ class LabVIEWDocGenerator(labview_common.LabVIEWGeneratorTrait, common.DocGenera
         return LabVIEWDocElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_labview_doc())
 
 def generate(root_dir, language, internal):
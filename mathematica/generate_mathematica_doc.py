@@ -550,7 +550,7 @@ class MathematicaDocGenerator(mathematica_common.MathematicaGeneratorTrait, comm
         return MathematicaDocElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_mathematica_doc())
 
 def generate(root_dir, language, internal):
@@ -721,7 +721,7 @@ class MathematicaExamplesGenerator(mathematica_common.MathematicaGeneratorTrait,
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_mathematica_source())
 
             txt2nb(filepath)
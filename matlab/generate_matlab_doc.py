@@ -552,7 +552,7 @@ class MATLABDocGenerator(matlab_common.MATLABGeneratorTrait, common.DocGenerator
         return example[1].split('_')[0], example[2], example[0] # flavor, lines, filename
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_matlab_doc())
 
 def generate(root_dir, language, internal):
@@ -865,7 +865,7 @@ class MATLABExamplesGenerator(matlab_common.MATLABGeneratorTrait, common.Example
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(os.path.join(examples_dir, filename), 'w') as f:
+            with common.open_output_file(os.path.join(examples_dir, filename)) as f:
                 f.write(example.get_matlab_source())
 
         # octave
@@ -886,7 +886,7 @@ class MATLABExamplesGenerator(matlab_common.MATLABGeneratorTrait, common.Example
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_octave_source())
 
 def generate(root_dir, language, internal):
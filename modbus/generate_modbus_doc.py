@@ -333,7 +333,7 @@ class ModbusDocGenerator(common.DocGenerator):
         return element.get_name().headless
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_modbus_doc())
 
 def generate(root_dir, language, internal):
@@ -31,6 +31,7 @@ if sys.hexversion < 0x3040000:
     sys.exit(1)
 
 import os
+import json
 import importlib.util
 import importlib.machinery
 
@@ -62,6 +63,73 @@ class MQTTBindingsPacket(mqtt_common.MQTTPacket):
 
         return ' '.join(formats)
 
+    def get_mqtt_arg_checkers(self, high_level=False):
+        checkers = []
+
+        for element in self.get_elements(direction='in', high_level=high_level):
+            checkers.append(element.get_mqtt_arg_checker())
+
+        return '[' + ', '.join(checkers) + ']'
+
+    def get_mqtt_result_encoder(self, high_level=False, dash_names=False, callback=False):
+        names = []
+        symbols = []
+        int64_indices = []
+        formatters = []
+
+        for i, element in enumerate(self.get_elements(direction='out', high_level=high_level)):
+            if dash_names:
+                names.append(element.get_name().dash)
+            else:
+                names.append(element.get_name().under)
+
+            if element.get_constant_group(index=element.get_indices()[0]) != None:
+                symbols.append('({0}, {1})'.format(i, element.get_symbols()))
+
+            if element.get_type() in ['int64', 'uint64']:
+                int64_indices.append(i)
+
+            formatters.append(element.get_mqtt_formatter())
+
+        if not callback:
+            return 'ResultEncoder({0}, [{1}], {2})'.format(names, ', '.join(symbols), int64_indices)
+
+        object_template = '{' + ', '.join(['{0}: %s'.format(json.dumps(name)) for name in names]) + '}'
+
+        return 'ResultEncoder({0}, [{1}], {2}, [{3}], {4})'.format(names, ', '.join(symbols), int64_indices, ', '.join(formatters), repr(object_template))
+
+class MQTTBindingsElement(mqtt_common.MQTTElement):
+    def get_mqtt_formatter(self):
+        if self.get_cardinality() != 1:
+            return 'json_value'
+
+        if self.get_type() == 'bool':
+            return 'json_bool'
+
+        if self.get_type() == 'float':
+            return 'json_float'
+
+        if self.get_type().startswith('int') or self.get_type().startswith('uint'):
+            return 'json_int'
+
+        return 'json_value'
+
+    def get_mqtt_arg_checker(self):
+        mqtt_type = self.get_mqtt_type()
+
+        if isinstance(mqtt_type, tuple):
+            return "list_arg('{0}', '{1}', {2})".format(self.get_name().under, mqtt_type[0], mqtt_type[1])
+
+        constant_group = self.get_constant_group(index=self.get_indices()[0])
+
+        if constant_group == None:
+            return "{0}_arg('{1}')".format(mqtt_type, self.get_name().under)
+
+        # reversed to map from constant name to its value
+        symbols = ["{}: {}".format(repr(c.get_name().under), repr(c.get_value())) for c in constant_group.get_constants()]
+
+        return "{0}_arg('{1}', {{{2}}})".format(mqtt_type, self.get_name().under, ', '.join(symbols))
+
 class MQTTBindingsDevice(mqtt_common.MQTTDevice):
     def get_mqtt_class(self):
         template = """
@@ -97,7 +165,7 @@ class {0}(MQTTCallbackDevice):
         template = "\tfunctions = {{\n\t\t{entries}\n\t}}\n"
         entries = []
         for packet in self.get_packets('function'):
-            entries.append("'{mqtt_name}': FunctionInfo({id}, {arg_names}, {arg_types}, [{arg_symbols}], '{payload_fmt}', {result_names}, {result_types}, [{result_symbols}], {response_size}, '{response_fmt}')".format(
+            entries.append("'{mqtt_name}': FunctionInfo({id}, {arg_names}, {arg_types}, [{arg_symbols}], '{payload_fmt}', {result_names}, {result_types}, [{result_symbols}], {response_size}, '{response_fmt}', {arg_checkers}, {result_encoder})".format(
                  mqtt_name=packet.get_mqtt_name(),
                  id=packet.get_function_id(),
                  arg_names=[elem.get_name().under for elem in packet.get_elements(direction='in')],
@@ -108,7 +176,9 @@ class {0}(MQTTCallbackDevice):
                  result_symbols=', '.join([elem.get_symbols() for elem in packet.get_elements(direction='out')]),
                  payload_fmt=packet.get_mqtt_format_list('in'),
                  response_size=packet.get_response_size(),
-                 response_fmt=packet.get_mqtt_format_list('out')))
+                 response_fmt=packet.get_mqtt_format_list('out'),
+                 arg_checkers=packet.get_mqtt_arg_checkers(),
+                 result_encoder=packet.get_mqtt_result_encoder()))
 
             if packet.has_high_level():
                 stream_in = packet.get_high_level('stream_in')
@@ -193,7 +263,7 @@ class {0}(MQTTCallbackDevice):
                     single_read = stream_out.has_single_chunk()
                     fixed_length = stream_out.get_fixed_length()
 
-                entries.append("'{mqtt_name}': HighLevelFunctionInfo({low_level_id}, '{direction}', {high_level_roles_in}, {high_level_roles_out}, {low_level_roles_in}, {low_level_roles_out}, {arg_names}, {arg_types}, {arg_symbols}, '{format_in}', {result_names}, {result_types}, {result_symbols}, {response_size}, '{format_out}',{chunk_padding}, {chunk_cardinality}, {chunk_max_offset},{short_write}, {single_read}, {fixed_length})".format(
+                entries.append("'{mqtt_name}': HighLevelFunctionInfo({low_level_id}, '{direction}', {high_level_roles_in}, {high_level_roles_out}, {low_level_roles_in}, {low_level_roles_out}, {arg_names}, {arg_types}, {arg_symbols}, '{format_in}', {result_names}, {result_types}, {result_symbols}, {response_size}, '{format_out}',{chunk_padding}, {chunk_cardinality}, {chunk_max_offset},{short_write}, {single_read}, {fixed_length}, {arg_checkers}, {result_encoder})".format(
                     mqtt_name=packet.get_mqtt_name(skip=-2),
                     low_level_id=packet.get_function_id(),
                     direction=direction,
@@ -215,13 +285,15 @@ class {0}(MQTTCallbackDevice):
                     chunk_max_offset=chunk_max_offset,
                     short_write=short_write,
                     single_read=single_read,
-                    fixed_length=fixed_length
+                    fixed_length=fixed_length,
+                    arg_checkers=packet.get_mqtt_arg_checkers(high_level=True),
+                    result_encoder=packet.get_mqtt_result_encoder(high_level=True, dash_names=True)
                 ))
         return template.format(entries = ",\n\t\t".join(entries))
 
     def get_mqtt_callback_map(self):
         template = "\tcallbacks = {{\n\t\t{entries}\n\t}}\n"
-        entry_template = "'{mqtt_name}': CallbackInfo({id}, {names}, {types}, [{symbols}], ({response_size}, '{fmt}'), {hl_info})"
+        entry_template = "'{mqtt_name}': CallbackInfo({id}, {names}, {types}, [{symbols}], ({response_size}, '{fmt}'), {hl_info}, {result_encoder})"
         hl_template = "[{2}, {{'fixed_length': {0}, 'single_chunk': {1}}}, None]"
 
         entries = []
@@ -247,7 +319,8 @@ class {0}(MQTTCallbackDevice):
                                                 symbols=', '.join([elem.get_symbols() for elem in packet.get_elements(direction='out', high_level=True)]),
                                                 fmt=packet.get_mqtt_format_list('out'),
                                                 response_size=packet.get_response_size(),
-                                                hl_info=hl_info))
+                                                hl_info=hl_info,
+                                                result_encoder=packet.get_mqtt_result_encoder(high_level=True, callback=True)))
         return template.format(entries=",\n\t\t".join(entries))
 
     def get_mqtt_source(self):
@@ -265,7 +338,7 @@ class MQTTBindingsGenerator(mqtt_common.MQTTGeneratorTrait, common.BindingsGener
         return MQTTBindingsPacket
 
     def get_element_class(self):
-        return mqtt_common.MQTTElement
+        return MQTTBindingsElement
 
     def prepare(self):
         common.BindingsGenerator.prepare(self)
@@ -278,8 +351,9 @@ class MQTTBindingsGenerator(mqtt_common.MQTTGeneratorTrait, common.BindingsGener
     def generate(self, device):
         filename = '{0}.part'.format(device.get_mqtt_device_name())
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_mqtt_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_mqtt_source())
 
         if device.is_released():
             self.devices.append("'{mqtt_dev_name}': {py_dev_name}".format(mqtt_dev_name=device.get_mqtt_device_name(), py_dev_name=device.get_python_class_name()))
@@ -291,7 +365,7 @@ class MQTTBindingsGenerator(mqtt_common.MQTTGeneratorTrait, common.BindingsGener
         root_dir = self.get_root_dir()
         bindings_dir = self.get_bindings_dir()
         version = self.get_changelog_version()
-        mqtt = open(os.path.join(bindings_dir, '{}_mqtt'.format(self.get_config_name().under)), 'w')
+        mqtt = common.open_output_file(os.path.join(bindings_dir, '{}_mqtt'.format(self.get_config_name().under)))
 
         with open(os.path.join(root_dir, 'tinkerforge.header'), 'r') as f:
             header = f.read().replace('<<VERSION>>', '.'.join(version))
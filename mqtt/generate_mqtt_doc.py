@@ -186,6 +186,14 @@ time critical or recurring data from the device. The registration is done
 with the corresponding ``.../register/...`` topic and an optional suffix.
 This suffix can be used to deregister the callback later.
 
+Instead of "true" the registration payload can also be an object such as
+``{{"register": true, "batch_count": 10}}``. With ``"batch_count": <N>`` and/or
+``"batch_period": <ms>`` callbacks are collected and published as one message
+``{{"samples": [...]}}`` once N callbacks were collected or the period elapsed
+since the first collected callback. ``"batch_statistics": true`` additionally
+adds the ``"min"``, ``"max"`` and ``"mean"`` of all numeric values to each batch.
+With ``"deduplicate": true`` a callback is only published if its values changed.
+
 .. note::
  Using callbacks for recurring events is *always* preferred
  compared to using getters. It will use less USB bandwidth and the latency
@@ -204,6 +212,15 @@ oder wiederkehrende Daten vom Gerät zu erhalten. Die Registrierung kann
 mit dem entsprechenden ``.../register/...``-Topic und einem optionalen Suffix durchgeführt werden.
 Mit diesem Suffix kann das Callback später deregistriert werden.
 
+Statt "true" kann der Payload der Registrierung auch ein Objekt wie
+``{{"register": true, "batch_count": 10}}`` sein. Mit ``"batch_count": <N>`` und/oder
+``"batch_period": <ms>`` werden Callbacks gesammelt und als eine Nachricht
+``{{"samples": [...]}}`` veröffentlicht, sobald N Callbacks gesammelt wurden oder
+die Zeitspanne seit dem ersten gesammelten Callback abgelaufen ist.
+``"batch_statistics": true`` fügt jedem Batch zusätzlich ``"min"``, ``"max"`` und
+``"mean"`` aller numerischen Werte hinzu. Mit ``"deduplicate": true`` wird ein
+Callback nur veröffentlicht, wenn sich seine Werte geändert haben.
+
 .. note::
  Callbacks für wiederkehrende Ereignisse zu verwenden ist
  *immer* zu bevorzugen gegenüber der Verwendung von Abfragen.
@@ -351,7 +368,7 @@ class MQTTDocGenerator(mqtt_common.MQTTGeneratorTrait, common.DocGenerator):
         return mqtt_common.MQTTElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_mqtt_doc())
 
 def generate(root_dir, language, internal):
@@ -491,7 +491,7 @@ class MQTTExamplesGenerator(mqtt_common.MQTTGeneratorTrait, common.ExamplesGener
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_mqtt_source())
 
 def generate(root_dir, language, internal):
@@ -30,7 +30,6 @@ if sys.hexversion < 0x3040000:
     sys.exit(1)
 
 import os
-import shutil
 from collections import namedtuple
 import importlib.util
 import importlib.machinery
@@ -831,22 +830,23 @@ class OpenHABBindingsGenerator(openhab_common.OpenHABGeneratorTrait, JavaBinding
             return
         class_name = device.get_java_class_name()
 
-        with open(os.path.join(self.get_bindings_dir(), class_name + '.java'), 'w') as f:
-            f.write(device.get_java_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), class_name + '.java')) as f:
+                f.write(device.get_java_source())
 
-        with open(os.path.join(self.get_bindings_dir(), class_name + 'Wrapper.java'), 'w') as f:
-            f.write(device.get_openhab_device_wrapper())
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), class_name + 'Wrapper.java')) as f:
+                f.write(device.get_openhab_device_wrapper())
 
-        config_classes = device.get_openhab_config_classes()
-        for config_class_name, config_class in config_classes:
-            with open(os.path.join(self.get_bindings_dir(), config_class_name + '.java'), 'w') as f:
-                f.write(config_class)
+            config_classes = device.get_openhab_config_classes()
+            for config_class_name, config_class in config_classes:
+                with common.open_output_file(os.path.join(self.get_bindings_dir(), config_class_name + '.java')) as f:
+                    f.write(config_class)
 
-        if device.oh.actions == 'custom':
-            shutil.copy(os.path.join(self.get_root_dir(), class_name + 'Actions.java'), os.path.join(self.get_bindings_dir(), class_name + 'Actions.java'))
-        elif len(device.oh.actions) > 0:
-            with open(os.path.join(self.get_bindings_dir(), class_name + 'Actions.java'), 'w') as f:
-                f.write(device.get_openhab_actions_class())
+            if device.oh.actions == 'custom':
+                common.copy_output_file(os.path.join(self.get_root_dir(), class_name + 'Actions.java'), os.path.join(self.get_bindings_dir(), class_name + 'Actions.java'))
+            elif len(device.oh.actions) > 0:
+                with common.open_output_file(os.path.join(self.get_bindings_dir(), class_name + 'Actions.java')) as f:
+                    f.write(device.get_openhab_actions_class())
 
         if device.is_released():
             self.released_devices.append(device)
@@ -608,7 +608,7 @@ class OpenHABDocGenerator(openhab_common.OpenHABGeneratorTrait, common.DocGenera
         return java_common.JavaElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_openhab_doc())
 
     def is_matlab(self):
@@ -629,7 +629,7 @@ def generate(root_dir, language, internal):
             with open(os.path.join(de_docs, file), 'r') as f:
                 content = f.read()
             content = content.replace('This is the description of the :ref:`openHAB API bindings <api_bindings_openhab>` for the', '.. note::\n Zur Zeit ist nur die englische openHAB-Dokumentation verfügbar.\n\nThis is the description of the :ref:`openHAB API bindings <api_bindings_openhab>` for the')
-            with open(os.path.join(de_docs, file), 'w') as f:
+            with common.open_output_file(os.path.join(de_docs, file)) as f:
                 f.write(content)
 
         return
@@ -854,8 +854,9 @@ class PerlBindingsGenerator(perl_common.PerlGeneratorTrait, common.BindingsGener
     def generate(self, device):
         filename = '{0}{1}.pm'.format(device.get_category().camel, device.get_name().camel)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_perl_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_perl_source())
 
         if device.is_released():
             self.device_display_names.append((device.get_device_identifier(), device.get_long_display_name()))
@@ -898,7 +899,7 @@ sub get_device_display_name
         for device_identifier, device_display_name in sorted(self.device_display_names):
             cases.append("if($device_identifier == {0}) {{ return '{1}'; }}".format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'DeviceDisplayNames.pm'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'DeviceDisplayNames.pm')) as f:
             f.write(template.format(header=self.get_header_comment('hash'),
                                     cases='\n\tels'.join(cases)))
 
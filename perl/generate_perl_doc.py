@@ -486,7 +486,7 @@ class PerlDocGenerator(perl_common.PerlGeneratorTrait, common.DocGenerator):
         return perl_common.PerlElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_perl_doc())
 
 def generate(root_dir, language, internal):
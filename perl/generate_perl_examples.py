@@ -664,7 +664,7 @@ class PerlExamplesGenerator(perl_common.PerlGeneratorTrait, common.ExamplesGener
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_perl_source())
 
 def generate(root_dir, language, internal):
@@ -146,6 +146,6 @@ def test(root_dir):
     return PerlCriticExamplesTester(root_dir).run()
 
 if __name__ == '__main__':
-    common.dockerize('perl', __file__)
+    common.dockerize('perl', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
@@ -961,8 +961,9 @@ class PHPBindingsGenerator(php_common.PHPGeneratorTrait, common.BindingsGenerato
     def generate(self, device):
         filename = '{0}.php'.format(device.get_php_class_name())
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_php_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_php_source())
 
         if device.is_released():
             self.device_display_names.append((device.get_device_identifier(), device.get_long_display_name()))
@@ -993,7 +994,7 @@ function getDeviceDisplayName($device_identifier)
         for device_identifier, device_display_name in sorted(self.device_display_names):
             cases.append("case {0}: return '{1}';".format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'DeviceDisplayNames.php'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'DeviceDisplayNames.php')) as f:
             f.write(template.format(header=self.get_header_comment('asterisk'),
                                     cases='\n\t'.join(cases)))
 
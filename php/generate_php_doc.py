@@ -466,7 +466,7 @@ class PHPDocGenerator(php_common.PHPGeneratorTrait, common.DocGenerator):
         return php_common.PHPElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_php_doc())
 
 def generate(root_dir, language, internal):
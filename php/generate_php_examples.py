@@ -655,7 +655,7 @@ class PHPExamplesGenerator(php_common.PHPGeneratorTrait, common.ExamplesGenerato
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_php_source())
 
 def generate(root_dir, language, internal):
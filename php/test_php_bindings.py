@@ -71,6 +71,6 @@ def test(root_dir):
     return PHPTester(root_dir, extra_paths).run()
 
 if __name__ == '__main__':
-    common.dockerize('php', __file__)
+    common.dockerize('php', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
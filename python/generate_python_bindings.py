@@ -31,6 +31,7 @@ if sys.hexversion < 0x3040000:
     sys.exit(1)
 
 import os
+import re
 import importlib.util
 import importlib.machinery
 
@@ -53,6 +54,35 @@ if 'generators' not in sys.modules:
 from generators import common
 from generators.python import python_common
 
+# turns a method template of the blocking device class into its async variant
+def make_async_template(template):
+    for old, new in [('\n    def ', '\n    async def '),
+                     ('self.ipcon.send_request(', 'await self.ipcon.send_request('),
+                     ('self.check_validity()', 'await self.check_validity()'),
+                     ('self.send_stream_in_chunks(', 'await self.send_stream_in_chunks('),
+                     ('self.{function_name}_low_level({parameters})', 'await self.{function_name}_low_level({parameters})'),
+                     ('with self.stream_lock:', 'async with self.stream_lock:')]:
+        template = template.replace(old, new)
+
+    return template
+
+# the replacements of make_async_template depend on the spelling of the blocking
+# templates. check the result, so that a template that doesn't match anymore
+# fails here instead of producing a call that returns an unawaited coroutine
+def check_async_methods(methods, coroutine_names, class_name):
+    coroutine_names = coroutine_names | set(re.findall(r'^    async def (\w+)\(', methods, re.MULTILINE))
+
+    for line in methods.split('\n'):
+        if re.match(r'^    def ', line) != None:
+            raise common.GeneratorError('Method is not async in {0}: {1}'.format(class_name, line.strip()))
+
+        if re.search(r'(?<!async )\bwith self\.stream_lock\b', line) != None:
+            raise common.GeneratorError('Async lock is not used by async with in {0}: {1}'.format(class_name, line.strip()))
+
+        for match in re.finditer(r'(\bawait\s+)?\bself\.(?:ipcon\.)?(\w+)\(', line):
+            if match.group(1) == None and match.group(2) in coroutine_names:
+                raise common.GeneratorError('Coroutine {0} is not awaited in {1}: {2}'.format(match.group(2), class_name, line.strip()))
+
 class PythonBindingsDevice(python_common.PythonDevice):
     def get_python_import(self):
         template = """# -*- coding: utf-8 -*-
@@ -60,9 +90,9 @@ class PythonBindingsDevice(python_common.PythonDevice):
 from collections import namedtuple
 
 try:
-    from .ip_connection import Device, IPConnection, Error, create_char, create_char_list, create_string, create_chunk_data
+    from .ip_connection import Device, IPConnection, Error, create_char, create_char_list, create_string, create_chunk_data, get_payload_codec
 except (ValueError, ImportError):
-    from ip_connection import Device, IPConnection, Error, create_char, create_char_list, create_string, create_chunk_data
+    from ip_connection import Device, IPConnection, Error, create_char, create_char_list, create_string, create_chunk_data, get_payload_codec
 
 """
 
@@ -74,28 +104,14 @@ except (ValueError, ImportError):
         return template.format(self.get_generator().get_header_comment('hash'),
                                released)
 
-    def get_python_namedtuples(self):
-        tuples = ''
-        template = """{0} = namedtuple('{1}', [{2}])
-"""
+    def get_python_namedtuple_fields(self):
+        namedtuples = []
 
         for packet in self.get_packets('function'):
             if len(packet.get_elements(direction='out')) < 2:
                 continue
 
-            name = packet.get_name()
-
-            if name.space.startswith('Get '):
-                name_tup = name.camel[3:]
-            else:
-                name_tup = name.camel
-
-            params = []
-
-            for element in packet.get_elements(direction='out'):
-                params.append("'{0}'".format(element.get_name().under))
-
-            tuples += template.format(name.camel, name_tup, ", ".join(params))
+            namedtuples.append((packet.get_name(), packet.get_elements(direction='out')))
 
         for packet in self.get_packets('function'):
             if not packet.has_high_level():
@@ -104,8 +120,16 @@ except (ValueError, ImportError):
             if len(packet.get_elements(direction='out', high_level=True)) < 2:
                 continue
 
-            name = packet.get_name(skip=-2)
+            namedtuples.append((packet.get_name(skip=-2), packet.get_elements(direction='out', high_level=True)))
+
+        return namedtuples
 
+    def get_python_namedtuples(self):
+        tuples = ''
+        template = """{0} = namedtuple('{1}', [{2}])
+"""
+
+        for name, elements in self.get_python_namedtuple_fields():
             if name.space.startswith('Get '):
                 name_tup = name.camel[3:]
             else:
@@ -113,13 +137,34 @@ except (ValueError, ImportError):
 
             params = []
 
-            for element in packet.get_elements(direction='out', high_level=True):
+            for element in elements:
                 params.append("'{0}'".format(element.get_name().under))
 
             tuples += template.format(name.camel, name_tup, ", ".join(params))
 
         return tuples
 
+    def get_python_payload_codec_forms(self):
+        codecs = {}
+
+        for packet in self.get_packets('function'):
+            for io in ['in', 'out']:
+                codecs[packet.get_python_payload_codec_name(io)] = packet.get_python_format_list(io)
+
+        for packet in self.get_packets('callback'):
+            codecs[packet.get_python_payload_codec_name('out')] = packet.get_python_format_list('out')
+
+        return sorted(codecs.items())
+
+    def get_python_payload_codecs(self):
+        template = "{0} = get_payload_codec('{1}') # internal\n"
+        source = '\n'
+
+        for name, form in self.get_python_payload_codec_forms():
+            source += template.format(name, form)
+
+        return source
+
     def get_python_class(self):
         template = """
 class {0}(Device):
@@ -195,13 +240,13 @@ class {0}(Device):
 
     def get_python_callback_formats(self):
         callback_formats = ''
-        template = "        self.callback_formats[{0}.CALLBACK_{1}] = ({2}, '{3}')\n"
+        template = "        self.callback_formats[{0}.CALLBACK_{1}] = ({2}, {3})\n"
 
         for packet in self.get_packets('callback'):
             callback_formats += template.format(self.get_python_class_name(),
                                                 packet.get_name().upper,
                                                 packet.get_response_size(),
-                                                packet.get_python_format_list('out'))
+                                                packet.get_python_payload_codec_name('out'))
 
         return callback_formats + '\n'
 
@@ -226,34 +271,67 @@ class {0}(Device):
 
         return high_level_callbacks
 
+    def get_python_stream_out_functions(self):
+        stream_out_functions = ''
+        template = "        self.stream_out_functions[{0}.FUNCTION_{1}] = ['{2}', {{}}]\n"
+
+        for packet in self.get_packets('function'):
+            stream_out = packet.get_high_level('stream_out')
+
+            if stream_out != None and not stream_out.has_single_chunk():
+                stream_out_functions += template.format(self.get_python_class_name(),
+                                                        packet.get_name().upper,
+                                                        stream_out.get_chunk_data_element().get_python_struct_format())
+
+        return common.wrap_non_empty('', stream_out_functions, '\n')
+
+    def get_python_multi_request_functions(self):
+        multi_request_functions = ''
+        template = "        self.multi_request_functions.add('{0}')\n"
+
+        for packet in self.get_packets('function'):
+            stream_in = packet.get_high_level('stream_in')
+            stream_out = packet.get_high_level('stream_out')
+
+            if (stream_in != None and (stream_in.get_fixed_length() != None or not stream_in.has_single_chunk())) or \
+               (stream_out != None and not stream_out.has_single_chunk()):
+                multi_request_functions += template.format(packet.get_name(skip=-2).under)
+
+        return common.wrap_non_empty('', multi_request_functions, '\n')
+
     def get_python_add_device(self):
         return '        ipcon.add_device(self)\n'
 
-    def get_python_methods(self):
+    def get_python_methods(self, asynchronous=False):
         m_tup = """
     def {0}(self{8}{4}):
         \"\"\"
         {10}
         \"\"\"{11}{12}
-        return {1}(*self.ipcon.send_request(self, {2}.FUNCTION_{3}, ({4}{9}), '{5}', {6}, '{7}'))
+        return {1}(*self.ipcon.send_request(self, {2}.FUNCTION_{3}, ({4}{9}), {5}, {6}, {7}))
 """
         m_ret = """
     def {0}(self{7}{3}):
         \"\"\"
         {9}
         \"\"\"{10}{11}
-        return self.ipcon.send_request(self, {1}.FUNCTION_{2}, ({3}{8}), '{4}', {5}, '{6}')
+        return self.ipcon.send_request(self, {1}.FUNCTION_{2}, ({3}{8}), {4}, {5}, {6})
 """
         m_nor = """
     def {0}(self{5}{3}):
         \"\"\"
         {7}
         \"\"\"{8}{9}
-        self.ipcon.send_request(self, {1}.FUNCTION_{2}, ({3}{6}), '{4}', 0, '')
+        self.ipcon.send_request(self, {1}.FUNCTION_{2}, ({3}{6}), {4}, 0, {10})
 """
         methods = ''
         cls = self.get_python_class_name()
 
+        if asynchronous:
+            m_tup = make_async_template(m_tup)
+            m_ret = make_async_template(m_ret)
+            m_nor = make_async_template(m_nor)
+
         # normal and low-level
         for packet in self.get_packets('function'):
             nb = packet.get_name().camel
@@ -270,15 +348,18 @@ class {0}(Device):
                 if not ',' in par:
                     ct = ','
 
-            in_f = packet.get_python_format_list('in')
+            in_f = packet.get_python_payload_codec_name('in')
             out_l = packet.get_response_size()
-            out_f = packet.get_python_format_list('out')
+            out_f = packet.get_python_payload_codec_name('out')
 
             if packet.get_function_id() == 255: # <device>.get_identity
                 check = ''
             else:
                 check = '\n        self.check_validity()\n'
 
+                if asynchronous:
+                    check = make_async_template(check)
+
             coercions = common.wrap_non_empty('\n        ', packet.get_python_parameter_coercions(), '\n')
             out_c = len(packet.get_elements(direction='out'))
 
@@ -287,7 +368,7 @@ class {0}(Device):
             elif out_c == 1:
                 methods += m_ret.format(ns, cls, nh, par, in_f, out_l, out_f, cp, ct, doc, check, coercions)
             else:
-                methods += m_nor.format(ns, cls, nh, par, in_f, cp, ct, doc, check, coercions)
+                methods += m_nor.format(ns, cls, nh, par, in_f, cp, ct, doc, check, coercions, out_f)
 
         # high-level
         template_stream_in = """
@@ -305,11 +386,15 @@ class {0}(Device):
             {stream_name_under}_chunk_data = [{chunk_padding}] * {chunk_cardinality}
             ret = self.{function_name}_low_level({parameters})
         else:
+            {stream_name_under}_chunk_requests = []
+
+            while {stream_name_under}_chunk_offset < {stream_name_under}_length:
+                {stream_name_under}_chunk_data = create_chunk_data({stream_name_under}, {stream_name_under}_chunk_offset, {chunk_cardinality}, {chunk_padding})
+                {stream_name_under}_chunk_requests.append(({parameters}))
+                {stream_name_under}_chunk_offset += {chunk_cardinality}
+
             with self.stream_lock:
-                while {stream_name_under}_chunk_offset < {stream_name_under}_length:
-                    {stream_name_under}_chunk_data = create_chunk_data({stream_name_under}, {stream_name_under}_chunk_offset, {chunk_cardinality}, {chunk_padding})
-                    ret = self.{function_name}_low_level({parameters})
-                    {stream_name_under}_chunk_offset += {chunk_cardinality}
+                ret = self.send_stream_in_chunks(self.{function_name}_low_level, {class_name}.FUNCTION_{low_level_function_name_upper}, {stream_name_under}_chunk_requests, {payload_in}, {response_size}, {payload_out})
 {result}
 """
         template_stream_in_fixed_length = """
@@ -323,11 +408,15 @@ class {0}(Device):
         if len({stream_name_under}) != {stream_name_under}_length:
             raise Error(Error.INVALID_PARAMETER, '{stream_name_space} has to be exactly {{0}} items long'.format({stream_name_under}_length))
 
+        {stream_name_under}_chunk_requests = []
+
+        while {stream_name_under}_chunk_offset < {stream_name_under}_length:
+            {stream_name_under}_chunk_data = create_chunk_data({stream_name_under}, {stream_name_under}_chunk_offset, {chunk_cardinality}, {chunk_padding})
+            {stream_name_under}_chunk_requests.append(({parameters}))
+            {stream_name_under}_chunk_offset += {chunk_cardinality}
+
         with self.stream_lock:
-            while {stream_name_under}_chunk_offset < {stream_name_under}_length:
-                {stream_name_under}_chunk_data = create_chunk_data({stream_name_under}, {stream_name_under}_chunk_offset, {chunk_cardinality}, {chunk_padding})
-                ret = self.{function_name}_low_level({parameters})
-                {stream_name_under}_chunk_offset += {chunk_cardinality}
+            ret = self.send_stream_in_chunks(self.{function_name}_low_level, {class_name}.FUNCTION_{low_level_function_name_upper}, {stream_name_under}_chunk_requests, {payload_in}, {response_size}, {payload_out})
 {result}
 """
         template_stream_in_result = """
@@ -401,12 +490,13 @@ class {0}(Device):
         with self.stream_lock:
             ret = self.{function_name}_low_level({parameters}){dynamic_length_3}
             {chunk_offset_check}{stream_name_under}_out_of_sync = ret.{stream_name_under}_chunk_offset != 0
-            {chunk_offset_check_indent}{stream_name_under}_data = ret.{stream_name_under}_chunk_data
+            {chunk_offset_check_indent}{stream_name_under}_data = self.create_stream_out_buffer({class_name}.FUNCTION_{low_level_function_name_upper}, {stream_name_under}_length)
+            {chunk_offset_check_indent}{stream_name_under}_data.extend(ret.{stream_name_under}_chunk_data)
 
-            while not {stream_name_under}_out_of_sync and len({stream_name_under}_data) < {stream_name_under}_length:
+            while not {stream_name_under}_out_of_sync and {stream_name_under}_data.filled < {stream_name_under}_length:
                 ret = self.{function_name}_low_level({parameters}){dynamic_length_4}
-                {stream_name_under}_out_of_sync = ret.{stream_name_under}_chunk_offset != len({stream_name_under}_data)
-                {stream_name_under}_data += ret.{stream_name_under}_chunk_data
+                {stream_name_under}_out_of_sync = ret.{stream_name_under}_chunk_offset != {stream_name_under}_data.filled
+                {stream_name_under}_data.extend(ret.{stream_name_under}_chunk_data)
 
             if {stream_name_under}_out_of_sync: # discard remaining stream to bring it back in-sync
                 while ret.{stream_name_under}_chunk_offset + {chunk_cardinality} < {stream_name_under}_length:
@@ -424,7 +514,7 @@ class {0}(Device):
             if ret.{stream_name_under}_chunk_offset == (1 << {shift_size}) - 1: # maximum chunk offset -> stream has no data
                 {stream_name_under}_length = 0
                 {stream_name_under}_out_of_sync = False
-                {stream_name_under}_data = ()
+                {stream_name_under}_data = self.create_stream_out_buffer({class_name}.FUNCTION_{low_level_function_name_upper}, 0)
             else:
                 """
         template_stream_out_single_chunk = """
@@ -436,12 +526,22 @@ class {0}(Device):
 {result}
 """
         template_stream_out_result = """
-        return {stream_name_under}_data[:{stream_name_under}_length]"""
+        return {stream_name_under}_data.get_data()"""
         template_stream_out_single_chunk_result = """
         return ret.{stream_name_under}_data[:ret.{stream_name_under}_length]"""
         template_stream_out_namedtuple_result = """
         return {result_name}({result_fields})"""
 
+        if asynchronous:
+            template_stream_in = make_async_template(template_stream_in)
+            template_stream_in_fixed_length = make_async_template(template_stream_in_fixed_length)
+            template_stream_in_short_write = make_async_template(template_stream_in_short_write)
+            template_stream_in_single_chunk = make_async_template(template_stream_in_single_chunk)
+            template_stream_in_single_chunk_result = make_async_template(template_stream_in_single_chunk_result)
+            template_stream_in_single_chunk_namedtuple_result = make_async_template(template_stream_in_single_chunk_namedtuple_result)
+            template_stream_out = make_async_template(template_stream_out)
+            template_stream_out_single_chunk = make_async_template(template_stream_out_single_chunk)
+
         for packet in self.get_packets('function'):
             stream_in = packet.get_high_level('stream_in')
             stream_out = packet.get_high_level('stream_out')
@@ -524,6 +624,11 @@ class {0}(Device):
                                            chunk_written_0=chunk_written_0,
                                            chunk_written_n=chunk_written_n,
                                            chunk_written_test=chunk_written_test,
+                                           class_name=cls,
+                                           low_level_function_name_upper=packet.get_name().upper,
+                                           payload_in=packet.get_python_payload_codec_name('in'),
+                                           response_size=packet.get_response_size(),
+                                           payload_out=packet.get_python_payload_codec_name('out'),
                                            result=result)
             elif stream_out != None:
                 if stream_out.get_fixed_length() != None:
@@ -532,7 +637,9 @@ class {0}(Device):
                     dynamic_length = ''
                     shift_size = int(stream_out.get_chunk_offset_element().get_type().replace('uint', ''))
                     chunk_offset_check = template_stream_out_chunk_offset_check.format(stream_name_under=stream_out.get_name().under,
-                                                                                       shift_size=shift_size)
+                                                                                       shift_size=shift_size,
+                                                                                       class_name=cls,
+                                                                                       low_level_function_name_upper=packet.get_name().upper)
                     chunk_offset_check_indent = '    '
                 else:
                     fixed_length = ''
@@ -553,7 +660,7 @@ class {0}(Device):
                             if stream_out.has_single_chunk():
                                 fields.append('ret.{0}_data[:ret.{0}_length]'.format(stream_out.get_name().under))
                             else:
-                                fields.append('{0}_data[:{0}_length]'.format(stream_out.get_name().under))
+                                fields.append('{0}_data.get_data()'.format(stream_out.get_name().under))
                         else:
                             fields.append('ret.{0}'.format(element.get_name().under))
 
@@ -579,6 +686,8 @@ class {0}(Device):
                                            chunk_offset_check=chunk_offset_check,
                                            chunk_offset_check_indent=chunk_offset_check_indent,
                                            chunk_cardinality=stream_out.get_chunk_data_element().get_cardinality(),
+                                           class_name=cls,
+                                           low_level_function_name_upper=packet.get_name().upper,
                                            result=result)
 
         return methods
@@ -608,6 +717,7 @@ class {0}(Device):
     def get_python_source(self):
         source  = self.get_python_import()
         source += self.get_python_namedtuples()
+        source += self.get_python_payload_codecs()
         source += self.get_python_class()
         source += self.get_python_callback_id_definitions()
         source += self.get_python_function_id_definitions()
@@ -615,6 +725,8 @@ class {0}(Device):
         source += self.get_python_init_method()
         source += self.get_python_callback_formats()
         source += self.get_python_high_level_callbacks()
+        source += self.get_python_stream_out_functions()
+        source += self.get_python_multi_request_functions()
         source += self.get_python_add_device()
         source += self.get_python_methods()
         source += self.get_python_register_callback_method()
@@ -624,6 +736,58 @@ class {0}(Device):
 
         return common.strip_trailing_whitespace(source)
 
+    def get_python_async_source(self):
+        template = """# -*- coding: utf-8 -*-
+{header}{released}
+try:
+    from .ip_connection import Error, create_char, create_char_list, create_string, create_chunk_data
+    from .ip_connection_async import AsyncDevice
+    from .{import_name} import {imports}
+except (ValueError, ImportError):
+    from ip_connection import Error, create_char, create_char_list, create_string, create_chunk_data
+    from ip_connection_async import AsyncDevice
+    from {import_name} import {imports}
+
+class Async{class_name}(AsyncDevice, {class_name}):
+    \"\"\"
+    {description}
+    \"\"\"
+
+    def __init__(self, uid, ipcon):
+        \"\"\"
+        Creates an object with the unique device ID *uid* and adds it to
+        the async IP Connection *ipcon*.
+        \"\"\"
+        AsyncDevice.__init__(self, uid, ipcon)
+{methods}"""
+
+        if not self.is_released():
+            released = '\n#### __DEVICE_IS_NOT_RELEASED__ ####\n'
+        else:
+            released = ''
+
+        imports = [self.get_python_class_name()]
+
+        for name, _ in self.get_python_namedtuple_fields():
+            imports.append(name.camel)
+
+        for name, _ in self.get_python_payload_codec_forms():
+            imports.append(name)
+
+        methods = self.get_python_methods(asynchronous=True)
+
+        check_async_methods(methods, self.get_generator().async_coroutine_names, 'Async' + self.get_python_class_name())
+
+        source = template.format(header=self.get_generator().get_header_comment('hash'),
+                                 released=released,
+                                 import_name=self.get_python_import_name(),
+                                 imports=', '.join(imports),
+                                 class_name=self.get_python_class_name(),
+                                 description=common.select_lang(self.get_description()),
+                                 methods=methods)
+
+        return common.strip_trailing_whitespace(source)
+
 class PythonBindingsPacket(python_common.PythonPacket):
     def get_python_formatted_doc(self):
         text = common.select_lang(self.get_doc_text())
@@ -646,6 +810,14 @@ class PythonBindingsPacket(python_common.PythonPacket):
 
         return ' '.join(forms)
 
+    def get_python_payload_codec_name(self, io):
+        form = self.get_python_format_list(io)
+
+        if len(form) == 0:
+            return 'payload_empty'
+
+        return 'payload_' + form.replace(' ', '_').replace('!', 'bool')
+
     def get_python_parameter_coercions(self, high_level=False):
         coercions = []
 
@@ -657,6 +829,12 @@ class PythonBindingsPacket(python_common.PythonPacket):
         return '\n        '.join(coercions)
 
 class PythonBindingsGenerator(python_common.PythonGeneratorTrait, common.BindingsGenerator):
+    parallel_device_attributes = ['released_files',
+                                  'device_factory_all_classes',
+                                  'device_factory_released_classes',
+                                  'device_factory_async_classes',
+                                  'device_display_names']
+
     def get_device_class(self):
         return PythonBindingsDevice
 
@@ -671,20 +849,32 @@ class PythonBindingsGenerator(python_common.PythonGeneratorTrait, common.Binding
 
         self.device_factory_all_classes = []
         self.device_factory_released_classes = []
+        self.device_factory_async_classes = []
         self.device_display_names = []
 
+        with open(os.path.join(self.get_root_dir(), 'ip_connection_async.py'), 'r') as f:
+            self.async_coroutine_names = set(re.findall(r'^    async def (\w+)\(', f.read(), re.MULTILINE))
+
     def generate(self, device):
         filename = '{0}_{1}.py'.format(device.get_category().under, device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_python_source())
+        async_filename = '{0}_{1}_async.py'.format(device.get_category().under, device.get_name().under)
+
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_python_source())
+
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), async_filename)) as f:
+                f.write(device.get_python_async_source())
 
         self.device_factory_all_classes.append((device.get_python_import_name(), device.get_python_class_name()))
 
         if device.is_released():
             self.device_factory_released_classes.append((device.get_python_import_name(), device.get_python_class_name()))
+            self.device_factory_async_classes.append((device.get_python_import_name() + '_async', 'Async' + device.get_python_class_name()))
             self.device_display_names.append((device.get_device_identifier(), device.get_long_display_name()))
             self.released_files.append(filename)
+            self.released_files.append(async_filename)
 
     def finish(self):
         template_import = """try:
@@ -710,7 +900,8 @@ def create_device(device_identifier, uid, ipcon):
     return get_device_class(device_identifier)(uid, ipcon)
 """
         for filename, device_factory_classes in [('device_factory_all.py', self.device_factory_all_classes),
-                                                 ('device_factory.py', self.device_factory_released_classes)]:
+                                                 ('device_factory.py', self.device_factory_released_classes),
+                                                 ('device_factory_async.py', self.device_factory_async_classes)]:
             imports = []
             classes = []
 
@@ -718,7 +909,7 @@ def create_device(device_identifier, uid, ipcon):
                 imports.append(template_import.format(import_name, class_name))
                 classes.append('    {0}.DEVICE_IDENTIFIER: {0},'.format(class_name))
 
-            with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
                 f.write(template.format(self.get_header_comment('hash'),
                                         '\n'.join(imports),
                                         '\n'.join(classes)))
@@ -743,7 +934,7 @@ def get_device_display_name(device_identifier):
         for device_identifier, device_display_name in sorted(self.device_display_names):
             entries.append("{0}: '{1}'".format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'device_display_names.py'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'device_display_names.py')) as f:
             f.write(template.format(header=self.get_header_comment('hash'),
                                     entries=',\n    '.join(entries)))
 
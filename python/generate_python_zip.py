@@ -94,16 +94,17 @@ class PythonZipGenerator(python_common.PythonGeneratorTrait, common.ZipGenerator
                 shutil.copy(example[1], self.tmp_examples_dir)
 
         # Copy bindings and readme
-        for filename in self.get_released_files() + ['device_factory.py']:
+        for filename in self.get_released_files() + ['device_factory.py', 'device_factory_async.py']:
             shutil.copy(os.path.join(self.get_bindings_dir(), filename), self.tmp_source_tinkerforge_dir)
 
         shutil.copy(os.path.join(root_dir, 'ip_connection.py'),             self.tmp_source_tinkerforge_dir)
+        shutil.copy(os.path.join(root_dir, 'ip_connection_async.py'),       self.tmp_source_tinkerforge_dir)
         shutil.copy(os.path.join(root_dir, 'changelog.txt'),                self.tmp_dir)
         shutil.copy(os.path.join(root_dir, 'readme.txt'),                   self.tmp_dir)
         shutil.copy(os.path.join(root_dir, '..', 'configs', 'license.txt'), self.tmp_dir)
 
         # Make __init__.py
-        with open(os.path.join(self.tmp_source_tinkerforge_dir, '__init__.py'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_source_tinkerforge_dir, '__init__.py')) as f:
             f.write(' ')
 
         # Make setup.py
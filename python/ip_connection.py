@@ -16,6 +16,8 @@ import hmac
 import hashlib
 import errno
 import threading
+import array
+import collections
 
 try:
     import queue # Python 3
@@ -30,23 +32,23 @@ if not 'INTERNAL_DEVICE_DISPLAY_NAMES' in globals():
 
 # internal
 def get_uid_from_data(data):
-    return struct.unpack('<I', data[0:4])[0]
+    return struct.unpack_from('<I', data, 0)[0]
 
 # internal
 def get_length_from_data(data):
-    return struct.unpack('<B', data[4:5])[0]
+    return struct.unpack_from('<B', data, 4)[0]
 
 # internal
 def get_function_id_from_data(data):
-    return struct.unpack('<B', data[5:6])[0]
+    return struct.unpack_from('<B', data, 5)[0]
 
 # internal
 def get_sequence_number_from_data(data):
-    return (struct.unpack('<B', data[6:7])[0] >> 4) & 0x0F
+    return (struct.unpack_from('<B', data, 6)[0] >> 4) & 0x0F
 
 # internal
 def get_error_code_from_data(data):
-    return (struct.unpack('<B', data[7:8])[0] >> 6) & 0x03
+    return (struct.unpack_from('<B', data, 7)[0] >> 6) & 0x03
 
 BASE58 = '123456789abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ'
 
@@ -99,6 +101,110 @@ def create_chunk_data(data, chunk_offset, chunk_length, chunk_padding):
 
     return chunk_data
 
+# internal
+def get_array_typecode(form_item):
+    # find an array typecode that can hold the values of the given struct
+    # format item. the array module has no fixed-size typecodes and Python 2
+    # has no 'q' and 'Q' typecodes
+    candidates = {
+        'b': 'bhil',
+        'B': 'BHIL',
+        'h': 'hil',
+        'H': 'HIL',
+        'i': 'ilq',
+        'I': 'ILQ',
+        'q': 'lq',
+        'Q': 'LQ',
+        'f': 'f',
+        'c': 'c' # char data is stored as bytes, not as array
+    }
+
+    item = form_item[-1]
+
+    if item not in candidates: # bool data has no compact representation
+        return None
+
+    if item == 'c':
+        return item
+
+    size = struct.calcsize('<' + item)
+
+    for typecode in candidates[item]:
+        try:
+            if array.array(typecode).itemsize >= size:
+                return typecode
+        except ValueError:
+            pass
+
+    return None
+
+numpy = None # imported on first use, NumPy is optional
+
+# internal
+def get_numpy_dtype(form_item):
+    global numpy
+
+    if numpy == None:
+        try:
+            import numpy # pylint: disable=redefined-outer-name
+        except ImportError:
+            raise ValueError('NumPy stream data format requires the numpy module')
+
+    item = form_item[-1]
+
+    if item == 'c': # char data is stored as bytes, not as ndarray
+        return None
+
+    if item == '!':
+        return numpy.dtype(numpy.bool_)
+
+    return numpy.dtype('<' + item)
+
+# internal
+class StreamBuffer(object):
+    def __init__(self, length, typecode, dtype=None):
+        self.length = length
+        self.filled = 0
+        self.typecode = typecode
+        self.dtype = dtype
+
+        if dtype is not None:
+            self.data = numpy.zeros(length, dtype)
+        elif typecode == None:
+            self.data = [None] * length
+        elif typecode == 'c':
+            self.data = bytearray(length)
+        else:
+            self.data = array.array(typecode, [0]) * length
+
+    # returns True if the stream is complete. chunk_data can be a tuple or,
+    # if a dtype is used, an ndarray
+    def extend(self, chunk_data):
+        count = min(len(chunk_data), self.length - self.filled)
+
+        if count > 0:
+            if self.typecode == None or self.dtype is not None:
+                chunk_data = chunk_data[:count]
+            elif self.typecode == 'c':
+                chunk_data = pack_string(''.join(chunk_data[:count]))
+            else:
+                chunk_data = array.array(self.typecode, chunk_data[:count])
+
+            self.data[self.filled:self.filled + count] = chunk_data
+            self.filled += count
+
+        return self.filled >= self.length
+
+    def get_data(self):
+        if self.dtype is not None:
+            return self.data
+        elif self.typecode == None:
+            return tuple(self.data)
+        elif self.typecode == 'c':
+            return bytes(self.data)
+        else:
+            return self.data
+
 if sys.hexversion < 0x03000000:
     # internal
     def create_char(value): # return str with len() == 1 and ord() <= 255
@@ -215,116 +321,203 @@ else:
         else:
             return ''.join(create_char_list(value, expected_type='string'))
 
-# internal
-def pack_payload(data, form):
-    if sys.hexversion < 0x03000000:
-        packed = ''
-    else:
-        packed = b''
+# Mark start and end of the payload codec and the pack_payload and
+# unpack_payload funtions, so that the saleae bindings can extract them
+# UNPACK_PAYLOAD_CUT_HERE
+if sys.hexversion < 0x03000000:
+    # internal
+    def pack_char(value):
+        return value
 
-    for f, d in zip(form.split(' '), data):
-        if '!' in f:
-            if len(f) > 1:
-                if int(f.replace('!', '')) != len(d):
-                    raise ValueError('Incorrect bool list length')
+    # internal
+    def pack_string(value):
+        return value
 
-                p = [0] * int(math.ceil(len(d) / 8.0))
+    # internal
+    def unpack_char(value):
+        return value
 
-                for i, b in enumerate(d):
-                    if b:
-                        p[i // 8] |= 1 << (i % 8)
+    # internal
+    def unpack_string(value):
+        return value
+else:
+    # internal
+    def pack_char(value):
+        return bytes([ord(value)])
 
-                packed += struct.pack('<{0}B'.format(len(p)), *p)
-            else:
-                packed += struct.pack('<?', d)
-        elif 'c' in f:
-            if sys.hexversion < 0x03000000:
+    # internal
+    def pack_string(value):
+        return bytes(map(ord, value))
+
+    # internal
+    def unpack_char(value):
+        return chr(ord(value))
+
+    # internal
+    def unpack_string(value):
+        return value.decode('latin-1') # maps every byte to the char with the same ordinal
+
+# internal
+class PayloadCodec(object):
+    FIELD_VALUE = 0
+    FIELD_VALUE_LIST = 1
+    FIELD_BOOL = 2
+    FIELD_BOOL_LIST = 3
+    FIELD_CHAR = 4
+    FIELD_CHAR_LIST = 5
+    FIELD_STRING = 6
+
+    def __init__(self, form):
+        self.form = form
+        self.fields = [] # [(kind, cardinality, struct item index, struct item count)]
+        struct_format = '<'
+        index = 0
+
+        if len(form) > 0:
+            for f in form.split(' '):
                 if len(f) > 1:
-                    packed += struct.pack('<' + f, *d)
+                    cardinality = int(f[:-1])
                 else:
-                    packed += struct.pack('<' + f, d)
-            else:
-                if len(f) > 1:
-                    packed += struct.pack('<' + f, *list(map(lambda char: bytes([ord(char)]), d)))
+                    cardinality = 1
+
+                if f[-1] == '!':
+                    if len(f) > 1:
+                        byte_count = (cardinality + 7) // 8
+                        struct_format += '{0}B'.format(byte_count)
+                        self.fields.append((PayloadCodec.FIELD_BOOL_LIST, cardinality, index, byte_count))
+                    else:
+                        struct_format += '?'
+                        self.fields.append((PayloadCodec.FIELD_BOOL, 1, index, 1))
+                elif f[-1] == 'c':
+                    struct_format += f
+
+                    if len(f) > 1:
+                        self.fields.append((PayloadCodec.FIELD_CHAR_LIST, cardinality, index, cardinality))
+                    else:
+                        self.fields.append((PayloadCodec.FIELD_CHAR, 1, index, 1))
+                elif f[-1] == 's':
+                    struct_format += f
+                    self.fields.append((PayloadCodec.FIELD_STRING, cardinality, index, 1))
                 else:
-                    packed += struct.pack('<' + f, bytes([ord(d)]))
-        elif 's' in f:
-            if sys.hexversion < 0x03000000:
-                packed += struct.pack('<' + f, d)
-            else:
-                packed += struct.pack('<' + f, bytes(map(ord, d)))
-        elif len(f) > 1:
-            packed += struct.pack('<' + f, *d)
-        else:
-            packed += struct.pack('<' + f, d)
+                    struct_format += f
 
-    return packed
+                    if len(f) > 1:
+                        self.fields.append((PayloadCodec.FIELD_VALUE_LIST, cardinality, index, cardinality))
+                    else:
+                        self.fields.append((PayloadCodec.FIELD_VALUE, 1, index, 1))
 
-# Mark start and end of the unpack_payload funtion, so that the
-# saleae bindings can extract it
-# UNPACK_PAYLOAD_CUT_HERE
-# internal
-def unpack_payload(data, form):
-    ret = []
+                index += self.fields[-1][3]
 
-    for f in form.split(' '):
-        o = f
+        self.struct = struct.Struct(struct_format)
+        self.size = self.struct.size
+        self.field_count = len(self.fields)
+        self.field_forms = form.split(' ') if len(form) > 0 else []
 
-        if '!' in f:
-            if len(f) > 1:
-                f = '{0}B'.format(int(math.ceil(int(f.replace('!', '')) / 8.0)))
-            else:
-                f = 'B'
+        # if all fields are plain values then the struct arguments and results
+        # can be passed through without any further conversion
+        self.plain = all([field[0] == PayloadCodec.FIELD_VALUE for field in self.fields])
 
-        f = '<' + f
-        length = struct.calcsize(f)
-        x = struct.unpack(f, data[:length])
+    def pack(self, data):
+        if self.plain:
+            return self.struct.pack(*data)
 
-        if '!' in o:
-            y = []
+        args = []
 
-            if len(o) > 1:
-                for i in range(int(o.replace('!', ''))):
-                    y.append(x[i // 8] & (1 << (i % 8)) != 0)
-            else:
-                y.append(x[0] != 0)
+        for n, (field, d) in enumerate(zip(self.fields, data)):
+            kind, cardinality = field[:2]
 
-            x = tuple(y)
+            if kind == PayloadCodec.FIELD_VALUE or kind == PayloadCodec.FIELD_BOOL:
+                args.append(d)
+            elif kind == PayloadCodec.FIELD_VALUE_LIST:
+                args.extend(self.check_list_length(n, d))
+            elif kind == PayloadCodec.FIELD_BOOL_LIST:
+                p = [0] * ((cardinality + 7) // 8)
 
-        if 'c' in f:
-            if sys.hexversion < 0x03000000:
-                if len(x) > 1:
-                    ret.append(x)
-                else:
-                    ret.append(x[0])
-            else:
-                if len(x) > 1:
-                    ret.append(tuple(map(lambda item: chr(ord(item)), x)))
-                else:
-                    ret.append(chr(ord(x[0])))
-        elif 's' in f:
-            if sys.hexversion < 0x03000000:
-                s = x[0]
-            else:
-                s = ''.join(map(chr, x[0]))
+                for i, b in enumerate(self.check_list_length(n, d)):
+                    if b:
+                        p[i // 8] |= 1 << (i % 8)
+
+                args.extend(p)
+            elif kind == PayloadCodec.FIELD_CHAR:
+                args.append(pack_char(d))
+            elif kind == PayloadCodec.FIELD_CHAR_LIST:
+                args.extend(map(pack_char, self.check_list_length(n, d)))
+            else: # PayloadCodec.FIELD_STRING
+                args.append(pack_string(d))
+
+        return self.struct.pack(*args)
+
+    # a list with the wrong length would shift all following fields, or would
+    # only be reported as a wrong overall item count by struct.pack
+    def check_list_length(self, n, d):
+        if not hasattr(d, '__len__'):
+            d = list(d)
+
+        if len(d) != self.fields[n][1]:
+            raise ValueError('Incorrect list length for payload field {0} ({1}): expected {2}, got {3}'
+                             .format(n, self.field_forms[n], self.fields[n][1], len(d)))
+
+        return d
+
+    def unpack(self, data, offset=0):
+        x = self.struct.unpack_from(data, offset)
+
+        if self.plain:
+            if self.field_count == 1:
+                return x[0]
+
+            return list(x)
+
+        ret = []
+
+        for kind, cardinality, i, count in self.fields:
+            if kind == PayloadCodec.FIELD_VALUE or kind == PayloadCodec.FIELD_BOOL:
+                ret.append(x[i])
+            elif kind == PayloadCodec.FIELD_VALUE_LIST:
+                ret.append(x[i:i + count])
+            elif kind == PayloadCodec.FIELD_BOOL_LIST:
+                ret.append(tuple([x[i + k // 8] & (1 << (k % 8)) != 0 for k in range(cardinality)]))
+            elif kind == PayloadCodec.FIELD_CHAR:
+                ret.append(unpack_char(x[i]))
+            elif kind == PayloadCodec.FIELD_CHAR_LIST:
+                ret.append(tuple(map(unpack_char, x[i:i + count])))
+            else: # PayloadCodec.FIELD_STRING
+                s = unpack_string(x[i])
+                k = s.find('\x00')
+
+                if k >= 0:
+                    s = s[:k]
+
+                ret.append(s)
+
+        if len(ret) == 1:
+            return ret[0]
+        else:
+            return ret
 
-            i = s.find('\x00')
+payload_codecs = {} # form -> PayloadCodec
 
-            if i >= 0:
-                s = s[:i]
+# internal
+def get_payload_codec(form):
+    if isinstance(form, PayloadCodec):
+        return form
 
-            ret.append(s)
-        elif len(x) > 1:
-            ret.append(x)
-        else:
-            ret.append(x[0])
+    codec = payload_codecs.get(form)
 
-        data = data[length:]
+    if codec == None:
+        # no lock required, in the worst case the same form is compiled twice
+        codec = PayloadCodec(form)
+        payload_codecs[form] = codec
 
-    if len(ret) == 1:
-        return ret[0]
-    else:
-        return ret
+    return codec
+
+# internal
+def pack_payload(data, form):
+    return get_payload_codec(form).pack(data)
+
+# internal
+def unpack_payload(data, form):
+    return get_payload_codec(form).unpack(data)
 
 # UNPACK_PAYLOAD_CUT_HERE
 
@@ -360,6 +553,35 @@ class Error(Exception):
             self.__cause__ = None
             self.__suppress_context__ = True
 
+# internal
+def unpack_response(response, function_id, length_ret, form_ret):
+    error_code = get_error_code_from_data(response)
+
+    if error_code == 0:
+        if length_ret == 0:
+            length_ret = 8 # setter with response-expected enabled
+
+        if len(response) != length_ret:
+            msg = 'Expected response of {0} byte for function ID {1}, got {2} byte instead' \
+                  .format(length_ret, function_id, len(response))
+            raise Error(Error.WRONG_RESPONSE_LENGTH, msg)
+    elif error_code == 1:
+        msg = 'Got invalid parameter for function {0}'.format(function_id)
+        raise Error(Error.INVALID_PARAMETER, msg)
+    elif error_code == 2:
+        msg = 'Function {0} is not supported'.format(function_id)
+        raise Error(Error.NOT_SUPPORTED, msg)
+    else:
+        msg = 'Function {0} returned an unknown error'.format(function_id)
+        raise Error(Error.UNKNOWN_ERROR_CODE, msg)
+
+    codec_ret = get_payload_codec(form_ret)
+
+    if codec_ret.field_count > 0:
+        return codec_ret.unpack(response, 8)
+
+    return None
+
 class Device(object):
     DEVICE_IDENTIFIER_CHECK_PENDING = 0
     DEVICE_IDENTIFIER_CHECK_MATCH = 1
@@ -370,6 +592,10 @@ class Device(object):
     RESPONSE_EXPECTED_TRUE = 2 # setter
     RESPONSE_EXPECTED_FALSE = 3 # setter, default
 
+    STREAM_DATA_FORMAT_TUPLE = 0 # default
+    STREAM_DATA_FORMAT_ARRAY = 1
+    STREAM_DATA_FORMAT_NUMPY = 2
+
     # internal
     def __init__(self, uid, ipcon, device_identifier, device_display_name):
         uid_ = base58decode(uid)
@@ -396,11 +622,11 @@ class Device(object):
         self.registered_callbacks = {}
         self.callback_formats = {}
         self.high_level_callbacks = {}
-        self.expected_response_function_id = None # protected by request_lock
-        self.expected_response_sequence_number = None # protected by request_lock
-        self.response_queue = queue.Queue()
-        self.request_lock = threading.Lock()
+        self.stream_out_functions = {}
+        self.multi_request_functions = set() # names of the functions that send more than one request
+        self.coalesced_callbacks = set()
         self.stream_lock = threading.Lock()
+        self.stream_write_window = 1
 
         self.response_expected = [Device.RESPONSE_EXPECTED_INVALID_FUNCTION_ID] * 256
         self.response_expected[IPConnection.FUNCTION_ADC_CALIBRATE] = Device.RESPONSE_EXPECTED_ALWAYS_TRUE
@@ -490,6 +716,272 @@ class Device(object):
             if self.response_expected[i] in [Device.RESPONSE_EXPECTED_TRUE, Device.RESPONSE_EXPECTED_FALSE]:
                 self.response_expected[i] = flag
 
+    # internal
+    def get_stream_options(self, stream_id):
+        if stream_id in self.high_level_callbacks:
+            return self.high_level_callbacks[stream_id][1]
+
+        if stream_id in self.stream_out_functions:
+            return self.stream_out_functions[stream_id][1]
+
+        raise ValueError('Invalid high-level callback or stream getter function ID {0}'.format(stream_id))
+
+    def get_stream_data_format(self, stream_id):
+        """
+        Returns the stream data format of the high-level callback or the
+        stream getter specified by the *stream_id* parameter, as set by
+        set_stream_data_format.
+        """
+
+        return self.get_stream_options(stream_id).get('data_format', Device.STREAM_DATA_FORMAT_TUPLE)
+
+    def set_stream_data_format(self, stream_id, data_format):
+        """
+        Changes the format of the stream data passed to the high-level callback
+        or returned by the stream getter specified by the *stream_id*
+        parameter. High-level callbacks are specified by their callback ID,
+        stream getters by the function ID of their low-level function.
+
+        With STREAM_DATA_FORMAT_TUPLE (default) the stream data is passed as a
+        tuple. With STREAM_DATA_FORMAT_ARRAY integer and float stream data is
+        passed as an array.array and char stream data is passed as bytes. This
+        avoids creating a Python object per item for large streams. Bool stream
+        data is always passed as a tuple.
+
+        With STREAM_DATA_FORMAT_NUMPY integer, float and bool stream data is
+        passed as a numpy.ndarray and char stream data is passed as bytes. The
+        stream data is collected in an ndarray that is allocated with the full
+        stream length at stream start. The chunks of high-level callbacks are
+        decoded directly from the received packets. This format requires the
+        optional numpy module.
+        """
+
+        options = self.get_stream_options(stream_id)
+
+        if data_format not in [Device.STREAM_DATA_FORMAT_TUPLE, Device.STREAM_DATA_FORMAT_ARRAY, Device.STREAM_DATA_FORMAT_NUMPY]:
+            raise ValueError('Invalid stream data format {0}'.format(data_format))
+
+        if stream_id in self.high_level_callbacks:
+            hlcb = self.high_level_callbacks[stream_id]
+            form_items = get_payload_codec(self.callback_formats[-stream_id][1]).form.split(' ')
+            chunk_data_index = hlcb[0].index('stream_chunk_data')
+            form_item = form_items[chunk_data_index]
+        else:
+            form_item = self.stream_out_functions[stream_id][0]
+
+        typecode = None
+        dtype = None
+        chunk_data_offset = None
+        chunk_data_codec = None
+        chunk_data_length = None
+
+        if data_format == Device.STREAM_DATA_FORMAT_ARRAY:
+            typecode = get_array_typecode(form_item)
+        elif data_format == Device.STREAM_DATA_FORMAT_NUMPY:
+            dtype = get_numpy_dtype(form_item)
+
+            if dtype is None:
+                typecode = 'c'
+            elif stream_id in self.high_level_callbacks and form_item[-1] != '!':
+                # bool lists are bit-packed and cannot be decoded in-place
+                chunk_data_offset = 8 + sum([get_payload_codec(item).size for item in form_items[:chunk_data_index]])
+                chunk_data_length = get_payload_codec(form_item).fields[0][1]
+                skip_item = '{0}s'.format(get_payload_codec(form_item).size)
+                chunk_data_codec = get_payload_codec(' '.join(form_items[:chunk_data_index] + [skip_item] + form_items[chunk_data_index + 1:]))
+
+        options['data_format'] = data_format
+        options['typecode'] = typecode
+        options['dtype'] = dtype
+        options['chunk_data_offset'] = chunk_data_offset
+        options['chunk_data_codec'] = chunk_data_codec
+        options['chunk_data_length'] = chunk_data_length
+
+        if stream_id in self.high_level_callbacks:
+            self.high_level_callbacks[stream_id][2] = None # abort stream in-progress, if any
+
+    # internal
+    def create_stream_out_buffer(self, function_id, length):
+        options = self.stream_out_functions[function_id][1]
+
+        return StreamBuffer(length, options.get('typecode'), options.get('dtype'))
+
+    def get_stream_write_window(self):
+        """
+        Returns the stream write window, as set by set_stream_write_window.
+        """
+
+        return self.stream_write_window
+
+    def set_stream_write_window(self, window):
+        """
+        Changes the number of stream chunks that a high-level setter function
+        sends ahead before waiting for the response to the oldest chunk. The
+        default value of 1 sends one chunk and waits for its response before
+        sending the next chunk. The maximum value is 15, the number of
+        distinct sequence numbers.
+
+        A larger window only has an effect on stream setters with the response
+        expected flag enabled and avoids waiting for one round-trip per chunk.
+        If a chunk fails then its error is raised and no further chunks are
+        sent. But up to window - 1 chunks following the failed chunk might
+        have been sent already and can still reach the device. Stream setters
+        that can report a short write are always sent one chunk at a time.
+        """
+
+        window = int(window)
+
+        if window < 1 or window > IPConnection.MAX_PIPELINE_WINDOW:
+            raise ValueError('Stream write window {0} out of range'.format(window))
+
+        self.stream_write_window = window
+
+    def get_callback_coalescing(self, callback_id):
+        """
+        Returns *true* if the callback specified by the *callback_id* parameter
+        only delivers its latest value, as set by set_callback_coalescing.
+        """
+
+        if callback_id not in self.callback_formats:
+            raise ValueError('Invalid callback ID {0}'.format(callback_id))
+
+        return callback_id in self.coalesced_callbacks
+
+    def set_callback_coalescing(self, callback_id, coalescing):
+        """
+        Changes whether the callback specified by the *callback_id* parameter
+        delivers every received value (default) or only its latest value.
+
+        With coalescing enabled the IP Connection keeps at most one undelivered
+        value of the callback queued. If a new value is received before the
+        queued value was passed to the callback function then the queued value
+        is replaced. This bounds the callback latency for high-rate callbacks
+        if the callback function cannot keep up with the configured period.
+
+        The low-level callbacks of high-level callbacks need every value to
+        reassemble the stream and cannot be coalesced.
+        """
+
+        if callback_id not in self.callback_formats:
+            raise ValueError('Invalid callback ID {0}'.format(callback_id))
+
+        if -callback_id in self.high_level_callbacks:
+            raise ValueError('Callback ID {0} belongs to a high-level callback and cannot be coalesced'.format(callback_id))
+
+        if bool(coalescing):
+            self.coalesced_callbacks.add(callback_id)
+        else:
+            self.coalesced_callbacks.discard(callback_id)
+
+    # internal
+    def send_stream_in_chunks(self, low_level_function, function_id, chunk_requests, form, length_ret, form_ret):
+        if self.stream_write_window == 1 or not self.get_response_expected(function_id):
+            ret = None
+
+            for chunk_request in chunk_requests:
+                ret = low_level_function(*chunk_request)
+
+            return ret
+
+        self.check_validity()
+
+        return self.ipcon.send_pipelined_requests(self, function_id, chunk_requests, form, length_ret, form_ret,
+                                                  self.stream_write_window)[-1]
+
+    # internal
+    # NOTE: returns the list of (function, arguments) pairs that have to be
+    #       called for the callback packet. this includes the high-level
+    #       callback, if the packet completes its stream
+    def unpack_callback(self, function_id, packet):
+        calls = []
+
+        if -function_id in self.high_level_callbacks:
+            hlcb = self.high_level_callbacks[-function_id] # [roles, options, data]
+            length, form = self.callback_formats[function_id] # FIXME: currently assuming that low-level callback has more than one element
+
+            if len(packet) != length:
+                return calls # silently ignoring callback with wrong length
+
+            chunk_data_offset = hlcb[1].get('chunk_data_offset')
+
+            if chunk_data_offset != None:
+                # the chunk data is skipped as a string and decoded as ndarray
+                llvalues = hlcb[1]['chunk_data_codec'].unpack(packet, 8)
+                chunk_data = numpy.frombuffer(packet, hlcb[1]['dtype'], hlcb[1]['chunk_data_length'], chunk_data_offset)
+            else:
+                llvalues = get_payload_codec(form).unpack(packet, 8)
+                chunk_data = llvalues[hlcb[0].index('stream_chunk_data')]
+
+            has_data = False
+            data = None
+
+            if hlcb[1]['fixed_length'] != None:
+                length = hlcb[1]['fixed_length']
+            else:
+                length = llvalues[hlcb[0].index('stream_length')]
+
+            if not hlcb[1]['single_chunk']:
+                chunk_offset = llvalues[hlcb[0].index('stream_chunk_offset')]
+            else:
+                chunk_offset = 0
+
+            # the stream data is collected in a buffer that is allocated with
+            # the full stream length at stream start and filled in-place
+            if hlcb[2] == None: # no stream in-progress
+                if chunk_offset == 0: # stream starts
+                    hlcb[2] = StreamBuffer(length, hlcb[1].get('typecode'), hlcb[1].get('dtype'))
+
+                    if hlcb[2].extend(chunk_data): # stream complete
+                        has_data = True
+                        data = hlcb[2].get_data()
+                        hlcb[2] = None
+                else: # ignore tail of current stream, wait for next stream start
+                    pass
+            else: # stream in-progress
+                if chunk_offset != hlcb[2].filled: # stream out-of-sync
+                    has_data = True
+                    data = None
+                    hlcb[2] = None
+                else: # stream in-sync
+                    if hlcb[2].extend(chunk_data): # stream complete
+                        has_data = True
+                        data = hlcb[2].get_data()
+                        hlcb[2] = None
+
+            cb = self.registered_callbacks.get(-function_id)
+
+            if has_data and cb != None:
+                result = []
+
+                for role, llvalue in zip(hlcb[0], llvalues):
+                    if role == 'stream_chunk_data':
+                        result.append(data)
+                    elif role == None:
+                        result.append(llvalue)
+
+                calls.append((cb, tuple(result)))
+
+        cb = self.registered_callbacks.get(function_id)
+
+        if cb != None:
+            length, form = self.callback_formats.get(function_id, (None, None))
+
+            if length == None:
+                return calls # silently ignore registered but unknown callback
+
+            if len(packet) != length:
+                return calls # silently ignoring callback with wrong length
+
+            codec = get_payload_codec(form)
+
+            if codec.field_count == 0:
+                calls.append((cb, ()))
+            elif codec.field_count == 1:
+                calls.append((cb, (codec.unpack(packet, 8),)))
+            else:
+                calls.append((cb, tuple(codec.unpack(packet, 8))))
+
+        return calls
+
     # internal
     def check_validity(self):
         if self.replaced:
@@ -569,12 +1061,24 @@ class IPConnection(object):
     CONNECTION_STATE_CONNECTED = 1
     CONNECTION_STATE_PENDING = 2 # auto-reconnect in process
 
+    # overflow_policy parameter to set_callback_workers
+    CALLBACK_OVERFLOW_DROP_OLDEST = 0
+    CALLBACK_OVERFLOW_COALESCE = 1
+
     QUEUE_EXIT = 0
     QUEUE_META = 1
     QUEUE_PACKET = 2
+    QUEUE_COALESCED_PACKET = 3
 
     DISCONNECT_PROBE_INTERVAL = 5
 
+    RECEIVE_SIZE = 8192
+    RECEIVE_BUFFER_SIZE = 2 * RECEIVE_SIZE
+
+    MAX_PIPELINE_WINDOW = 15 # number of distinct sequence numbers
+
+    ENUMERATE_CALLBACK_CODEC = get_payload_codec('8s 8s c 3B 3B H B') # internal
+
     class CallbackContext(object):
         def __init__(self):
             self.queue = None
@@ -582,6 +1086,146 @@ class IPConnection(object):
             self.packet_dispatch_allowed = False
             self.lock = None
 
+    class CallbackWorker(object):
+        def __init__(self, ipcon, index, max_queue_size, overflow_policy):
+            self.ipcon = ipcon
+            self.max_queue_size = max_queue_size
+            self.overflow_policy = overflow_policy
+            self.packets = collections.deque() # protected by condition
+            self.dropped = 0 # protected by condition
+            self.running = True # protected by condition
+            self.condition = threading.Condition()
+            self.thread = threading.Thread(name='Callback-Worker-{0}'.format(index),
+                                           target=self.loop)
+            self.thread.daemon = True
+            self.thread.start()
+
+        # key is (uid, function_id), kind and data are as for the callback queue
+        def put(self, key, kind, data):
+            with self.condition:
+                if self.max_queue_size > 0 and len(self.packets) >= self.max_queue_size:
+                    self.drop(key)
+
+                self.packets.append((key, kind, data))
+                self.condition.notify()
+
+        # NOTE: assumes that condition is locked
+        def drop(self, key):
+            self.dropped += 1
+            index = 0
+
+            if self.overflow_policy == IPConnection.CALLBACK_OVERFLOW_COALESCE:
+                # drop the oldest queued packet of the same callback, if any
+                for i, queued in enumerate(self.packets):
+                    if queued[0] == key:
+                        index = i
+                        break
+
+            _, kind, data = self.packets[index]
+
+            del self.packets[index]
+
+            if kind == IPConnection.QUEUE_COALESCED_PACKET:
+                self.ipcon.take_coalesced_packet(data)
+
+        def stop(self):
+            with self.condition:
+                self.running = False
+
+                for _, kind, data in self.packets:
+                    if kind == IPConnection.QUEUE_COALESCED_PACKET:
+                        self.ipcon.take_coalesced_packet(data)
+
+                self.packets.clear()
+                self.condition.notify()
+
+        def loop(self):
+            while True:
+                with self.condition:
+                    while self.running and len(self.packets) == 0:
+                        self.condition.wait()
+
+                    if not self.running:
+                        break
+
+                    _, kind, data = self.packets.popleft()
+
+                if kind == IPConnection.QUEUE_COALESCED_PACKET:
+                    data = self.ipcon.take_coalesced_packet(data)
+
+                    if data == None:
+                        continue
+
+                callback = self.ipcon.callback
+
+                # don't dispatch callbacks when the receive thread isn't running
+                if callback != None and callback.packet_dispatch_allowed:
+                    self.ipcon.dispatch_packet(data)
+
+    class ResponseWaiter(object):
+        def __init__(self):
+            self.event = threading.Event()
+            self.response = None
+
+    class BatchCapture(Exception):
+        pass
+
+    class BatchCall(object):
+        def __init__(self, function, args):
+            self.function = function
+            self.args = args
+            self.request = None # (device, function_id, data, form, length_ret, form_ret)
+            self.response = None
+            self.replayed = False
+            self.result = None
+            self.error = None
+
+        def get(self):
+            """
+            Returns the result of the batched call or raises its exception.
+            """
+
+            if self.error != None:
+                raise self.error
+
+            return self.result
+
+    class Batch(object):
+        def __init__(self, ipcon):
+            self.ipcon = ipcon
+            self.calls = []
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, type_, value, traceback):
+            if type_ == None:
+                self.send()
+
+        def call(self, function, *args):
+            """
+            Adds a call of the device *function* with the given *args* to the
+            batch and returns an object whose get function returns the result
+            after the batch was sent.
+            """
+
+            call = IPConnection.BatchCall(function, args)
+
+            self.calls.append(call)
+
+            return call
+
+        def send(self):
+            """
+            Sends all calls added since the last send and waits for their
+            responses.
+            """
+
+            calls = self.calls
+            self.calls = []
+
+            self.ipcon.send_batch(calls)
+
     def __init__(self):
         """
         Creates an IP Connection object that can be used to enumerate the available
@@ -602,6 +1246,9 @@ class IPConnection(object):
         self.next_authentication_nonce = 0 # protected by authentication_lock
         self.devices = {}
         self.replace_lock = threading.Lock() # used to synchronize replacements in the devices dict
+        self.pending_requests = {} # (uid, function_id, sequence_number) -> list of ResponseWaiter, protected by pending_requests_lock
+        self.pending_requests_lock = threading.Lock()
+        self.batch_local = threading.local()
         self.registered_callbacks = {}
         self.socket = None # protected by socket_lock
         self.socket_id = 0 # protected by socket_lock
@@ -610,6 +1257,9 @@ class IPConnection(object):
         self.receive_flag = False
         self.receive_thread = None
         self.callback = None
+        self.callback_workers = None
+        self.coalesced_packets = {} # (uid, function_id) -> latest undelivered packet
+        self.coalesced_packets_lock = threading.Lock()
         self.disconnect_probe_flag = False
         self.disconnect_probe_queue = None
         self.disconnect_probe_thread = None
@@ -816,6 +1466,128 @@ class IPConnection(object):
         else:
             self.registered_callbacks[callback_id] = function
 
+    def set_callback_workers(self, worker_count, max_queue_size=0,
+                             overflow_policy=CALLBACK_OVERFLOW_DROP_OLDEST):
+        """
+        By default all device callbacks are called one after another from a
+        single callback thread. A slow callback function therefore delays the
+        callbacks of all other devices.
+
+        With a *worker_count* greater than 0 the device callbacks are called
+        from a pool of worker threads instead. All callbacks of a device are
+        handled by the same worker in the order they arrived in, callbacks of
+        different devices might be handled by different workers concurrently.
+        The enumerate, connected and disconnected callbacks are still called
+        from the callback thread. A *worker_count* of 0 (default) disables the
+        worker threads. Callbacks still queued for replaced workers are
+        discarded.
+
+        With a *max_queue_size* greater than 0 the number of callbacks queued
+        per worker is limited. If a worker queue is full then a queued callback
+        is dropped according to the *overflow_policy*:
+
+        - CALLBACK_OVERFLOW_DROP_OLDEST: Drop the oldest queued callback.
+        - CALLBACK_OVERFLOW_COALESCE: Drop the oldest queued callback of the
+          same device and callback ID, or the oldest queued callback if there
+          is none.
+
+        Dropping callbacks of a high-level callback stream makes the stream
+        go out-of-sync.
+        """
+
+        worker_count = int(worker_count)
+        max_queue_size = int(max_queue_size)
+
+        if worker_count < 0:
+            raise ValueError('Worker count cannot be negative')
+
+        if max_queue_size < 0:
+            raise ValueError('Maximum queue size cannot be negative')
+
+        if overflow_policy not in [IPConnection.CALLBACK_OVERFLOW_DROP_OLDEST, IPConnection.CALLBACK_OVERFLOW_COALESCE]:
+            raise ValueError('Invalid overflow policy {0}'.format(overflow_policy))
+
+        workers = None
+
+        if worker_count > 0:
+            workers = [IPConnection.CallbackWorker(self, i, max_queue_size, overflow_policy) for i in range(worker_count)]
+
+        old_workers = self.callback_workers
+        self.callback_workers = workers
+
+        if old_workers != None:
+            for worker in old_workers:
+                worker.stop()
+
+            # a worker might replace the workers from within a callback
+            for worker in old_workers:
+                if threading.current_thread() is not worker.thread:
+                    worker.thread.join()
+
+    def get_callback_queue_statistics(self):
+        """
+        Returns a list of (queue depth, dropped count) pairs, one pair per
+        callback worker. The queue depth is the number of callbacks currently
+        queued and the dropped count is the number of callbacks dropped since
+        the worker was created. Without callback workers the list contains a
+        single pair for the callback thread.
+        """
+
+        workers = self.callback_workers
+
+        if workers == None:
+            callback = self.callback
+
+            if callback == None:
+                return [(0, 0)]
+
+            return [(callback.queue.qsize(), 0)]
+
+        statistics = []
+
+        for worker in workers:
+            with worker.condition:
+                statistics.append((len(worker.packets), worker.dropped))
+
+        return statistics
+
+    def batch(self):
+        """
+        Returns a batch object to be used in a with statement. Calls of device
+        functions added to it by its call function are not sent one by one.
+        Instead, at the end of the with statement all requests are written
+        to the connection at once and their responses are collected while
+        they arrive. This avoids waiting for one round-trip per call::
+
+            with ipcon.batch() as batch:
+                temperature = batch.call(ptc.get_temperature)
+                voltage = batch.call(idai.get_voltage, 1)
+
+            print(temperature.get(), voltage.get())
+
+        Only functions that send a single request can be batched. This
+        excludes the high-level functions of streaming functions that send
+        the stream in more than one chunk, but their low-level functions can
+        be batched. For such a function the get function of its batched call
+        raises an error and no request is sent for it.
+        """
+
+        return IPConnection.Batch(self)
+
+    def send_requests(self, calls):
+        """
+        Sends the given list of (function, args) pairs as a batch and returns
+        the list of their results. If a call failed then its exception is
+        raised. See the batch function for details.
+        """
+
+        batch = self.batch()
+        batch_calls = [batch.call(function, *args) for function, args in calls]
+
+        batch.send()
+
+        return [batch_call.get() for batch_call in batch_calls]
+
     # internal
     def connect_unlocked(self, is_auto_reconnect):
         # NOTE: assumes that socket is None and socket_lock is locked
@@ -1009,14 +1781,26 @@ class IPConnection(object):
 
     # internal
     def receive_loop(self, socket_id):
-        if sys.hexversion < 0x03000000:
-            pending_data = ''
-        else:
-            pending_data = bytes()
+        # received data is read into a preallocated buffer. pending data is
+        # located between pending_start and pending_end. complete packets are
+        # handed to handle_response as memoryview slices of the buffer, so
+        # framing doesn't copy data. the incomplete tail of the pending data is
+        # moved to the front of the buffer only if there is not enough space
+        # left for the next recv_into call
+        pending_buffer = bytearray(IPConnection.RECEIVE_BUFFER_SIZE)
+        pending_view = memoryview(pending_buffer)
+        pending_start = 0
+        pending_end = 0
 
         while self.receive_flag:
+            if len(pending_buffer) - pending_end < IPConnection.RECEIVE_SIZE:
+                pending_length = pending_end - pending_start
+                pending_buffer[0:pending_length] = pending_view[pending_start:pending_end]
+                pending_start = 0
+                pending_end = pending_length
+
             try:
-                data = self.socket.recv(8192)
+                received = self.socket.recv_into(pending_view[pending_end:], IPConnection.RECEIVE_SIZE)
             except socket.timeout:
                 continue
             except socket.error:
@@ -1028,29 +1812,34 @@ class IPConnection(object):
                     self.handle_disconnect_by_peer(IPConnection.DISCONNECT_REASON_ERROR, socket_id, False)
                 break
 
-            if len(data) == 0:
+            if received == 0:
                 if self.receive_flag:
                     self.handle_disconnect_by_peer(IPConnection.DISCONNECT_REASON_SHUTDOWN, socket_id, False)
                 break
 
-            pending_data += data
+            pending_end += received
 
             while self.receive_flag:
-                if len(pending_data) < 8:
+                if pending_end - pending_start < 8:
                     # Wait for complete header
                     break
 
-                length = get_length_from_data(pending_data)
+                length = pending_buffer[pending_start + 4]
 
-                if len(pending_data) < length:
+                if pending_end - pending_start < length:
                     # Wait for complete packet
                     break
 
-                packet = pending_data[0:length]
-                pending_data = pending_data[length:]
+                packet = pending_view[pending_start:pending_start + length]
+                pending_start += length
 
                 self.handle_response(packet)
 
+            if pending_start == pending_end:
+                # all pending data got handled, start at the front again
+                pending_start = 0
+                pending_end = 0
+
     # internal
     def dispatch_meta(self, function_id, parameter, socket_id):
         if function_id == IPConnection.CALLBACK_CONNECTED:
@@ -1113,7 +1902,6 @@ class IPConnection(object):
         uid = get_uid_from_data(packet)
         length = get_length_from_data(packet)
         function_id = get_function_id_from_data(packet)
-        payload = packet[8:]
 
         if function_id == IPConnection.CALLBACK_ENUMERATE:
             cb = self.registered_callbacks.get(IPConnection.CALLBACK_ENUMERATE)
@@ -1126,7 +1914,7 @@ class IPConnection(object):
 
             uid, connected_uid, position, hardware_version, \
                 firmware_version, device_identifier, enumeration_type = \
-                unpack_payload(payload, '8s 8s c 3B 3B H B')
+                IPConnection.ENUMERATE_CALLBACK_CODEC.unpack(packet, 8)
 
             cb(uid, connected_uid, position, hardware_version,
                firmware_version, device_identifier, enumeration_type)
@@ -1143,82 +1931,8 @@ class IPConnection(object):
         except Error:
             return # silently ignoring callback for invalid device
 
-        if -function_id in device.high_level_callbacks:
-            hlcb = device.high_level_callbacks[-function_id] # [roles, options, data]
-            length, form = device.callback_formats[function_id] # FIXME: currently assuming that low-level callback has more than one element
-
-            if len(packet) != length:
-                return # silently ignoring callback with wrong length
-
-            llvalues = unpack_payload(payload, form)
-            has_data = False
-            data = None
-
-            if hlcb[1]['fixed_length'] != None:
-                length = hlcb[1]['fixed_length']
-            else:
-                length = llvalues[hlcb[0].index('stream_length')]
-
-            if not hlcb[1]['single_chunk']:
-                chunk_offset = llvalues[hlcb[0].index('stream_chunk_offset')]
-            else:
-                chunk_offset = 0
-
-            chunk_data = llvalues[hlcb[0].index('stream_chunk_data')]
-
-            if hlcb[2] == None: # no stream in-progress
-                if chunk_offset == 0: # stream starts
-                    hlcb[2] = chunk_data
-
-                    if len(hlcb[2]) >= length: # stream complete
-                        has_data = True
-                        data = hlcb[2][:length]
-                        hlcb[2] = None
-                else: # ignore tail of current stream, wait for next stream start
-                    pass
-            else: # stream in-progress
-                if chunk_offset != len(hlcb[2]): # stream out-of-sync
-                    has_data = True
-                    data = None
-                    hlcb[2] = None
-                else: # stream in-sync
-                    hlcb[2] += chunk_data
-
-                    if len(hlcb[2]) >= length: # stream complete
-                        has_data = True
-                        data = hlcb[2][:length]
-                        hlcb[2] = None
-
-            cb = device.registered_callbacks.get(-function_id)
-
-            if has_data and cb != None:
-                result = []
-
-                for role, llvalue in zip(hlcb[0], llvalues):
-                    if role == 'stream_chunk_data':
-                        result.append(data)
-                    elif role == None:
-                        result.append(llvalue)
-
-                cb(*tuple(result))
-
-        cb = device.registered_callbacks.get(function_id)
-
-        if cb != None:
-            length, form = device.callback_formats.get(function_id, (None, None))
-
-            if length == None:
-                return # silently ignore registered but unknown callback
-
-            if len(packet) != length:
-                return # silently ignoring callback with wrong length
-
-            if len(form) == 0:
-                cb()
-            elif ' ' not in form:
-                cb(unpack_payload(payload, form))
-            else:
-                cb(*unpack_payload(payload, form))
+        for cb, args in device.unpack_callback(function_id, packet):
+            cb(*args)
 
     # internal
     def callback_loop(self, callback):
@@ -1237,6 +1951,13 @@ class IPConnection(object):
                     # don't dispatch callbacks when the receive thread isn't running
                     if callback.packet_dispatch_allowed:
                         self.dispatch_packet(data)
+                elif kind == IPConnection.QUEUE_COALESCED_PACKET:
+                    # always take the packet to allow the next one to be queued
+                    packet = self.take_coalesced_packet(data)
+
+                    # don't dispatch callbacks when the receive thread isn't running
+                    if packet != None and callback.packet_dispatch_allowed:
+                        self.dispatch_packet(packet)
 
     # internal
     # NOTE: the disconnect probe thread is not allowed to hold the socket_lock at any
@@ -1275,10 +1996,12 @@ class IPConnection(object):
 
             try:
                 with self.socket_send_lock:
-                    while True:
+                    offset = 0
+
+                    # a batch can be too big to be sent at once
+                    while offset < len(packet):
                         try:
-                            self.socket.send(packet)
-                            break
+                            offset += self.socket.send(packet[offset:])
                         except socket.timeout:
                             continue
             except socket.error:
@@ -1289,58 +2012,210 @@ class IPConnection(object):
 
     # internal
     def send_request(self, device, function_id, data, form, length_ret, form_ret):
-        payload = pack_payload(data, form)
+        batch_call = getattr(self.batch_local, 'call', None)
+
+        if batch_call != None:
+            return self.handle_batch_request(batch_call, device, function_id, data, form, length_ret, form_ret)
+
+        payload = get_payload_codec(form).pack(data)
         header, response_expected, sequence_number = self.create_packet_header(device, 8 + len(payload), function_id)
         request = header + payload
 
         if response_expected:
-            with device.request_lock:
-                device.expected_response_function_id = function_id
-                device.expected_response_sequence_number = sequence_number
+            waiter = self.add_pending_request(device.uid, function_id, sequence_number)
 
-                try:
-                    self.send(request)
-
-                    while True:
-                        response = device.response_queue.get(True, self.timeout)
-
-                        if function_id == get_function_id_from_data(response) and \
-                           sequence_number == get_sequence_number_from_data(response):
-                            # ignore old responses that arrived after the timeout expired, but before setting
-                            # expected_response_function_id and expected_response_sequence_number back to None
-                            break
-                except queue.Empty:
-                    msg = 'Did not receive response for function {0} in time'.format(function_id)
-                    raise Error(Error.TIMEOUT, msg, suppress_context=True)
-                finally:
-                    device.expected_response_function_id = None
-                    device.expected_response_sequence_number = None
-
-            error_code = get_error_code_from_data(response)
-
-            if error_code == 0:
-                if length_ret == 0:
-                    length_ret = 8 # setter with response-expected enabled
-
-                if len(response) != length_ret:
-                    msg = 'Expected response of {0} byte for function ID {1}, got {2} byte instead' \
-                          .format(length_ret, function_id, len(response))
-                    raise Error(Error.WRONG_RESPONSE_LENGTH, msg)
-            elif error_code == 1:
-                msg = 'Got invalid parameter for function {0}'.format(function_id)
-                raise Error(Error.INVALID_PARAMETER, msg)
-            elif error_code == 2:
-                msg = 'Function {0} is not supported'.format(function_id)
-                raise Error(Error.NOT_SUPPORTED, msg)
-            else:
-                msg = 'Function {0} returned an unknown error'.format(function_id)
-                raise Error(Error.UNKNOWN_ERROR_CODE, msg)
+            try:
+                self.send(request)
 
-            if len(form_ret) > 0:
-                return unpack_payload(response[8:], form_ret)
+                response = self.wait_for_response(waiter, function_id)
+            finally:
+                self.remove_pending_request(device.uid, function_id, sequence_number, waiter)
+
+            return unpack_response(response, function_id, length_ret, form_ret)
         else:
             self.send(request)
 
+    # internal
+    # NOTE: sends one request per item of data_list, keeping up to window
+    #       requests in flight. the responses are collected in order and the
+    #       list of unpacked responses is returned. if a response reports an
+    #       error then this error is raised and no further requests are sent,
+    #       but up to window - 1 requests following the failed one might have
+    #       been sent already
+    def send_pipelined_requests(self, device, function_id, data_list, form, length_ret, form_ret, window):
+        codec = get_payload_codec(form)
+        pending = [] # [(sequence_number, waiter), ...]
+        results = []
+
+        if window < 1 or window > IPConnection.MAX_PIPELINE_WINDOW:
+            raise ValueError('Pipeline window {0} out of range'.format(window))
+
+        if getattr(self.batch_local, 'call', None) != None:
+            raise ValueError('Functions sending more than one request cannot be batched')
+
+        def collect_response():
+            sequence_number, waiter = pending[0]
+            response = self.wait_for_response(waiter, function_id)
+
+            self.remove_pending_request(device.uid, function_id, sequence_number, waiter)
+            pending.pop(0)
+            results.append(unpack_response(response, function_id, length_ret, form_ret))
+
+        try:
+            for data in data_list:
+                if len(pending) >= window:
+                    collect_response()
+
+                # don't send another request if an already received response
+                # reports an error
+                while len(pending) > 0 and pending[0][1].event.is_set():
+                    collect_response()
+
+                payload = codec.pack(data)
+                header, response_expected, sequence_number = self.create_packet_header(device, 8 + len(payload), function_id)
+
+                if response_expected:
+                    pending.append((sequence_number, self.add_pending_request(device.uid, function_id, sequence_number)))
+
+                self.send(header + payload)
+
+                if not response_expected:
+                    results.append(None)
+
+            while len(pending) > 0:
+                collect_response()
+        finally:
+            for sequence_number, waiter in pending:
+                self.remove_pending_request(device.uid, function_id, sequence_number, waiter)
+
+        return results
+
+    # internal
+    # NOTE: the calls are done twice. the first time send_request records
+    #       the request and aborts the call. after all requests are sent and
+    #       all responses arrived the calls are repeated and send_request
+    #       returns the recorded response. this way the generated functions
+    #       do the argument conversion and result wrapping as usual
+    def send_batch(self, calls):
+        packets = []
+        pending = [] # [(call, sequence_number, waiter), ...]
+
+        for call in calls:
+            device = getattr(call.function, '__self__', None)
+
+            if not isinstance(device, Device):
+                call.error = ValueError('Only device functions can be batched')
+                continue
+
+            # reject these before their first request is recorded and sent
+            if getattr(call.function, '__name__', None) in device.multi_request_functions:
+                call.error = ValueError('Functions sending more than one request cannot be batched')
+                continue
+
+            try:
+                device.check_validity()
+
+                self.batch_local.call = call
+
+                try:
+                    call.result = call.function(*call.args)
+                    continue # call didn't send a request
+                except IPConnection.BatchCapture:
+                    pass
+                finally:
+                    self.batch_local.call = None
+
+                device, function_id, data, form, length_ret, form_ret = call.request
+                payload = get_payload_codec(form).pack(data)
+                header, response_expected, sequence_number = self.create_packet_header(device, 8 + len(payload), function_id)
+            except Exception as e:
+                call.error = e
+                continue
+
+            if response_expected:
+                pending.append((call, sequence_number, self.add_pending_request(device.uid, function_id, sequence_number)))
+
+            packets.append(header + payload)
+
+        try:
+            if len(packets) > 0:
+                self.send(b''.join(packets))
+
+            deadline = time.time() + self.timeout
+
+            for call, sequence_number, waiter in pending:
+                if waiter.event.wait(max(deadline - time.time(), 0)):
+                    call.response = waiter.response
+                else:
+                    msg = 'Did not receive response for function {0} in time'.format(call.request[1])
+                    call.error = Error(Error.TIMEOUT, msg)
+        finally:
+            for call, sequence_number, waiter in pending:
+                self.remove_pending_request(call.request[0].uid, call.request[1], sequence_number, waiter)
+
+        for call in calls:
+            if call.request == None or call.error != None:
+                continue
+
+            self.batch_local.call = call
+
+            try:
+                call.result = call.function(*call.args)
+            except Exception as e:
+                call.error = e
+            finally:
+                self.batch_local.call = None
+
+    # internal
+    def handle_batch_request(self, call, device, function_id, data, form, length_ret, form_ret):
+        if call.request == None: # record
+            call.request = (device, function_id, data, form, length_ret, form_ret)
+
+            raise IPConnection.BatchCapture()
+
+        if call.replayed or call.request[0] is not device or call.request[1] != function_id:
+            raise ValueError('Functions sending more than one request cannot be batched')
+
+        call.replayed = True
+
+        if call.response == None: # response expected is disabled
+            return None
+
+        return unpack_response(call.response, function_id, length_ret, form_ret)
+
+    # internal
+    def add_pending_request(self, uid, function_id, sequence_number):
+        # sequence numbers wrap around after 15 requests, so there can be more
+        # than one pending request with the same key. the responses arrive in
+        # request order, so they are handed to the waiters in FIFO order
+        waiter = IPConnection.ResponseWaiter()
+
+        with self.pending_requests_lock:
+            self.pending_requests.setdefault((uid, function_id, sequence_number), []).append(waiter)
+
+        return waiter
+
+    # internal
+    def remove_pending_request(self, uid, function_id, sequence_number, waiter):
+        key = (uid, function_id, sequence_number)
+
+        with self.pending_requests_lock:
+            waiters = self.pending_requests.get(key)
+
+            if waiters != None and waiter in waiters:
+                waiters.remove(waiter)
+
+                if len(waiters) == 0:
+                    del self.pending_requests[key]
+
+    # internal
+    def wait_for_response(self, waiter, function_id):
+        if not waiter.event.wait(self.timeout):
+            msg = 'Did not receive response for function {0} in time'.format(function_id)
+            raise Error(Error.TIMEOUT, msg)
+
+        return waiter.response
+
     # internal
     def get_next_sequence_number(self):
         with self.sequence_number_lock:
@@ -1349,6 +2224,38 @@ class IPConnection(object):
             return sequence_number
 
     # internal
+    def queue_callback_packet(self, uid, function_id, packet, coalesce):
+        key = (uid, function_id)
+
+        if coalesce:
+            with self.coalesced_packets_lock:
+                queued = key in self.coalesced_packets
+                self.coalesced_packets[key] = packet
+
+            if queued:
+                return # replaced the undelivered packet, it's already queued
+
+            kind = IPConnection.QUEUE_COALESCED_PACKET
+            data = key
+        else:
+            kind = IPConnection.QUEUE_PACKET
+            data = packet
+
+        workers = self.callback_workers
+
+        if workers != None:
+            workers[uid % len(workers)].put(key, kind, data)
+        else:
+            self.callback.queue.put((kind, data))
+
+    # internal
+    def take_coalesced_packet(self, key):
+        with self.coalesced_packets_lock:
+            return self.coalesced_packets.pop(key, None)
+
+    # internal
+    # NOTE: packet is a memoryview of the receive buffer that gets overwritten
+    #       by the next receive call. it has to be copied before it is queued
     def handle_response(self, packet):
         self.disconnect_probe_flag = False
 
@@ -1357,7 +2264,7 @@ class IPConnection(object):
 
         if sequence_number == 0 and function_id == IPConnection.CALLBACK_ENUMERATE:
             if IPConnection.CALLBACK_ENUMERATE in self.registered_callbacks:
-                self.callback.queue.put((IPConnection.QUEUE_PACKET, packet))
+                self.callback.queue.put((IPConnection.QUEUE_PACKET, packet.tobytes()))
 
             return
 
@@ -1370,14 +2277,20 @@ class IPConnection(object):
         if sequence_number == 0:
             if function_id in device.registered_callbacks or \
                -function_id in device.high_level_callbacks:
-                self.callback.queue.put((IPConnection.QUEUE_PACKET, packet))
+                self.queue_callback_packet(uid, function_id, packet.tobytes(),
+                                           function_id in device.coalesced_callbacks)
 
             return
 
-        if device.expected_response_function_id == function_id and \
-           device.expected_response_sequence_number == sequence_number:
-            device.response_queue.put(packet)
-            return
+        with self.pending_requests_lock:
+            waiters = self.pending_requests.get((uid, function_id, sequence_number))
+
+            if waiters != None:
+                for waiter in waiters:
+                    if waiter.response == None:
+                        waiter.response = packet.tobytes()
+                        waiter.event.set()
+                        return
 
         # Response seems to be OK, but can't be handled
 
@@ -0,0 +1,731 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Tinkerforge GmbH
+#
+# Redistribution and use in source and binary forms of this file,
+# with or without modification, are permitted. See the Creative
+# Commons Zero (CC0 1.0) License for more details.
+
+# the async IP Connection requires Python >= 3.7, the blocking IP Connection
+# in ip_connection.py stays usable with Python 2
+
+import asyncio
+import struct
+import os
+import hmac
+import hashlib
+
+try:
+    from .ip_connection import Device, BrickDaemon, IPConnection, Error, get_payload_codec, unpack_response, \
+                               get_uid_from_data, get_function_id_from_data, get_sequence_number_from_data, \
+                               get_device_display_name
+except (ValueError, ImportError):
+    from ip_connection import Device, BrickDaemon, IPConnection, Error, get_payload_codec, unpack_response, \
+                              get_uid_from_data, get_function_id_from_data, get_sequence_number_from_data, \
+                              get_device_display_name
+
+class AsyncDevice(Device):
+    # internal
+    # NOTE: the arguments are passed on to the __init__ of the next class in
+    #       the MRO. for the async class of a device this is the __init__ of
+    #       its blocking class, which calls Device.__init__ and sets up the
+    #       device. afterwards the locks are replaced by their async variants
+    def __init__(self, uid, ipcon, *args):
+        super().__init__(uid, ipcon, *args)
+
+        self.device_identifier_lock = asyncio.Lock()
+        self.stream_lock = asyncio.Lock()
+
+    # internal
+    async def send_stream_in_chunks(self, low_level_function, function_id, chunk_requests, form, length_ret, form_ret):
+        if self.stream_write_window == 1 or not self.get_response_expected(function_id):
+            ret = None
+
+            for chunk_request in chunk_requests:
+                ret = await low_level_function(*chunk_request)
+
+            return ret
+
+        await self.check_validity()
+
+        return (await self.ipcon.send_pipelined_requests(self, function_id, chunk_requests, form, length_ret, form_ret,
+                                                         self.stream_write_window))[-1]
+
+    # internal
+    async def check_validity(self):
+        if self.replaced:
+            raise Error(Error.DEVICE_REPLACED, 'Device has been replaced')
+
+        if self.device_identifier < 0:
+            return
+
+        if self.device_identifier_check == Device.DEVICE_IDENTIFIER_CHECK_MATCH:
+            return
+
+        async with self.device_identifier_lock:
+            if self.device_identifier_check == Device.DEVICE_IDENTIFIER_CHECK_PENDING:
+                device_identifier = (await self.ipcon.send_request(self, 255, (), '', 33, '8s 8s c 3B 3B H'))[5] # <device>.get_identity
+
+                if device_identifier == self.device_identifier:
+                    self.device_identifier_check = Device.DEVICE_IDENTIFIER_CHECK_MATCH
+                else:
+                    self.device_identifier_check = Device.DEVICE_IDENTIFIER_CHECK_MISMATCH
+                    self.wrong_device_display_name = get_device_display_name(device_identifier)
+
+            if self.device_identifier_check == Device.DEVICE_IDENTIFIER_CHECK_MISMATCH:
+                raise Error(Error.WRONG_DEVICE_TYPE,
+                            'UID {0} belongs to a {1} instead of the expected {2}'
+                            .format(self.uid_string, self.wrong_device_display_name, self.device_display_name))
+
+class AsyncBrickDaemon(AsyncDevice, BrickDaemon):
+    def __init__(self, uid, ipcon):
+        AsyncDevice.__init__(self, uid, ipcon)
+
+    async def get_authentication_nonce(self):
+        return await self.ipcon.send_request(self, BrickDaemon.FUNCTION_GET_AUTHENTICATION_NONCE, (), '', 12, '4B')
+
+    async def authenticate(self, client_nonce, digest):
+        await self.ipcon.send_request(self, BrickDaemon.FUNCTION_AUTHENTICATE, (client_nonce, digest), '4B 20B', 0, '')
+
+class AsyncIPConnection(object):
+    CALLBACK_ENUMERATE = IPConnection.CALLBACK_ENUMERATE
+    CALLBACK_CONNECTED = IPConnection.CALLBACK_CONNECTED
+    CALLBACK_DISCONNECTED = IPConnection.CALLBACK_DISCONNECTED
+
+    # enumeration_type parameter to the enumerate callback
+    ENUMERATION_TYPE_AVAILABLE = IPConnection.ENUMERATION_TYPE_AVAILABLE
+    ENUMERATION_TYPE_CONNECTED = IPConnection.ENUMERATION_TYPE_CONNECTED
+    ENUMERATION_TYPE_DISCONNECTED = IPConnection.ENUMERATION_TYPE_DISCONNECTED
+
+    # connect_reason parameter to the connected callback
+    CONNECT_REASON_REQUEST = IPConnection.CONNECT_REASON_REQUEST
+    CONNECT_REASON_AUTO_RECONNECT = IPConnection.CONNECT_REASON_AUTO_RECONNECT
+
+    # disconnect_reason parameter to the disconnected callback
+    DISCONNECT_REASON_REQUEST = IPConnection.DISCONNECT_REASON_REQUEST
+    DISCONNECT_REASON_ERROR = IPConnection.DISCONNECT_REASON_ERROR
+    DISCONNECT_REASON_SHUTDOWN = IPConnection.DISCONNECT_REASON_SHUTDOWN
+
+    # returned by get_connection_state
+    CONNECTION_STATE_DISCONNECTED = IPConnection.CONNECTION_STATE_DISCONNECTED
+    CONNECTION_STATE_CONNECTED = IPConnection.CONNECTION_STATE_CONNECTED
+    CONNECTION_STATE_PENDING = IPConnection.CONNECTION_STATE_PENDING
+
+    def __init__(self):
+        """
+        Creates an async IP Connection object that can be used to enumerate the
+        available devices. It is also required for the constructor of the async
+        Bricks and Bricklets.
+
+        All I/O is done by tasks of the running asyncio event loop, there are no
+        threads involved. Responses are matched to requests by UID, function ID
+        and sequence number, so any number of requests can be outstanding at
+        the same time, also for the same device.
+
+        The async IP Connection and its devices have to be created while the
+        asyncio event loop is running.
+        """
+
+        self.host = None
+        self.port = None
+        self.timeout = 2.5
+        self.auto_reconnect = True
+        self.auto_reconnect_allowed = False
+        self.auto_reconnect_pending = False
+        self.next_sequence_number = 0
+        self.next_authentication_nonce = 0
+        self.authentication_lock = None # created on first use, needs the event loop
+        self.devices = {}
+        self.registered_callbacks = {}
+        self.pending_requests = {} # (uid, function_id, sequence_number) -> list of futures
+        self.coalesced_packets = {} # (uid, function_id) -> latest undelivered packet
+        self.reader = None
+        self.writer = None
+        self.socket_id = 0
+        self.receive_task = None
+        self.callback_queue = None
+        self.callback_task = None
+        self.disconnect_probe_flag = False
+        self.disconnect_probe_task = None
+        self.brickd = AsyncBrickDaemon('2', self)
+
+    async def connect(self, host, port):
+        """
+        Creates a TCP/IP connection to the given *host* and *port*. The host
+        and port can point to a Brick Daemon or to a WIFI/Ethernet Extension.
+
+        Devices can only be controlled when the connection was established
+        successfully.
+
+        Returns when the connection is established and raises an exception if
+        there is no Brick Daemon or WIFI/Ethernet Extension listening at the
+        given host and port.
+        """
+
+        if self.writer is not None:
+            raise Error(Error.ALREADY_CONNECTED,
+                        'Already connected to {0}:{1}'.format(self.host, self.port))
+
+        self.host = host
+        self.port = port
+
+        await self.connect_unlocked(False)
+
+    async def disconnect(self):
+        """
+        Disconnects the TCP/IP connection from the Brick Daemon or the
+        WIFI/Ethernet Extension.
+        """
+
+        self.auto_reconnect_allowed = False
+
+        if self.auto_reconnect_pending:
+            # abort potentially pending auto reconnect
+            self.auto_reconnect_pending = False
+        else:
+            if self.writer is None:
+                raise Error(Error.NOT_CONNECTED, 'Not connected')
+
+            await self.disconnect_unlocked()
+
+        callback_queue = self.callback_queue
+        callback_task = self.callback_task
+        self.callback_queue = None
+        self.callback_task = None
+
+        callback_queue.put_nowait((IPConnection.QUEUE_META,
+                                   (IPConnection.CALLBACK_DISCONNECTED,
+                                    IPConnection.DISCONNECT_REASON_REQUEST, None)))
+        callback_queue.put_nowait((IPConnection.QUEUE_EXIT, None))
+
+        if asyncio.current_task() is not callback_task:
+            await callback_task
+
+    async def authenticate(self, secret):
+        """
+        Performs an authentication handshake with the connected Brick Daemon or
+        WIFI/Ethernet Extension. If the handshake succeeds the connection switches
+        from non-authenticated to authenticated state and communication can
+        continue as normal. If the handshake fails then the connection gets closed.
+        Authentication can fail if the wrong secret was used or if authentication
+        is not enabled at all on the Brick Daemon or the WIFI/Ethernet Extension.
+
+        For more information about authentication see
+        https://www.tinkerforge.com/en/doc/Tutorials/Tutorial_Authentication/Tutorial.html
+        """
+
+        try:
+            secret_bytes = secret.encode('ascii')
+        except UnicodeEncodeError:
+            raise Error(Error.NON_ASCII_CHAR_IN_SECRET, 'Authentication secret contains non-ASCII characters')
+
+        if self.authentication_lock is None:
+            self.authentication_lock = asyncio.Lock()
+
+        async with self.authentication_lock:
+            if self.next_authentication_nonce == 0:
+                self.next_authentication_nonce = struct.unpack('<I', os.urandom(4))[0]
+
+            server_nonce = await self.brickd.get_authentication_nonce()
+            client_nonce = struct.unpack('<4B', struct.pack('<I', self.next_authentication_nonce))
+            self.next_authentication_nonce = (self.next_authentication_nonce + 1) % (1 << 32)
+
+            h = hmac.new(secret_bytes, digestmod=hashlib.sha1)
+
+            h.update(struct.pack('<4B', *server_nonce))
+            h.update(struct.pack('<4B', *client_nonce))
+
+            digest = struct.unpack('<20B', h.digest())
+            h = None
+
+            await self.brickd.authenticate(client_nonce, digest)
+
+    def get_connection_state(self):
+        """
+        Can return the following states:
+
+        - CONNECTION_STATE_DISCONNECTED: No connection is established.
+        - CONNECTION_STATE_CONNECTED: A connection to the Brick Daemon or
+          the WIFI/Ethernet Extension is established.
+        - CONNECTION_STATE_PENDING: IP Connection is currently trying to
+          connect.
+        """
+
+        if self.writer is not None:
+            return IPConnection.CONNECTION_STATE_CONNECTED
+        elif self.auto_reconnect_pending:
+            return IPConnection.CONNECTION_STATE_PENDING
+        else:
+            return IPConnection.CONNECTION_STATE_DISCONNECTED
+
+    def set_auto_reconnect(self, auto_reconnect):
+        """
+        Enables or disables auto-reconnect. If auto-reconnect is enabled,
+        the IP Connection will try to reconnect to the previously given
+        host and port, if the connection is lost.
+
+        Default value is *True*.
+        """
+
+        self.auto_reconnect = bool(auto_reconnect)
+
+        if not self.auto_reconnect:
+            # abort potentially pending auto reconnect
+            self.auto_reconnect_allowed = False
+
+    def get_auto_reconnect(self):
+        """
+        Returns *true* if auto-reconnect is enabled, *false* otherwise.
+        """
+
+        return self.auto_reconnect
+
+    def set_timeout(self, timeout):
+        """
+        Sets the timeout in seconds for getters and for setters for which the
+        response expected flag is activated.
+
+        Default timeout is 2.5.
+        """
+
+        timeout = float(timeout)
+
+        if timeout < 0:
+            raise ValueError('Timeout cannot be negative')
+
+        self.timeout = timeout
+
+    def get_timeout(self):
+        """
+        Returns the timeout as set by set_timeout.
+        """
+
+        return self.timeout
+
+    async def enumerate(self):
+        """
+        Broadcasts an enumerate request. All devices will respond with an
+        enumerate callback.
+        """
+
+        request, _, _ = self.create_packet_header(None, 8, IPConnection.FUNCTION_ENUMERATE)
+
+        await self.send(request)
+
+    def register_callback(self, callback_id, function):
+        """
+        Registers the given *function* with the given *callback_id*. The
+        *function* can be a normal function or a coroutine function. The
+        callbacks are called one after another in the order they arrived in.
+        """
+        if function is None:
+            self.registered_callbacks.pop(callback_id, None)
+        else:
+            self.registered_callbacks[callback_id] = function
+
+    # internal
+    async def connect_unlocked(self, is_auto_reconnect):
+        # NOTE: assumes that writer is None
+
+        # create callback task and queue
+        if self.callback_task is None:
+            self.callback_queue = asyncio.Queue()
+            self.callback_task = asyncio.ensure_future(self.callback_loop(self.callback_queue))
+
+        # create and connect socket
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), 5)
+        except:
+            # end callback task
+            if not is_auto_reconnect:
+                self.callback_queue.put_nowait((IPConnection.QUEUE_EXIT, None))
+                self.callback_queue = None
+                self.callback_task = None
+
+            raise
+
+        self.reader = reader
+        self.writer = writer
+        self.socket_id += 1
+
+        # create disconnect probe and receive task
+        self.disconnect_probe_flag = True
+        self.disconnect_probe_task = asyncio.ensure_future(self.disconnect_probe_loop(self.socket_id))
+        self.receive_task = asyncio.ensure_future(self.receive_loop(self.socket_id))
+
+        self.auto_reconnect_allowed = False
+        self.auto_reconnect_pending = False
+
+        if is_auto_reconnect:
+            connect_reason = IPConnection.CONNECT_REASON_AUTO_RECONNECT
+        else:
+            connect_reason = IPConnection.CONNECT_REASON_REQUEST
+
+        self.callback_queue.put_nowait((IPConnection.QUEUE_META,
+                                        (IPConnection.CALLBACK_CONNECTED,
+                                         connect_reason, None)))
+
+    # internal
+    async def disconnect_unlocked(self):
+        # NOTE: assumes that writer is not None
+        current_task = asyncio.current_task()
+
+        for task in [self.disconnect_probe_task, self.receive_task]:
+            if task is not current_task:
+                task.cancel()
+
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        self.disconnect_probe_task = None
+        self.receive_task = None
+
+        writer = self.writer
+        self.reader = None
+        self.writer = None
+
+        writer.close()
+
+        # there will be no response for pending requests anymore
+        for futures in self.pending_requests.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(Error(Error.NOT_CONNECTED, 'Not connected'))
+
+        self.pending_requests = {}
+
+    # internal
+    def add_device(self, device):
+        replaced_device = self.devices.get(device.uid)
+
+        if replaced_device != None:
+            replaced_device.replaced = True
+
+        self.devices[device.uid] = device # FIXME: maybe use a weakref here
+
+    # internal
+    async def receive_loop(self, socket_id):
+        pending_data = bytearray()
+
+        while True:
+            try:
+                data = await self.reader.read(IPConnection.RECEIVE_SIZE)
+            except (OSError, asyncio.IncompleteReadError):
+                self.handle_disconnect_by_peer(IPConnection.DISCONNECT_REASON_ERROR, socket_id)
+                break
+
+            if len(data) == 0:
+                self.handle_disconnect_by_peer(IPConnection.DISCONNECT_REASON_SHUTDOWN, socket_id)
+                break
+
+            pending_data += data
+            pending_start = 0
+
+            while len(pending_data) - pending_start >= 8:
+                length = pending_data[pending_start + 4]
+
+                if len(pending_data) - pending_start < length:
+                    # Wait for complete packet
+                    break
+
+                self.handle_response(bytes(pending_data[pending_start:pending_start + length]))
+                pending_start += length
+
+            del pending_data[:pending_start]
+
+    # internal
+    async def dispatch_meta(self, function_id, parameter, socket_id):
+        if function_id == IPConnection.CALLBACK_CONNECTED:
+            await self.call_callback(self.registered_callbacks.get(IPConnection.CALLBACK_CONNECTED), (parameter,))
+        elif function_id == IPConnection.CALLBACK_DISCONNECTED:
+            if parameter != IPConnection.DISCONNECT_REASON_REQUEST:
+                # don't close the connection if it got disconnected or
+                # reconnected in the meantime
+                if self.writer is not None and self.socket_id == socket_id:
+                    await self.disconnect_unlocked()
+
+            await self.call_callback(self.registered_callbacks.get(IPConnection.CALLBACK_DISCONNECTED), (parameter,))
+
+            if parameter != IPConnection.DISCONNECT_REASON_REQUEST and \
+               self.auto_reconnect and self.auto_reconnect_allowed:
+                self.auto_reconnect_pending = True
+
+                # no callbacks to deliver while there is no connection, so
+                # the callback task can wait here until reconnected
+                while self.auto_reconnect_allowed and self.writer is None:
+                    try:
+                        await self.connect_unlocked(True)
+                    except Exception:
+                        await asyncio.sleep(0.1)
+
+                self.auto_reconnect_pending = False
+
+    # internal
+    async def dispatch_packet(self, packet):
+        uid = get_uid_from_data(packet)
+        function_id = get_function_id_from_data(packet)
+
+        if function_id == IPConnection.CALLBACK_ENUMERATE:
+            cb = self.registered_callbacks.get(IPConnection.CALLBACK_ENUMERATE)
+
+            if cb == None:
+                return
+
+            if len(packet) != 34:
+                return # silently ignoring callback with wrong length
+
+            await self.call_callback(cb, IPConnection.ENUMERATE_CALLBACK_CODEC.unpack(packet, 8))
+
+            return
+
+        device = self.devices.get(uid)
+
+        if device == None:
+            return
+
+        try:
+            await device.check_validity()
+        except Error:
+            return # silently ignoring callback for invalid device
+
+        for cb, args in device.unpack_callback(function_id, packet):
+            await self.call_callback(cb, args)
+
+    # internal
+    async def call_callback(self, cb, args):
+        if cb == None:
+            return
+
+        ret = cb(*args)
+
+        if asyncio.iscoroutine(ret):
+            await ret
+
+    # internal
+    async def callback_loop(self, callback_queue):
+        while True:
+            kind, data = await callback_queue.get()
+
+            if kind == IPConnection.QUEUE_EXIT:
+                break
+            elif kind == IPConnection.QUEUE_META:
+                await self.dispatch_meta(*data)
+            elif kind == IPConnection.QUEUE_PACKET:
+                # don't dispatch callbacks when there is no connection
+                if self.writer is not None:
+                    await self.dispatch_packet(data)
+            elif kind == IPConnection.QUEUE_COALESCED_PACKET:
+                # always take the packet to allow the next one to be queued
+                packet = self.coalesced_packets.pop(data, None)
+
+                # don't dispatch callbacks when there is no connection
+                if packet is not None and self.writer is not None:
+                    await self.dispatch_packet(packet)
+
+    # internal
+    async def disconnect_probe_loop(self, socket_id):
+        request, _, _ = self.create_packet_header(None, 8, IPConnection.FUNCTION_DISCONNECT_PROBE)
+
+        while True:
+            await asyncio.sleep(IPConnection.DISCONNECT_PROBE_INTERVAL)
+
+            if self.disconnect_probe_flag:
+                try:
+                    self.writer.write(request)
+                    await self.writer.drain()
+                except OSError:
+                    self.handle_disconnect_by_peer(IPConnection.DISCONNECT_REASON_ERROR, socket_id)
+                    break
+            else:
+                self.disconnect_probe_flag = True
+
+    # internal
+    async def send(self, packet):
+        if self.writer is None:
+            raise Error(Error.NOT_CONNECTED, 'Not connected')
+
+        try:
+            self.writer.write(packet)
+            await self.writer.drain()
+        except OSError:
+            self.handle_disconnect_by_peer(IPConnection.DISCONNECT_REASON_ERROR, self.socket_id)
+            raise Error(Error.NOT_CONNECTED, 'Not connected', suppress_context=True)
+
+        self.disconnect_probe_flag = False
+
+    # internal
+    async def send_request(self, device, function_id, data, form, length_ret, form_ret):
+        payload = get_payload_codec(form).pack(data)
+        header, response_expected, sequence_number = self.create_packet_header(device, 8 + len(payload), function_id)
+        request = header + payload
+
+        if not response_expected:
+            await self.send(request)
+            return None
+
+        future = self.add_pending_request(device.uid, function_id, sequence_number)
+
+        try:
+            await self.send(request)
+
+            response = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            msg = 'Did not receive response for function {0} in time'.format(function_id)
+            raise Error(Error.TIMEOUT, msg, suppress_context=True)
+        finally:
+            self.remove_pending_request(device.uid, function_id, sequence_number, future)
+
+        return unpack_response(response, function_id, length_ret, form_ret)
+
+    # internal
+    # NOTE: sends one request per item of data_list, keeping up to window
+    #       requests in flight. the list of unpacked responses is returned in
+    #       request order. if a response reports an error then this error is
+    #       raised and no further requests are sent, but up to window - 1
+    #       requests following the failed one might have been sent already
+    async def send_pipelined_requests(self, device, function_id, data_list, form, length_ret, form_ret, window):
+        codec = get_payload_codec(form)
+        pending = [] # [(sequence_number, future), ...]
+        results = []
+
+        if window < 1 or window > IPConnection.MAX_PIPELINE_WINDOW:
+            raise ValueError('Pipeline window {0} out of range'.format(window))
+
+        async def collect_response():
+            sequence_number, future = pending[0]
+
+            try:
+                response = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                msg = 'Did not receive response for function {0} in time'.format(function_id)
+                raise Error(Error.TIMEOUT, msg, suppress_context=True)
+
+            self.remove_pending_request(device.uid, function_id, sequence_number, future)
+            pending.pop(0)
+            results.append(unpack_response(response, function_id, length_ret, form_ret))
+
+        try:
+            for data in data_list:
+                if len(pending) >= window:
+                    await collect_response()
+
+                # don't send another request if an already received response
+                # reports an error
+                while len(pending) > 0 and pending[0][1].done():
+                    await collect_response()
+
+                payload = codec.pack(data)
+                header, response_expected, sequence_number = self.create_packet_header(device, 8 + len(payload), function_id)
+
+                if response_expected:
+                    pending.append((sequence_number, self.add_pending_request(device.uid, function_id, sequence_number)))
+
+                await self.send(header + payload)
+
+                if not response_expected:
+                    results.append(None)
+
+            while len(pending) > 0:
+                await collect_response()
+        finally:
+            for sequence_number, future in pending:
+                self.remove_pending_request(device.uid, function_id, sequence_number, future)
+
+        return results
+
+    # internal
+    def add_pending_request(self, uid, function_id, sequence_number):
+        # sequence numbers wrap around after 15 requests, so there can be more
+        # than one pending request with the same key. the responses arrive in
+        # request order, so they are assigned to the futures in FIFO order
+        future = asyncio.get_running_loop().create_future()
+
+        self.pending_requests.setdefault((uid, function_id, sequence_number), []).append(future)
+
+        return future
+
+    # internal
+    def remove_pending_request(self, uid, function_id, sequence_number, future):
+        key = (uid, function_id, sequence_number)
+        futures = self.pending_requests.get(key)
+
+        if futures != None and future in futures:
+            futures.remove(future)
+
+            if len(futures) == 0:
+                del self.pending_requests[key]
+
+    # internal
+    def handle_response(self, packet):
+        self.disconnect_probe_flag = False
+
+        function_id = get_function_id_from_data(packet)
+        sequence_number = get_sequence_number_from_data(packet)
+
+        if sequence_number == 0 and function_id == IPConnection.CALLBACK_ENUMERATE:
+            if IPConnection.CALLBACK_ENUMERATE in self.registered_callbacks:
+                self.callback_queue.put_nowait((IPConnection.QUEUE_PACKET, packet))
+
+            return
+
+        uid = get_uid_from_data(packet)
+
+        if sequence_number == 0:
+            device = self.devices.get(uid)
+
+            if device == None:
+                return # Response from an unknown device, ignoring it
+
+            if function_id in device.registered_callbacks or \
+               -function_id in device.high_level_callbacks:
+                if function_id in device.coalesced_callbacks:
+                    key = (uid, function_id)
+                    queued = key in self.coalesced_packets
+                    self.coalesced_packets[key] = packet
+
+                    if not queued:
+                        self.callback_queue.put_nowait((IPConnection.QUEUE_COALESCED_PACKET, key))
+                else:
+                    self.callback_queue.put_nowait((IPConnection.QUEUE_PACKET, packet))
+
+            return
+
+        futures = self.pending_requests.get((uid, function_id, sequence_number))
+
+        if futures == None:
+            return # Response seems to be OK, but can't be handled
+
+        for future in futures:
+            if not future.done():
+                future.set_result(packet)
+                return
+
+    # internal
+    def handle_disconnect_by_peer(self, disconnect_reason, socket_id):
+        self.auto_reconnect_allowed = True
+
+        if self.callback_queue is not None:
+            self.callback_queue.put_nowait((IPConnection.QUEUE_META,
+                                            (IPConnection.CALLBACK_DISCONNECTED,
+                                             disconnect_reason, socket_id)))
+
+    # internal
+    def create_packet_header(self, device, length, function_id):
+        uid = IPConnection.BROADCAST_UID
+        sequence_number = self.next_sequence_number + 1
+        self.next_sequence_number = sequence_number % 15
+        r_bit = 0
+
+        if device is not None:
+            uid = device.uid
+
+            if device.get_response_expected(function_id):
+                r_bit = 1
+
+        sequence_number_and_options = (sequence_number << 4) | (r_bit << 3)
+
+        return (struct.pack('<IBBBB', uid, length, function_id,
+                            sequence_number_and_options, 0),
+                bool(r_bit),
+                sequence_number)
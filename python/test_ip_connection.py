@@ -2,7 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import sys
-from ip_connection import create_char, create_char_list, create_string, pack_payload, unpack_payload
+import array
+import random
+import socket
+import struct
+import threading
+import time
+from ip_connection import create_char, create_char_list, create_string, pack_payload, unpack_payload, get_payload_codec, get_array_typecode, get_numpy_dtype, StreamBuffer, IPConnection, Device, Error
+
+try:
+    import queue # Python 3
+except ImportError:
+    import Queue as queue # Python 2
 
 def b(value):
     if sys.hexversion < 0x03000000:
@@ -159,3 +170,696 @@ assert(unpack_payload(b('abc\xff\0'), '5s') == 'abc\xff')
 assert(unpack_payload(b('a'), 'c') == 'a')
 assert(unpack_payload(b('abc'), '3c') == ('a', 'b', 'c'))
 assert(unpack_payload(b('a\xff\0'), '3c') == ('a', '\xff', '\0'))
+assert(unpack_payload(b('\x01\x02\x03'), 'B H') == [1, 0x0302])
+assert(unpack_payload(b('\x05\x01'), '10!') == (True, False, True, False, False, False, False, False, True, False))
+assert(unpack_payload(b('\x01abc\0'), '! 4s') == [True, 'abc'])
+
+#
+# payload codec
+#
+
+assert(get_payload_codec('B H') is get_payload_codec('B H'))
+assert(get_payload_codec(get_payload_codec('B H')) is get_payload_codec('B H'))
+assert(get_payload_codec('B H').size == 3)
+assert(get_payload_codec('10!').size == 2)
+assert(get_payload_codec('').field_count == 0)
+assert(get_payload_codec('B H').unpack(b('\xff\x01\x02\x03'), 1) == [1, 0x0302])
+assert(pack_payload((True, 'abc'), '! 4s') == b('\x01abc\0'))
+assert(pack_payload(([True, False, True, False, False, False, False, False, True, False],), '10!') == b('\x05\x01'))
+
+try:
+    pack_payload(([True, False],), '10!')
+    assert(False)
+except ValueError:
+    pass
+
+assert(pack_payload(([1, 2], ['a', 'b'], 3), '2B 2c B') == b('\x01\x02ab\x03'))
+assert(pack_payload((iter([1, 2]), 'ab', 3), '2B 2c B') == b('\x01\x02ab\x03'))
+
+for data in [([1, 2, 3], ['a'], 3), ([1, 2], ['a', 'b', 'c'], 3)]:
+    try:
+        pack_payload(data, '2B 2c B')
+        assert(False)
+    except ValueError as e:
+        assert('payload field' in str(e))
+
+#
+# stream buffer
+#
+
+assert(get_array_typecode('31H') == 'H')
+assert(get_array_typecode('60c') == 'c')
+assert(get_array_typecode('464!') == None)
+
+stream = StreamBuffer(5, None)
+assert(not stream.extend((1, 2, 3)))
+assert(stream.extend((4, 5, 0)))
+assert(stream.get_data() == (1, 2, 3, 4, 5))
+
+stream = StreamBuffer(5, 'H')
+assert(not stream.extend((1, 2, 3)))
+assert(stream.extend((4, 5, 0)))
+assert(stream.get_data() == array.array('H', [1, 2, 3, 4, 5]))
+
+stream = StreamBuffer(3, 'c')
+assert(stream.extend(('a', 'b', 'c', '\0')))
+assert(stream.get_data() == b('abc'))
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy != None:
+    stream = StreamBuffer(5, None, get_numpy_dtype('30H'))
+    assert(not stream.extend((1, 2, 3)))
+    assert(stream.extend(numpy.array([4, 5, 0], numpy.uint16)))
+    assert(stream.get_data().dtype == numpy.uint16)
+    assert(list(stream.get_data()) == [1, 2, 3, 4, 5])
+    assert(get_numpy_dtype('60c') == None)
+
+# stream write window
+
+device = Device('a', IPConnection(), 0, 'Test Device')
+assert(device.get_stream_write_window() == 1)
+device.set_stream_write_window(15)
+assert(device.get_stream_write_window() == 15)
+
+for window in [0, 16]:
+    try:
+        device.set_stream_write_window(window)
+        assert(False)
+    except ValueError:
+        pass
+
+# callback workers
+
+ipcon = IPConnection()
+assert(ipcon.get_callback_queue_statistics() == [(0, 0)])
+ipcon.set_callback_workers(3, 10, IPConnection.CALLBACK_OVERFLOW_COALESCE)
+assert(ipcon.get_callback_queue_statistics() == [(0, 0), (0, 0), (0, 0)])
+ipcon.set_callback_workers(0)
+assert(ipcon.get_callback_queue_statistics() == [(0, 0)])
+
+for args in [(-1,), (1, -1), (1, 0, 2)]:
+    try:
+        ipcon.set_callback_workers(*args)
+        assert(False)
+    except ValueError:
+        pass
+
+# callback coalescing
+
+device = Device('a', IPConnection(), 0, 'Test Device')
+device.callback_formats[5] = (13, 'B i')
+device.callback_formats[6] = (72, 'H H 30H')
+device.high_level_callbacks[-6] = [(None, 'stream_length', 'stream_chunk_offset', 'stream_chunk_data'), {'fixed_length': None, 'single_chunk': False}, None]
+
+assert(not device.get_callback_coalescing(5))
+device.set_callback_coalescing(5, True)
+assert(device.get_callback_coalescing(5))
+device.set_callback_coalescing(5, False)
+assert(not device.get_callback_coalescing(5))
+
+for callback_id in [6, 7]:
+    try:
+        device.set_callback_coalescing(callback_id, True)
+        assert(False)
+    except ValueError:
+        pass
+
+#
+# fake brickd
+#
+
+def make_packet(uid, function_id, sequence_number, payload, error_code=0):
+    return struct.pack('<IBBBB', uid, 8 + len(payload), function_id, sequence_number << 4, error_code << 6) + payload
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+
+    while not condition():
+        if time.time() > deadline:
+            return False
+
+        time.sleep(0.01)
+
+    return True
+
+# accepts a single connection and answers every request with response
+# expected. the handler gets (uid, function_id, payload) and returns the
+# response payload, or None to respond with an invalid parameter error. the
+# responses are sent response_delay seconds after the request was received
+class FakeBrickd(object):
+    def __init__(self, handler=None, response_delay=0):
+        self.handler = handler if handler != None else lambda uid, function_id, payload: payload
+        self.response_delay = response_delay
+        self.requests = [] # [(uid, function_id, payload)], protected by lock
+        self.in_flight = 0 # protected by lock
+        self.max_in_flight = 0 # protected by lock
+        self.lock = threading.Lock()
+        self.responses = queue.Queue()
+        self.held_data = None # protected by lock
+        self.connection = None
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+
+        for target in [self.receive_loop, self.respond_loop]:
+            thread = threading.Thread(target=target)
+            thread.daemon = True
+            thread.start()
+
+    def receive_loop(self):
+        self.connection, _ = self.server.accept()
+        pending = b''
+
+        while True:
+            try:
+                data = self.connection.recv(4096)
+            except socket.error:
+                break
+
+            if len(data) == 0:
+                break
+
+            pending += data
+
+            while len(pending) >= 8 and len(pending) >= struct.unpack_from('<B', pending, 4)[0]:
+                uid, length, function_id, options, _ = struct.unpack_from('<IBBBB', pending)
+                payload = pending[8:length]
+                pending = pending[length:]
+
+                if uid == 0:
+                    continue # disconnect probe
+
+                with self.lock:
+                    self.requests.append((uid, function_id, payload))
+
+                    if options & 0x08 != 0:
+                        self.in_flight += 1
+                        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+                if options & 0x08 != 0:
+                    response = self.handler(uid, function_id, payload)
+
+                    if response == None:
+                        packet = make_packet(uid, function_id, options >> 4, b'', 1)
+                    else:
+                        packet = make_packet(uid, function_id, options >> 4, response)
+
+                    self.responses.put((time.time() + self.response_delay, packet))
+
+    def respond_loop(self):
+        while True:
+            send_time, packet = self.responses.get()
+            time.sleep(max(send_time - time.time(), 0))
+
+            with self.lock:
+                self.in_flight -= 1
+
+            try:
+                self.send(packet)
+            except socket.error:
+                pass # the IP Connection might have disconnected already
+
+    def send(self, data):
+        with self.lock:
+            if self.held_data != None:
+                self.held_data.append(data)
+                return
+
+        self.connection.sendall(data)
+
+    # holds back all data until release sends it in one piece
+    def hold(self):
+        with self.lock:
+            self.held_data = []
+
+    def release(self):
+        with self.lock:
+            held_data = self.held_data
+            self.held_data = None
+
+        self.send(b''.join(held_data))
+
+    def get_requests(self):
+        with self.lock:
+            return list(self.requests)
+
+    def close(self):
+        self.server.close()
+
+        if self.connection != None:
+            self.connection.close()
+
+def connect_fake_brickd(brickd):
+    ipcon = IPConnection()
+    ipcon.set_auto_reconnect(False)
+    ipcon.connect('127.0.0.1', brickd.port)
+    assert(wait_until(lambda: brickd.connection != None))
+
+    device = Device('a', ipcon, -1, 'Test Device') # a negative device identifier skips the identity check
+    device.response_expected[1] = Device.RESPONSE_EXPECTED_ALWAYS_TRUE
+    ipcon.add_device(device)
+
+    return ipcon, device
+
+# receive buffer
+
+brickd = FakeBrickd()
+ipcon, device = connect_fake_brickd(brickd)
+values = []
+
+device.callback_formats[5] = (12, 'I')
+device.registered_callbacks[5] = values.append
+
+assert(ipcon.send_request(device, 1, (1234,), 'I', 12, 'I') == 1234)
+
+# much more data than fits into the receive buffer, sent in pieces that split
+# the packets at varying positions
+data = b''.join([make_packet(device.uid, 5, 0, struct.pack('<I', i)) for i in range(20000)])
+offset = 0
+piece_sizes = random.Random(42)
+
+while offset < len(data):
+    piece_size = piece_sizes.randint(1, 2000)
+    brickd.send(data[offset:offset + piece_size])
+    offset += piece_size
+
+assert(wait_until(lambda: len(values) == 20000))
+assert(values == list(range(20000)))
+assert(ipcon.send_request(device, 1, (5678,), 'I', 12, 'I') == 5678)
+
+ipcon.disconnect()
+brickd.close()
+
+# pipelined stream writes
+
+def write_stream(window, fail_offset=None):
+    def handler(uid, function_id, payload):
+        if struct.unpack('<H', payload)[0] == fail_offset:
+            return None
+
+        return payload
+
+    brickd = FakeBrickd(handler, 0.05)
+    ipcon, device = connect_fake_brickd(brickd)
+    device.response_expected[2] = Device.RESPONSE_EXPECTED_TRUE # setter
+    device.set_stream_write_window(window)
+    chunk_requests = [(offset,) for offset in range(0, 80, 10)]
+    result = None
+    error = None
+
+    try:
+        result = device.send_stream_in_chunks(lambda offset: ipcon.send_request(device, 2, (offset,), 'H', 10, 'H'),
+                                              2, chunk_requests, 'H', 10, 'H')
+    except Error as e:
+        error = e
+    finally:
+        ipcon.disconnect()
+        brickd.close()
+
+    return result, error, [struct.unpack('<H', payload)[0] for _, _, payload in brickd.get_requests()], brickd.max_in_flight
+
+# the default window sends one chunk at a time
+result, error, offsets, max_in_flight = write_stream(1)
+assert(result == 70)
+assert(error == None)
+assert(max_in_flight == 1)
+assert(offsets == list(range(0, 80, 10)))
+
+# a larger window keeps that many chunks in flight, in order
+result, error, offsets, max_in_flight = write_stream(4)
+assert(result == 70)
+assert(error == None)
+assert(max_in_flight == 4)
+assert(offsets == list(range(0, 80, 10)))
+
+# the error of a failing chunk is raised and no chunk is sent after it
+result, error, offsets, max_in_flight = write_stream(1, 20)
+assert(error.value == Error.INVALID_PARAMETER)
+assert(offsets == [0, 10, 20])
+
+# with a larger window up to window - 1 chunks after the failing chunk might
+# have been sent already, but no further chunks are sent after its error
+# response was received
+result, error, offsets, max_in_flight = write_stream(4, 20)
+assert(error.value == Error.INVALID_PARAMETER)
+assert(offsets == list(range(0, len(offsets) * 10, 10)))
+assert(len(offsets) >= 3 and len(offsets) <= 3 + 4 - 1)
+
+# the error response is noticed before the next chunk is sent, even if the
+# responses of the chunks before it are still uncollected
+brickd = FakeBrickd(handler=lambda uid, function_id, payload: None if struct.unpack('<H', payload)[0] == 20 else payload)
+ipcon, device = connect_fake_brickd(brickd)
+errors = []
+
+def send_chunks():
+    try:
+        ipcon.send_pipelined_requests(device, 2, [(offset,) for offset in range(0, 80, 10)], 'H', 10, 'H', 4)
+    except Error as e:
+        errors.append(e)
+
+device.response_expected[2] = Device.RESPONSE_EXPECTED_TRUE # setter
+brickd.hold()
+thread = threading.Thread(target=send_chunks)
+thread.start()
+
+assert(wait_until(lambda: len(brickd.get_requests()) == 4 and brickd.in_flight == 0))
+
+brickd.release()
+thread.join()
+
+assert(len(errors) == 1 and errors[0].value == Error.INVALID_PARAMETER)
+assert([struct.unpack('<H', payload)[0] for _, _, payload in brickd.get_requests()] == [0, 10, 20, 30])
+assert(len(ipcon.pending_requests) == 0)
+
+ipcon.disconnect()
+brickd.close()
+
+# multiple outstanding requests per device
+
+brickd = FakeBrickd(response_delay=0.2)
+ipcon, device = connect_fake_brickd(brickd)
+results = {}
+
+def get_value(value):
+    results[value] = ipcon.send_request(device, 1, (value,), 'I', 12, 'I')
+
+# less threads than distinct sequence numbers, because requests with the same
+# key could be sent in a different order than they were registered in
+threads = [threading.Thread(target=get_value, args=(value,)) for value in range(10)]
+start = time.time()
+
+for thread in threads:
+    thread.start()
+
+for thread in threads:
+    thread.join()
+
+# all requests were in flight at the same time and each thread got its own
+# response, the requests didn't wait for each other
+assert(results == dict([(value, value) for value in range(10)]))
+assert(brickd.max_in_flight == 10)
+assert(time.time() - start < 1.0)
+assert(len(ipcon.pending_requests) == 0)
+
+# a response that arrives after the timeout is dropped and doesn't get mixed
+# up with the next request
+ipcon.set_timeout(0.1)
+
+try:
+    ipcon.send_request(device, 1, (1,), 'I', 12, 'I')
+    assert(False)
+except Error as e:
+    assert(e.value == Error.TIMEOUT)
+
+assert(len(ipcon.pending_requests) == 0)
+
+ipcon.set_timeout(2.5)
+brickd.response_delay = 0
+
+assert(wait_until(lambda: brickd.in_flight == 0))
+assert(ipcon.send_request(device, 1, (2,), 'I', 12, 'I') == 2)
+
+ipcon.disconnect()
+brickd.close()
+
+# batched requests
+
+class TestDevice(Device):
+    def __init__(self, uid, ipcon):
+        Device.__init__(self, uid, ipcon, -1, 'Test Device') # a negative device identifier skips the identity check
+
+        self.response_expected[1] = Device.RESPONSE_EXPECTED_ALWAYS_TRUE # getter
+        self.response_expected[2] = Device.RESPONSE_EXPECTED_FALSE # setter
+        self.response_expected[3] = Device.RESPONSE_EXPECTED_TRUE # stream setter
+        self.response_expected[4] = Device.RESPONSE_EXPECTED_ALWAYS_TRUE # stream getter
+
+        self.multi_request_functions.add('write_values')
+        self.multi_request_functions.add('read_values')
+
+        ipcon.add_device(self)
+
+    def get_value(self, value):
+        return self.ipcon.send_request(self, 1, (value,), 'I', 12, 'I')
+
+    def set_value(self, value):
+        self.ipcon.send_request(self, 2, (value,), 'I', 0, '')
+
+    def write_values_low_level(self, values_chunk_offset):
+        return self.ipcon.send_request(self, 3, (values_chunk_offset,), 'I', 12, 'I')
+
+    def write_values(self, values):
+        values_chunk_requests = [(values_chunk_offset,) for values_chunk_offset in range(0, len(values), 10)]
+
+        with self.stream_lock:
+            return self.send_stream_in_chunks(self.write_values_low_level, 3, values_chunk_requests, 'I', 12, 'I')
+
+    def read_values_low_level(self):
+        return self.ipcon.send_request(self, 4, (0,), 'I', 12, 'I')
+
+    def read_values(self):
+        with self.stream_lock:
+            return [self.read_values_low_level(), self.read_values_low_level()]
+
+def fail_value(failing_value):
+    def handler(uid, function_id, payload):
+        if struct.unpack('<I', payload)[0] == failing_value:
+            return None
+
+        return payload
+
+    return handler
+
+brickd = FakeBrickd(fail_value(7), 0.2)
+ipcon, _ = connect_fake_brickd(brickd)
+device = TestDevice('b', ipcon)
+start = time.time()
+
+with ipcon.batch() as batch:
+    calls = [batch.call(device.get_value, value) for value in range(10)]
+    setter_call = batch.call(device.set_value, 1234)
+    invalid_call = batch.call(len, 'not a device function')
+
+    # nothing is sent before the end of the with statement
+    assert(len(brickd.get_requests()) == 0)
+
+# all requests were written at once and only one round-trip was waited for
+assert(brickd.max_in_flight == 10)
+assert(time.time() - start < 1.0)
+assert([(function_id, struct.unpack('<I', payload)[0]) for _, function_id, payload in brickd.get_requests()] == \
+       [(1, value) for value in range(10)] + [(2, 1234)])
+assert(len(ipcon.pending_requests) == 0)
+
+for value, call in enumerate(calls):
+    if value == 7:
+        # the error response of one call is raised by its get function only
+        try:
+            call.get()
+            assert(False)
+        except Error as e:
+            assert(e.value == Error.INVALID_PARAMETER)
+    else:
+        assert(call.get() == value)
+
+assert(setter_call.get() == None)
+
+try:
+    invalid_call.get()
+    assert(False)
+except ValueError:
+    pass
+
+# send_requests returns the results in call order
+brickd.response_delay = 0.1
+brickd.max_in_flight = 0
+
+assert(ipcon.send_requests([(device.get_value, (value,)) for value in range(10, 20)]) == list(range(10, 20)))
+assert(brickd.max_in_flight == 10)
+
+# and raises the error of a failing call
+try:
+    ipcon.send_requests([(device.get_value, (6,)), (device.get_value, (7,))])
+    assert(False)
+except Error as e:
+    assert(e.value == Error.INVALID_PARAMETER)
+
+assert(len(ipcon.pending_requests) == 0)
+
+# functions sending more than one request are rejected before any of their
+# requests is sent, other calls of the batch are not affected
+request_count = len(brickd.get_requests())
+
+for window in [1, 4]:
+    device.set_stream_write_window(window)
+
+    with ipcon.batch() as batch:
+        write_call = batch.call(device.write_values, list(range(30)))
+        read_call = batch.call(device.read_values)
+        low_level_call = batch.call(device.write_values_low_level, 20)
+
+    for call in [write_call, read_call]:
+        try:
+            call.get()
+            assert(False)
+        except ValueError:
+            pass
+
+    assert(low_level_call.get() == 20)
+    assert([(function_id, struct.unpack('<I', payload)[0]) for _, function_id, payload in brickd.get_requests()[request_count:]] == [(3, 20)])
+
+    request_count += 1
+
+assert(len(ipcon.pending_requests) == 0)
+
+ipcon.disconnect()
+brickd.close()
+
+# callback worker pool
+
+def send_callback(brickd, uid, function_id, value):
+    brickd.send(make_packet(uid, function_id, 0, struct.pack('<I', value)))
+
+def add_callback(device, function_id, values, blocking_value=None, entered=None, release=None):
+    def callback(value):
+        if value == blocking_value:
+            entered.set()
+            release.wait()
+
+        values.append(value)
+
+    device.callback_formats[function_id] = (12, 'I')
+    device.registered_callbacks[function_id] = callback
+
+brickd = FakeBrickd()
+ipcon, slow_device = connect_fake_brickd(brickd)
+fast_device = TestDevice('b', ipcon)
+slow_values = []
+fast_values = []
+entered = threading.Event()
+release = threading.Event()
+
+# the uids 9 and 10 are handled by different workers
+ipcon.set_callback_workers(2)
+
+add_callback(slow_device, 5, slow_values, 0, entered, release)
+add_callback(fast_device, 5, fast_values)
+
+send_callback(brickd, slow_device.uid, 5, 0)
+assert(entered.wait(5))
+
+# a blocked callback of one device doesn't delay the callbacks of another
+for value in range(1, 100):
+    send_callback(brickd, slow_device.uid, 5, value)
+    send_callback(brickd, fast_device.uid, 5, value)
+
+assert(wait_until(lambda: len(fast_values) == 99))
+assert(fast_values == list(range(1, 100)))
+assert(len(slow_values) == 0)
+
+# but the callbacks of the blocked device are still called in order
+release.set()
+
+assert(wait_until(lambda: len(slow_values) == 100))
+assert(slow_values == list(range(100)))
+
+# a full worker queue drops its oldest callback
+def fill_worker_queue(overflow_policy, packets):
+    del slow_values[:]
+    entered.clear()
+    release.clear()
+
+    ipcon.set_callback_workers(2, 2, overflow_policy)
+    send_callback(brickd, slow_device.uid, 5, 0)
+    assert(entered.wait(5))
+
+    for function_id, value in packets:
+        send_callback(brickd, slow_device.uid, function_id, value)
+
+    assert(wait_until(lambda: ipcon.get_callback_queue_statistics()[slow_device.uid % 2] == (2, len(packets) - 2)))
+
+    release.set()
+
+slow_values_6 = []
+add_callback(slow_device, 6, slow_values_6)
+
+fill_worker_queue(IPConnection.CALLBACK_OVERFLOW_DROP_OLDEST, [(5, 1), (5, 2), (5, 3), (5, 4)])
+assert(wait_until(lambda: len(slow_values) == 3))
+assert(slow_values == [0, 3, 4])
+
+# the coalesce policy drops the oldest callback of the same callback ID first
+fill_worker_queue(IPConnection.CALLBACK_OVERFLOW_COALESCE, [(5, 1), (6, 1), (5, 2), (6, 2)])
+assert(wait_until(lambda: len(slow_values) == 2 and len(slow_values_6) == 1))
+assert(slow_values == [0, 2])
+assert(slow_values_6 == [2])
+
+ipcon.set_callback_workers(0)
+ipcon.disconnect()
+brickd.close()
+
+# callback coalescing
+
+def get_coalesced_value(ipcon, device, function_id):
+    with ipcon.coalesced_packets_lock:
+        packet = ipcon.coalesced_packets.get((device.uid, function_id))
+
+    if packet == None:
+        return None
+
+    return struct.unpack('<I', bytes(packet[8:12]))[0]
+
+brickd = FakeBrickd()
+ipcon, device = connect_fake_brickd(brickd)
+
+try:
+    device.set_callback_coalescing(5, True)
+    assert(False)
+except ValueError:
+    pass
+
+# once with the callback thread, once with a worker thread
+for worker_count in [0, 1]:
+    ipcon.set_callback_workers(worker_count)
+
+    coalesced_values = []
+    values = []
+    entered = threading.Event()
+    release = threading.Event()
+
+    add_callback(device, 5, coalesced_values, 0, entered, release)
+    add_callback(device, 6, values)
+    device.set_callback_coalescing(5, True)
+
+    send_callback(brickd, device.uid, 5, 0)
+    assert(entered.wait(5))
+
+    # while the callback is blocked each new value replaces the queued one
+    for value in range(1, 51):
+        send_callback(brickd, device.uid, 5, value)
+        send_callback(brickd, device.uid, 6, value)
+
+    assert(wait_until(lambda: get_coalesced_value(ipcon, device, 5) == 50))
+
+    release.set()
+
+    # only the latest value is delivered, other callbacks get every value
+    assert(wait_until(lambda: len(coalesced_values) == 2 and len(values) == 50))
+    assert(coalesced_values == [0, 50])
+    assert(values == list(range(1, 51)))
+    assert(len(ipcon.coalesced_packets) == 0)
+
+    # without coalescing every value is delivered again
+    device.set_callback_coalescing(5, False)
+
+    for value in range(51, 54):
+        send_callback(brickd, device.uid, 5, value)
+
+    assert(wait_until(lambda: len(coalesced_values) == 5))
+    assert(coalesced_values == [0, 50, 51, 52, 53])
+
+ipcon.set_callback_workers(0)
+ipcon.disconnect()
+brickd.close()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# the async IP Connection requires Python >= 3.7
+
+import asyncio
+import struct
+from ip_connection import Device, Error
+from ip_connection_async import AsyncIPConnection, AsyncDevice
+
+def make_packet(uid, function_id, sequence_number, payload, error_code=0):
+    return struct.pack('<IBBBB', uid, 8 + len(payload), function_id, sequence_number << 4, error_code << 6) + payload
+
+async def wait_until(condition, timeout=5):
+    deadline = asyncio.get_running_loop().time() + timeout
+
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+
+        await asyncio.sleep(0.01)
+
+    return True
+
+# answers every request with response expected. the handler gets (uid,
+# function_id, payload) and returns the response payload, or None to respond
+# with an invalid parameter error. the responses are sent response_delay
+# seconds after the request was received
+class FakeBrickd(object):
+    def __init__(self, handler=None, response_delay=0):
+        self.handler = handler if handler != None else lambda uid, function_id, payload: payload
+        self.response_delay = response_delay
+        self.requests = [] # [(uid, function_id, payload)]
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.responses = asyncio.Queue()
+        self.server = None
+        self.port = None
+        self.writer = None
+        self.connection_closed = asyncio.Event()
+        self.tasks = []
+        self.held_data = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.tasks.append(asyncio.ensure_future(self.respond_loop()))
+
+    async def handle_connection(self, reader, writer):
+        self.writer = writer
+
+        while True:
+            try:
+                header = await reader.readexactly(8)
+                uid, length, function_id, options, _ = struct.unpack('<IBBBB', header)
+                payload = await reader.readexactly(length - 8)
+            except (asyncio.IncompleteReadError, OSError):
+                break
+
+            if uid == 0:
+                continue # disconnect probe
+
+            self.requests.append((uid, function_id, payload))
+
+            if options & 0x08 != 0:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                response = self.handler(uid, function_id, payload)
+
+                if response == None:
+                    packet = make_packet(uid, function_id, options >> 4, b'', 1)
+                else:
+                    packet = make_packet(uid, function_id, options >> 4, response)
+
+                self.responses.put_nowait((asyncio.get_running_loop().time() + self.response_delay, packet))
+
+        self.connection_closed.set()
+
+    async def respond_loop(self):
+        while True:
+            send_time, packet = await self.responses.get()
+
+            await asyncio.sleep(max(send_time - asyncio.get_running_loop().time(), 0))
+
+            self.in_flight -= 1
+            self.send(packet)
+
+    def send(self, data):
+        if self.held_data != None:
+            self.held_data.append(data)
+        elif self.writer != None and not self.writer.is_closing():
+            self.writer.write(data)
+
+    # holds back all data until release sends it in one piece
+    def hold(self):
+        self.held_data = []
+
+    def release(self):
+        held_data = self.held_data
+        self.held_data = None
+
+        self.send(b''.join(held_data))
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+
+        if self.writer != None:
+            self.writer.close()
+
+            await self.connection_closed.wait()
+
+        self.server.close()
+        await self.server.wait_closed()
+
+class TestDevice(AsyncDevice, Device):
+    def __init__(self, uid, ipcon):
+        AsyncDevice.__init__(self, uid, ipcon, -1, 'Test Device') # a negative device identifier skips the identity check
+
+        self.response_expected[1] = Device.RESPONSE_EXPECTED_ALWAYS_TRUE # getter
+        self.response_expected[2] = Device.RESPONSE_EXPECTED_TRUE # setter
+
+        ipcon.add_device(self)
+
+async def connect_fake_brickd(handler=None, response_delay=0):
+    brickd = FakeBrickd(handler, response_delay)
+
+    await brickd.start()
+
+    ipcon = AsyncIPConnection()
+    ipcon.set_auto_reconnect(False)
+
+    await ipcon.connect('127.0.0.1', brickd.port)
+
+    assert(await wait_until(lambda: brickd.writer != None))
+
+    return brickd, ipcon, TestDevice('a', ipcon)
+
+async def disconnect_fake_brickd(brickd, ipcon):
+    await ipcon.disconnect()
+    await brickd.close()
+
+def fail_offset(offset):
+    def handler(uid, function_id, payload):
+        if struct.unpack('<H', payload)[0] == offset:
+            return None
+
+        return payload
+
+    return handler
+
+async def test_requests():
+    brickd, ipcon, device = await connect_fake_brickd(response_delay=0.1)
+
+    assert(await ipcon.send_request(device, 1, (1234,), 'I', 12, 'I') == 1234)
+
+    # concurrent requests of the same device are all in flight at once
+    brickd.max_in_flight = 0
+    results = await asyncio.gather(*[ipcon.send_request(device, 1, (i,), 'I', 12, 'I') for i in range(10)])
+
+    assert(results == list(range(10)))
+    assert(brickd.max_in_flight == 10)
+    assert(len(ipcon.pending_requests) == 0)
+
+    await disconnect_fake_brickd(brickd, ipcon)
+
+async def test_callbacks():
+    brickd, ipcon, device = await connect_fake_brickd()
+    values = []
+    async_values = []
+
+    async def async_callback(value):
+        await asyncio.sleep(0)
+        async_values.append(value)
+
+    device.callback_formats[5] = (12, 'I')
+    device.callback_formats[6] = (12, 'I')
+    device.registered_callbacks[5] = values.append
+    device.registered_callbacks[6] = async_callback
+
+    for i in range(100):
+        brickd.send(make_packet(device.uid, 5, 0, struct.pack('<I', i)))
+        brickd.send(make_packet(device.uid, 6, 0, struct.pack('<I', i)))
+
+    assert(await wait_until(lambda: len(values) == 100 and len(async_values) == 100))
+    assert(values == list(range(100)))
+    assert(async_values == list(range(100)))
+
+    await disconnect_fake_brickd(brickd, ipcon)
+
+async def test_pipelined_requests():
+    chunk_requests = [(offset,) for offset in range(0, 80, 10)]
+
+    for window in [1, 4]:
+        brickd, ipcon, device = await connect_fake_brickd(response_delay=0.05)
+
+        results = await ipcon.send_pipelined_requests(device, 2, chunk_requests, 'H', 10, 'H', window)
+
+        assert(results == list(range(0, 80, 10)))
+        assert(brickd.max_in_flight == window)
+        assert([struct.unpack('<H', payload)[0] for _, _, payload in brickd.requests] == list(range(0, 80, 10)))
+
+        await disconnect_fake_brickd(brickd, ipcon)
+
+    # the first error is raised and no further chunks are sent after it, but
+    # up to window - 1 chunks after the failing chunk might have been sent
+    # already
+    for window in [1, 4]:
+        brickd, ipcon, device = await connect_fake_brickd(fail_offset(20), 0.05)
+
+        try:
+            await asyncio.wait_for(ipcon.send_pipelined_requests(device, 2, chunk_requests, 'H', 10, 'H', window), 5)
+            assert(False)
+        except Error as e:
+            assert(e.value == Error.INVALID_PARAMETER)
+
+        offsets = [struct.unpack('<H', payload)[0] for _, _, payload in brickd.requests]
+
+        assert(offsets == list(range(0, len(offsets) * 10, 10)))
+        assert(len(offsets) >= 3 and len(offsets) <= 3 + window - 1)
+        assert(len(ipcon.pending_requests) == 0)
+
+        # later requests are not affected by the failed ones
+        assert(await asyncio.wait_for(ipcon.send_pipelined_requests(device, 2, chunk_requests[:2], 'H', 10, 'H', window), 5) == [0, 10])
+
+        await disconnect_fake_brickd(brickd, ipcon)
+
+    # the error response is noticed before the next chunk is sent, even if
+    # the responses of the chunks before it are still uncollected
+    brickd, ipcon, device = await connect_fake_brickd(fail_offset(20))
+    brickd.hold()
+    task = asyncio.ensure_future(ipcon.send_pipelined_requests(device, 2, chunk_requests, 'H', 10, 'H', 4))
+
+    assert(await wait_until(lambda: len(brickd.requests) == 4 and brickd.in_flight == 0))
+
+    brickd.release()
+
+    try:
+        await asyncio.wait_for(task, 5)
+        assert(False)
+    except Error as e:
+        assert(e.value == Error.INVALID_PARAMETER)
+
+    assert([struct.unpack('<H', payload)[0] for _, _, payload in brickd.requests] == [0, 10, 20, 30])
+    assert(len(ipcon.pending_requests) == 0)
+
+    await disconnect_fake_brickd(brickd, ipcon)
+
+    # cancelling cleans up all pending requests
+    brickd, ipcon, device = await connect_fake_brickd(response_delay=0.5)
+    task = asyncio.ensure_future(ipcon.send_pipelined_requests(device, 2, chunk_requests, 'H', 10, 'H', 4))
+
+    assert(await wait_until(lambda: len(brickd.requests) == 4))
+
+    task.cancel()
+
+    try:
+        await task
+        assert(False)
+    except asyncio.CancelledError:
+        pass
+
+    assert(len(ipcon.pending_requests) == 0)
+
+    await disconnect_fake_brickd(brickd, ipcon)
+
+async def main():
+    await test_requests()
+    await test_callbacks()
+    await test_pipelined_requests()
+
+asyncio.run(main())
@@ -673,8 +673,9 @@ class RubyBindingsGenerator(ruby_common.RubyGeneratorTrait, common.BindingsGener
     def generate(self, device):
         filename = '{0}_{1}.rb'.format(device.get_category().under, device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_ruby_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_ruby_source())
 
         if device.is_released():
             self.device_display_names.append((device.get_device_identifier(), device.get_long_display_name()))
@@ -706,7 +707,7 @@ end
         for device_identifier, device_display_name in sorted(self.device_display_names):
             entries.append("{0} => '{1}'".format(device_identifier, device_display_name))
 
-        with open(os.path.join(self.get_bindings_dir(), 'device_display_names.rb'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'device_display_names.rb')) as f:
             f.write(template.format(header=self.get_header_comment('hash'),
                                     entries=',\n    '.join(entries)))
 
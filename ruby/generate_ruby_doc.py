@@ -426,7 +426,7 @@ class RubyDocGenerator(ruby_common.RubyGeneratorTrait, common.DocGenerator):
         return ruby_common.RubyElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_ruby_doc())
 
 def generate(root_dir, language, internal):
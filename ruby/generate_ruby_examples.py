@@ -634,7 +634,7 @@ class RubyExamplesGenerator(ruby_common.RubyGeneratorTrait, common.ExamplesGener
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_ruby_source())
 
 def generate(root_dir, language, internal):
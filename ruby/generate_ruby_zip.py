@@ -107,7 +107,7 @@ class RubyZipGenerator(ruby_common.RubyGeneratorTrait, common.ZipGenerator):
         # Make version.rb
         version = self.get_changelog_version()
 
-        with open(os.path.join(self.tmp_source_lib_tinkerforge_dir, 'version.rb'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_source_lib_tinkerforge_dir, 'version.rb')) as f:
             f.write("""
 module Tinkerforge
   VERSION = '{0}.{1}.{2}'
@@ -115,7 +115,7 @@ end
 """.format(*version))
 
         # Make tinkerforge.rb
-        with open(os.path.join(self.tmp_source_lib_dir, 'tinkerforge.rb'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_source_lib_dir, 'tinkerforge.rb')) as f:
             f.write("""
 require 'tinkerforge/version'
 
@@ -75,6 +75,6 @@ def test(root_dir):
     return RubyTester(root_dir, extra_paths).run()
 
 if __name__ == '__main__':
-    common.dockerize('ruby', __file__)
+    common.dockerize('ruby', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
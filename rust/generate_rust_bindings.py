@@ -675,6 +675,8 @@ class RustBindingsPacket(rust_common.RustPacket):
         return "#[derive({traits})]".format(traits=", ".join(self.get_rust_derivable_traits(high_level_only)))
 
 class RustBindingsGenerator(rust_common.RustGeneratorTrait, common.BindingsGenerator):
+    incremental = False # get_rust_source() collects the packet types for write_byte_converter()
+
     def get_device_class(self):
         return RustBindingsDevice
 
@@ -693,7 +695,7 @@ class RustBindingsGenerator(rust_common.RustGeneratorTrait, common.BindingsGener
         else:
             filename = '{0}_{1}'.format(device.get_name().under, device.get_category().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename + '.rs'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), filename + '.rs')) as f:
             f.write(device.get_rust_source())
 
         if device.is_released():
@@ -796,7 +798,7 @@ impl FromByteSlice for [bool; {count}] {{
                 if typestring in packet_param_types or typestring in packet_return_types:
                     array_impl.append(template.format(type=primitive_type, count=i, count_in_bytes=size_in_bytes*i, unchecked=("" if "f" not in primitive_type else "_unchecked")))
 
-        with open(os.path.join(self.get_bindings_dir(), 'byte_converter.rs'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'byte_converter.rs')) as f:
             f.write(primitive_type_impl)
             f.write("\n")
             f.write("\n\n".join(array_impl))
@@ -830,12 +832,12 @@ pub mod device;
 pub mod ip_connection;
 pub mod low_level_traits;
 """
-        with open(os.path.join(self.get_bindings_dir(), 'lib.rs'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'lib.rs')) as f:
             f.write(template.format(version=".".join(list(self.get_changelog_version()))))
 
         bindings_mod_template = """pub mod {module};"""
         decls = [bindings_mod_template.format(module=f.replace(".rs", "")) for f in self.released_files]
-        with open(os.path.join(self.get_bindings_dir(), 'mod.rs'), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), 'mod.rs')) as f:
             f.write("\n".join(decls))
 
     def finish(self):
@@ -431,7 +431,7 @@ class RustDocGenerator(rust_common.RustGeneratorTrait, common.DocGenerator):
         return rust_common.RustElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_rust_doc())
 
 def generate(root_dir, language, internal):
@@ -719,7 +719,7 @@ class RustExamplesGenerator(rust_common.RustGeneratorTrait, common.ExamplesGener
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_rust_source())
 
             version = subprocess.check_output(["rustfmt", "--version"])
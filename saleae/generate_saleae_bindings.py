@@ -176,8 +176,9 @@ class SaleaeBindingsGenerator(saleae_common.SaleaeGeneratorTrait, common.Binding
             return
         filename = '{0}_{1}.txt'.format(device.get_category().under, device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
-            f.write(device.get_info_dict())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
+                f.write(device.get_info_dict())
 
         if device.is_released():
             self.released_files.append(filename)
@@ -555,6 +555,8 @@ def dispatch_{0}_{1}(ctx, argv):
         return source
 
 class ShellBindingsGenerator(shell_common.ShellGeneratorTrait, common.BindingsGenerator):
+    incremental = False # get_shell_source() collects the completion patterns for finish()
+
     def get_device_class(self):
         return ShellBindingsDevice
 
@@ -592,7 +594,7 @@ class ShellBindingsGenerator(shell_common.ShellGeneratorTrait, common.BindingsGe
 
         filename = '{0}.part'.format(device.get_shell_device_name())
 
-        with open(os.path.join(self.get_bindings_dir(), filename), 'w') as f:
+        with common.open_output_file(os.path.join(self.get_bindings_dir(), filename)) as f:
             f.write(device.get_shell_source())
 
         self.part_files.append(filename)
@@ -602,7 +604,7 @@ class ShellBindingsGenerator(shell_common.ShellGeneratorTrait, common.BindingsGe
         root_dir = self.get_root_dir()
         bindings_dir = self.get_bindings_dir()
         version = self.get_changelog_version()
-        shell = open(os.path.join(bindings_dir, 'tinkerforge'), 'w')
+        shell = common.open_output_file(os.path.join(bindings_dir, 'tinkerforge'))
 
         with open(os.path.join(root_dir, 'tinkerforge.header'), 'r') as f:
             header = f.read().replace('<<VERSION>>', '.'.join(version))
@@ -679,7 +681,7 @@ def get_device_display_name(device_identifier):
         else:
             template = template.replace('<<CALLBACK>>', '')
 
-        with open(os.path.join(bindings_dir, 'tinkerforge-bash-completion.sh'), 'w') as f:
+        with common.open_output_file(os.path.join(bindings_dir, 'tinkerforge-bash-completion.sh')) as f:
             f.write(template)
 
         common.BindingsGenerator.finish(self)
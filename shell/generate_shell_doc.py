@@ -476,7 +476,7 @@ class ShellDocGenerator(shell_common.ShellGeneratorTrait, common.DocGenerator):
         return shell_common.ShellElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_shell_doc())
 
 def generate(root_dir, language, internal):
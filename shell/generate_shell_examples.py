@@ -482,7 +482,7 @@ class ShellExamplesGenerator(shell_common.ShellGeneratorTrait, common.ExamplesGe
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_shell_source())
 
             os.chmod(filepath, 0o755)
@@ -84,6 +84,6 @@ def test(root_dir):
     return ShellExamplesTester(root_dir).run()
 
 if __name__ == '__main__':
-    common.dockerize('shell', __file__)
+    common.dockerize('shell', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
@@ -384,10 +384,10 @@ Beschreibung.
         else:
             filename += '.rst'
 
-        with open(os.path.join(folder, 'en', device.get_category().camel + 's', filename), 'w') as doc:
+        with common.open_output_file(os.path.join(folder, 'en', device.get_category().camel + 's', filename)) as doc:
             doc.write(self.template_en.format(format0, format1, format2, format3, format4, format5, device.get_category().under, '='*len(format0), '-'*len(format0)))
 
-        with open(os.path.join(folder, 'de', device.get_category().camel + 's', filename), 'w') as doc:
+        with common.open_output_file(os.path.join(folder, 'de', device.get_category().camel + 's', filename)) as doc:
             doc.write(self.template_de.format(format0, format1, format2, format3, format4, format5, device.get_category().under, '='*len(format0)))
 
 def generate(root_dir, language, internal):
@@ -508,7 +508,7 @@ void communication_init(void);
                 s = s.replace("""<<<NAME>>>""", name)
                 s = s.replace("""<<<EMAIL>>>""", email)
                 s = s.replace("""<<<CALLBACK_VALUE_DEFINE>>>""", callback_value_define)
-                with open(fpath, "w") as f:
+                with common.open_output_file(fpath) as f:
                     f.write(s)
 
     def prepare(self):
@@ -565,10 +565,10 @@ void communication_init(void);
         c_callback_value_include_string = device.get_c_callback_value_include()
         c_callback_value_init_string = device.get_c_callback_value_init()
 
-        with open(os.path.join(folder, 'software', 'src', 'communication.c'), 'w') as c:
+        with common.open_output_file(os.path.join(folder, 'software', 'src', 'communication.c')) as c:
             c.write(self.c_file.format(device_name_dash, year, name, email, c_cases_string, c_functions_string, c_callbacks_string, c_callback_value_include_string, c_callback_value_init_string))
 
-        with open(os.path.join(folder, 'software', 'src', 'communication.h'), 'w') as h:
+        with common.open_output_file(os.path.join(folder, 'software', 'src', 'communication.h')) as h:
             h.write(self.h_file.format(device_name_dash, year, name, email, h_constants_string, h_defines_string, h_structs_string, h_function_prototypes_string, h_callback_prototypes_string, h_callback_list_string))
 
 def generate(root_dir, language, internal):
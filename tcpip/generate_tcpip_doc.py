@@ -328,7 +328,7 @@ class TCPIPDocGenerator(common.DocGenerator):
         return TCPIPDocElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_tcpip_doc())
 
 def generate(root_dir, language, internal):
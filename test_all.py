@@ -32,6 +32,38 @@ from generators import common
 
 # FIXME: test custom bindings too
 
+def print_summary(binding_results):
+    print('\033[01;35m>>> summary\033[0m')
+
+    for binding, status in binding_results:
+        results = [result for result in common.tester_results if result['tester'] == binding]
+        failed = [result for result in results if not result['success']]
+        cached = [result for result in results if result['source'] == 'cached']
+        resumed = [result for result in results if result['source'] == 'resumed']
+        duration = sum([result['duration'] for result in results])
+
+        print('    {0}: {1}, {2} test(s), {3} failure(s), {4} cached, {5} resumed, {6:.1f}s'
+              .format(binding, status, len(results), len(failed), len(cached), len(resumed), duration))
+
+        for result in failed:
+            if result['comment'] != None:
+                print('        failed: [{0}] {1}'.format(result['comment'], result['test']))
+            else:
+                print('        failed: {0}'.format(result['test']))
+
+    slowest = sorted([result for result in common.tester_results if result['source'] == 'run'], key=lambda result: -result['duration'])[:10]
+
+    if len(slowest) > 0:
+        print('    slowest tests:')
+
+        for result in slowest:
+            if result['comment'] != None:
+                print('        {0:.1f}s {1} [{2}] {3}'.format(result['duration'], result['tester'], result['comment'], result['test']))
+            else:
+                print('        {0:.1f}s {1} {2}'.format(result['duration'], result['tester'], result['test']))
+
+    print('    journal: {0}'.format(common.tester_journal_path))
+
 def main(args):
     all_bindings = []
 
@@ -39,7 +71,7 @@ def main(args):
         if not os.path.isdir(binding) or os.path.exists(os.path.join(generators_dir, binding, 'skip_test_all')):
             continue
 
-        if binding not in ['.git', '.m2', '.vscode', '__pycache__', 'configs', 'docker']:
+        if not binding.startswith('.') and binding not in ['__pycache__', 'configs', 'docker']:
             all_bindings.append(binding)
 
     all_bindings = sorted(all_bindings)
@@ -52,6 +84,10 @@ def main(args):
             print('error: {0}'.format(e))
             return 1
 
+    binding_results = [] # [(binding, status)]
+
+    # run the tests of all bindings, even if some fail, to get a complete
+    # summary and journal
     for binding in all_bindings:
         if binding not in active_bindings:
             continue
@@ -62,14 +98,21 @@ def main(args):
             module = importlib.import_module('generators.{0}.test_{0}_bindings'.format(binding))
         except ImportError: # FIXME: Python 3.6 has ModuleNotFoundError, which would be better to use here, but Debian Stretch has only Python 3.5
             print('\033[01;36m### tests missing\033[0m')
+            binding_results.append((binding, 'missing'))
         else:
             success = module.test(os.path.join(generators_dir, binding))
 
             if not isinstance(success, bool):
                 print('error: test_{0}_bindings.py returns wrong type from its test() function'.format(binding))
+                success = False
+
+            binding_results.append((binding, 'succeeded' if success else 'failed'))
+
+    print_summary(binding_results)
 
-            if not success:
-                return 1
+    if any([status == 'failed' for _, status in binding_results]):
+        print('\033[01;31m>>> failed\033[0m')
+        return 1
 
     print('\033[01;35m>>> done\033[0m')
 
@@ -79,4 +122,4 @@ if __name__ == '__main__':
     def add_arguments(parser):
         parser.add_argument('-b', '--bindings', nargs=1, help='comma separated list of bindings, each prefixed by +/-/>=/>/<=/<')
 
-    sys.exit(main(common.dockerize('', __file__, add_arguments=add_arguments)))
+    sys.exit(main(common.dockerize('', __file__, add_jobs_argument=False, add_tester_arguments=True, add_arguments=add_arguments)))
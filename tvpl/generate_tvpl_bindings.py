@@ -835,14 +835,15 @@ class TVPLBindingsGenerator(tvpl_common.TVPLGeneratorTrait, common.BindingsGener
         filename_tvpl_code_generator_python = '{devicecategory}_{devicename}.generator.python'.format(devicecategory=device.get_category().under,
                                                                                                       devicename=device.get_name().under)
 
-        with open(os.path.join(self.get_bindings_dir(), filename_tvpl_block), 'w') as f:
-            f.write(device.get_tvpl_source_block())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename_tvpl_block)) as f:
+                f.write(device.get_tvpl_source_block())
 
-        with open(os.path.join(self.get_bindings_dir(), filename_tvpl_code_generator_javascript), 'w') as f:
-            f.write(device.get_tvpl_source_generator_javascript())
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename_tvpl_code_generator_javascript)) as f:
+                f.write(device.get_tvpl_source_generator_javascript())
 
-        with open(os.path.join(self.get_bindings_dir(), filename_tvpl_code_generator_python), 'w') as f:
-            f.write(device.get_tvpl_source_generator_python())
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename_tvpl_code_generator_python)) as f:
+                f.write(device.get_tvpl_source_generator_python())
 
         if device.is_released():
             self.released_files.append('_'.join([device.get_category().under, device.get_name().under]))
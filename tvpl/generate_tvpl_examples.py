@@ -713,7 +713,7 @@ class TVPLExamplesGenerator(tvpl_common.TVPLGeneratorTrait, common.ExamplesGener
             else:
                 print('  - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_tvpl_source().encode('utf-8'))
 
 def generate(root_dir, language, internal):
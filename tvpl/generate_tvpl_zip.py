@@ -187,15 +187,15 @@ goog.require(\'Blockly.Python\');
             bricklet_toolbox += self.bricklet_toolbox_part[device]
 
         # Write block definition file
-        with open(os.path.join(self.tmp_blocks_dir, 'tinkerforge.js'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_blocks_dir, 'tinkerforge.js')) as f:
             f.write(block_header + self.block_content)
 
         # Write JavaScript generator file
-        with open(os.path.join(self.tmp_generators_javascript_dir, 'tinkerforge.js'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_generators_javascript_dir, 'tinkerforge.js')) as f:
             f.write(generator_javascript_header + self.generator_javascript_content)
 
         # Write Python generator file
-        with open(os.path.join(self.tmp_generators_python_dir, 'tinkerforge.js'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_generators_python_dir, 'tinkerforge.js')) as f:
             f.write(generator_python_header + self.generator_python_content)
 
         # Write toolbox XML file
@@ -211,7 +211,7 @@ goog.require(\'Blockly.Python\');
 
         os.makedirs(os.path.join(self.tmp_source_dir, 'xml'))
 
-        with open(os.path.join(self.tmp_source_dir, 'xml', 'toolbox.xml'), 'w') as f:
+        with common.open_output_file(os.path.join(self.tmp_source_dir, 'xml', 'toolbox.xml')) as f:
             f.write(self.get_header_comment('xml') + toolbox.replace('\n', ''))
 
         # Compile with closure library
@@ -1248,11 +1248,12 @@ class UCBindingsGenerator(uc_common.UCGeneratorTrait, common.BindingsGenerator):
             return
         filename = format('{category_under}_{device_under}', device)
 
-        with open(os.path.join(self.get_bindings_dir(), filename + '.c'), 'w') as f:
-            f.write(device.get_c_source())
+        if not self.is_unchanged_device(device):
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename + '.c')) as f:
+                f.write(device.get_c_source())
 
-        with open(os.path.join(self.get_bindings_dir(), filename + '.h'), 'w') as f:
-            f.write(device.get_c_header())
+            with common.open_output_file(os.path.join(self.get_bindings_dir(), filename + '.h')) as f:
+                f.write(device.get_c_header())
 
         if device.is_released():
             self.released_files.append(filename + '.c')
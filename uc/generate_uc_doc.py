@@ -474,7 +474,7 @@ class UCDocGenerator(uc_common.UCGeneratorTrait, common.DocGenerator):
     def generate(self, device):
         if not device.has_comcu():
             return
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_c_doc())
 
 def generate(root_dir, language, internal):
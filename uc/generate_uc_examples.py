@@ -847,7 +847,7 @@ class UCExamplesGenerator(uc_common.UCGeneratorTrait, common.ExamplesGenerator):
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_c_source())
 
 def generate(root_dir, language, internal):
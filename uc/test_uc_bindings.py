@@ -162,6 +162,6 @@ def test(root_dir):
     return UCExamplesTester(root_dir, 'scan-build clang', extra_paths).run()
 
 if __name__ == '__main__':
-    common.dockerize('uc', __file__)
+    common.dockerize('uc', __file__, add_jobs_argument=False, add_tester_arguments=True)
 
     test(os.getcwd())
@@ -490,7 +490,7 @@ class VBNETDocGenerator(vbnet_common.VBNETGeneratorTrait, common.DocGenerator):
         return VBNETDocElement
 
     def generate(self, device):
-        with open(device.get_doc_rst_path(), 'w') as f:
+        with common.open_output_file(device.get_doc_rst_path()) as f:
             f.write(device.get_vbnet_doc())
 
 def generate(root_dir, language, internal):
@@ -744,7 +744,7 @@ class VBNETExamplesGenerator(vbnet_common.VBNETGeneratorTrait, common.ExamplesGe
             else:
                 common.print_verbose('    - ' + filename)
 
-            with open(filepath, 'w') as f:
+            with common.open_output_file(filepath) as f:
                 f.write(example.get_vbnet_source())
 
 def generate(root_dir, language, internal):
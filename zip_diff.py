@@ -31,7 +31,7 @@ if sys.hexversion < 0x3040000:
     sys.exit(1)
 
 import os
-import re
+import zipfile
 import tempfile
 import shutil
 import argparse
@@ -57,6 +57,17 @@ if 'generators' not in sys.modules:
 
 from generators import common
 
+# ZipFile.extractall doesn't restore the Unix permissions of the members
+def extract_zip_file(zip_path, target_path):
+    with zipfile.ZipFile(zip_path) as zf:
+        zf.extractall(target_path)
+
+        for info in zf.infolist():
+            mode = (info.external_attr >> 16) & 0o7777
+
+            if info.create_system == 3 and mode != 0:
+                os.chmod(os.path.join(target_path, info.filename), mode)
+
 def main():
     argv = sys.argv[1:]
 
@@ -71,6 +82,7 @@ def main():
     parser.add_argument('-u', '--unreleased', action='store_true', help='use unreleased zip as old diff input')
     parser.add_argument('-d', '--diff-tool', default='./diff_view.py', help='program to open diff with')
     parser.add_argument('-b', '--bindings', nargs=1, help='comma separated list of bindings, each prefixed by +/-/>=/>/<=/<')
+    parser.add_argument('-j', '--jobs', type=int, help='number of files to diff in parallel (default: number of CPUs)')
 
     args = parser.parse_args(argv)
 
@@ -80,7 +92,7 @@ def main():
         if not os.path.isdir(binding) or os.path.exists(os.path.join(generators_dir, binding, 'skip_zip_diff')):
             continue
 
-        if binding not in ['.git', '.m2', '.vscode', '__pycache__', 'configs', 'docker']:
+        if not binding.startswith('.') and binding not in ['__pycache__', 'configs', 'docker']:
             all_bindings.append(binding)
 
     all_bindings = sorted(all_bindings)
@@ -118,224 +130,6 @@ def main():
 
             shutil.copytree(zip_path, zip_old_path)
     else:
-        c_like_header1 = re.compile(r'^@@ -1,8 \+1,8 @@\n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* .+ Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n$')
-
-        c_like_header2 = re.compile(r'^@@ -1,10 \+1,10 @@\n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'- \* .+ Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'\+ \* .+ Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n' + \
-        r'  \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*/\n' + \
-        r' \n$')
-
-        delphi_header1 = re.compile(r'^@@ -1,8 \+1,8 @@\n' + \
-        r' {\n' + \
-        r'-  This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.\n' + \
-        r'\+  This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.\n' + \
-        r' \n' + \
-        r'   Delphi/Lazarus Bindings Version 2\.[0-9]+\.[0-9]+\n' + \
-        r' \n' + \
-        r'   If you have a bugfix for this file and want to commit it,\n' + \
-        r'   please fix the bug in the generator\. You can find a link\n' + \
-        r'   to the generators git on tinkerforge\.com\n$')
-
-        delphi_header2 = re.compile(r'^@@ -1,10 \+1,10 @@\n' + \
-        r' {\n' + \
-        r'-  This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.\n' + \
-        r'\+  This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.\n' + \
-        r' \n' + \
-        r'-  Delphi/Lazarus Bindings Version 2\.[0-9]+\.[0-9]+\n' + \
-        r'\+  Delphi/Lazarus Bindings Version 2\.[0-9]+\.[0-9]+\n' + \
-        r' \n' + \
-        r'   If you have a bugfix for this file and want to commit it,\n' + \
-        r'   please fix the bug in the generator\. You can find a link\n' + \
-        r'   to the generators git on tinkerforge\.com\n' + \
-        r' }\n' + \
-        r' \n$')
-
-        javascript_header1 = re.compile(r'^@@ -[0-9]+,8 \+[0-9]+,8 @@\n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* JavaScript Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n$')
-
-        javascript_header2 = re.compile(r'^@@ -[0-9]+,10 \+[0-9]+,10 @@\n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'- \* JavaScript Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'\+ \* JavaScript Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n' + \
-        r'  \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*/\n' + \
-        r' \n$')
-
-        javascript_header3 = re.compile(r'^@@ -[0-9]+,13 \+[0-9]+,13 @@\n' + \
-        r' }\n' + \
-        r' \n' + \
-        r' module\.exports = Brick[A-Za-z0-9]+;\n' + \
-        r' \n' + \
-        r' },{"\./Device":[0-9]+,"\./IPConnection":[0-9]+}\],[0-9]+:\[function\(require,module,exports\){\n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* JavaScript Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n$')
-
-        javascript_header4 = re.compile(r'^@@ -[0-9]+,15 \+[0-9]+,15 @@\n' + \
-        r' }\n' + \
-        r' \n' + \
-        r' module\.exports = Brick[A-Za-z0-9]+;\n' + \
-        r' \n' + \
-        r' },{"\./Device":[0-9]+,"\./IPConnection":[0-9]+}\],[0-9]+:\[function\(require,module,exports\){\n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'- \* JavaScript Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'\+ \* JavaScript Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n' + \
-        r'  \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*/\n' + \
-        r' \n$')
-
-        perl_header1 = re.compile(r'^@@ -1,8 \+1,8 @@\n' + \
-        r' #############################################################\n' + \
-        r'-# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r'\+# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r' #                                                           #\n' + \
-        r' # Perl Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r' #                                                           #\n' + \
-        r' # If you have a bugfix for this file and want to commit it, #\n' + \
-        r' # please fix the bug in the generator\. You can find a link  #\n' + \
-        r' # to the generators git repository on tinkerforge\.com       #\n$')
-
-        perl_header2 = re.compile(r'^@@ -1,10 \+1,10 @@\n' + \
-        r' #############################################################\n' + \
-        r'-# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r'\+# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r' #                                                           #\n' + \
-        r'-# Perl Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r'\+# Perl Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r' #                                                           #\n' + \
-        r' # If you have a bugfix for this file and want to commit it, #\n' + \
-        r' # please fix the bug in the generator\. You can find a link  #\n' + \
-        r' # to the generators git repository on tinkerforge\.com       #\n' + \
-        r' #############################################################\n' + \
-        r' \n$')
-
-        php_header1 = re.compile(r'^@@ -1,10 \+1,10 @@\n' + \
-        r' <\?php\n' + \
-        r' \n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* PHP Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n$')
-
-        php_header2 = re.compile(r'^@@ -1,12 \+1,12 @@\n' + \
-        r' <\?php\n' + \
-        r' \n' + \
-        r' /\* \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\\n' + \
-        r'- \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'\+ \* This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      \*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'- \* PHP Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'\+ \* PHP Bindings Version 2\.[0-9]+\.[0-9]+[ ]+\*\n' + \
-        r'  \*                                                           \*\n' + \
-        r'  \* If you have a bugfix for this file and want to commit it, \*\n' + \
-        r'  \* please fix the bug in the generator\. You can find a link  \*\n' + \
-        r'  \* to the generators git repository on tinkerforge\.com       \*\n' + \
-        r'  \*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*\*/\n' + \
-        r' \n$')
-
-        python_header1 = re.compile(r'^@@ -1,9 \+1,9 @@\n' + \
-        r' # -\*- coding: utf-8 -\*-\n' + \
-        r' #############################################################\n' + \
-        r'-# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r'\+# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r' #                                                           #\n' + \
-        r' # Python Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r' #                                                           #\n' + \
-        r' # If you have a bugfix for this file and want to commit it, #\n' + \
-        r' # please fix the bug in the generator\. You can find a link  #\n' + \
-        r' # to the generators git repository on tinkerforge\.com       #\n$')
-
-        python_header2 = re.compile(r'^@@ -1,11 \+1,11 @@\n' + \
-        r' # -\*- coding: utf-8 -\*-\n' + \
-        r' #############################################################\n' + \
-        r'-# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r'\+# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r' #                                                           #\n' + \
-        r'-# Python Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r'\+# Python Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r' #                                                           #\n' + \
-        r' # If you have a bugfix for this file and want to commit it, #\n' + \
-        r' # please fix the bug in the generator\. You can find a link  #\n' + \
-        r' # to the generators git repository on tinkerforge\.com       #\n' + \
-        r' #############################################################\n' + \
-        r' \n$')
-
-        ruby_header1 = re.compile(r'^@@ -1,9 \+1,9 @@\n' + \
-        r' # -\*- ruby encoding: utf-8 -\*-\n' + \
-        r' #############################################################\n' + \
-        r'-# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r'\+# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r' #                                                           #\n' + \
-        r' # Ruby Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r' #                                                           #\n' + \
-        r' # If you have a bugfix for this file and want to commit it, #\n' + \
-        r' # please fix the bug in the generator\. You can find a link  #\n' + \
-        r' # to the generators git repository on tinkerforge\.com       #\n$')
-
-        ruby_header2 = re.compile(r'^@@ -1,11 \+1,11 @@\n' + \
-        r' # -\*- ruby encoding: utf-8 -\*-\n' + \
-        r' #############################################################\n' + \
-        r'-# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r'\+# This file was automatically generated on [0-9]{4}-[0-9]{2}-[0-9]{2}\.      #\n' + \
-        r' #                                                           #\n' + \
-        r'-# Ruby Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r'\+# Ruby Bindings Version 2\.[0-9]+\.[0-9]+[ ]+#\n' + \
-        r' #                                                           #\n' + \
-        r' # If you have a bugfix for this file and want to commit it, #\n' + \
-        r' # please fix the bug in the generator\. You can find a link  #\n' + \
-        r' # to the generators git repository on tinkerforge\.com       #\n' + \
-        r' #############################################################\n' + \
-        r' \n$')
-
         tmp = tempfile.mkdtemp()
 
         print('using tmpdir ' + tmp)
@@ -371,72 +165,20 @@ def main():
                     print('error: download latest.zip failed')
                     return 1
 
-                if os.system('bash -ce "pushd {1} > /dev/null && unzip -q -d old_{0} old_{0}.zip && popd > /dev/null"'.format(binding, tmp)) != 0:
-                    print('error: unzip latest.zip failed')
+                try:
+                    extract_zip_file(os.path.join(tmp, 'old_{0}.zip'.format(binding)), os.path.join(tmp, 'old_{0}'.format(binding)))
+                except Exception as e:
+                    print('error: unzip latest.zip failed: {0}'.format(e))
                     return 1
 
-            if os.system('bash -ce "cp {0}/tinkerforge_{1}_bindings_{3}_{4}_{5}.zip {2} && pushd {2} > /dev/null && unzip -q -d new_{1} tinkerforge_{1}_bindings_{3}_{4}_{5}.zip && popd > /dev/null"'.format(path, binding, tmp, *version)) != 0:
-                print('error: copy and unzip new.zip failed')
+            try:
+                extract_zip_file(os.path.join(path, 'tinkerforge_{0}_bindings_{1}_{2}_{3}.zip'.format(binding, *version)), os.path.join(tmp, 'new_{0}'.format(binding)))
+            except Exception as e:
+                print('error: unzip new.zip failed: {0}'.format(e))
                 return 1
 
-            if os.system('bash -c "pushd {1} > /dev/null && diff -ru6 old_{0}/ new_{0}/ > diff_{0}.diff; popd > /dev/null"'.format(binding, tmp)) != 0:
-                print('error: diff old vs new failed')
-                return 1
-
-            with open(os.path.join(tmp, 'diff_{0}.diff'.format(binding)), 'r') as f:
-                diffs = [[[]]] # list of diffs as lists of lines
-
-                for line in f.readlines():
-                    if line.startswith('diff ') or line[0] not in ['@', '-', '+', ' ']:
-                        diffs.append([[]])
-
-                    if line.startswith('@@ '):
-                        diffs[-1].append([])
-
-                    diffs[-1][-1].append(line)
-
-            filtered = []
-
-            for diff in diffs:
-                filtered_lines = []
-
-                for lines in diff:
-                    if len(lines) == 0:
-                        continue
-
-                    hunk = ''.join(lines)
-
-                    if not c_like_header1.match(hunk) and \
-                       not c_like_header2.match(hunk) and \
-                       not delphi_header1.match(hunk) and \
-                       not delphi_header2.match(hunk) and \
-                       not javascript_header1.match(hunk) and \
-                       not javascript_header2.match(hunk) and \
-                       not javascript_header3.match(hunk) and \
-                       not javascript_header4.match(hunk) and \
-                       not perl_header1.match(hunk) and \
-                       not perl_header2.match(hunk) and \
-                       not php_header1.match(hunk) and \
-                       not php_header2.match(hunk) and \
-                       not python_header1.match(hunk) and \
-                       not python_header2.match(hunk) and \
-                       not ruby_header1.match(hunk) and \
-                       not ruby_header2.match(hunk):
-                        filtered_lines += lines
-                    else:
-                        filtered_lines += [lines[0].rstrip() + ' // dropped header hunk\n']
-
-                if len(filtered_lines) == 0:
-                    continue
-
-                if len(filtered_lines) == 4 and \
-                   filtered_lines[0].startswith('diff -ru6 ') and \
-                   filtered_lines[1].startswith('--- ') and \
-                   filtered_lines[2].startswith('+++ ') and \
-                   filtered_lines[3].endswith('// dropped header hunk\n'):
-                    filtered += [filtered_lines[0].rstrip() + ' // dropped header diff\n']
-                else:
-                    filtered += filtered_lines
+            filtered = common.diff_directories(os.path.join(tmp, 'old_{0}'.format(binding)), os.path.join(tmp, 'new_{0}'.format(binding)),
+                                               'old_{0}'.format(binding), 'new_{0}'.format(binding), 6, jobs=args.jobs, compare_modes=True)
 
             with open(os.path.join(tmp, 'diff.diff'), 'a') as f:
                 f.writelines(filtered)